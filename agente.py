@@ -0,0 +1,776 @@
+# -*- coding: utf-8 -*-
+"""
+Agente de lógica proposicional do Mundo do Wumpus.
+
+InferenceAgent joga em um mundo (mundo.WumpusWorld), que só tem o mapa
+escondido e as percepções. O agente guarda a posição, o ouro, o fim do
+jogo e a base de conhecimento, aplica as regras de inferência (ou o motor
+SatInference ou HazardBelief), faz as apostas do modo probabilístico e
+escolhe o próximo movimento. Ele também joga o episódio (step/back), com
+retratos baratos do seu estado (snapshot/restore/fork).
+
+Os motores SAT e de crenças só usam as percepções. As regras escritas à
+mão, como no código original, também leem o mapa escondido (world.holes e
+world.wumpuses): as contagens de perigos encontrados (_mark_danger), as
+regras 2.5 e 4 e a de perigos esgotados, e a garantia de nunca entrar na
+célula do Wumpus (só com percepções exatas). _move também verifica ali a
+morte e a vitória.
+
+new_agent(seed=..., grid_size=..., inference=...) cria o mundo e o agente
+de uma vez, dividindo as opções entre os dois.
+"""
+
+import bisect
+import collections
+import copy
+import random
+
+from crencas import HazardBelief
+from grade import DANGER, SAFE, UNKNOWN, VISITED, CellSet, CellStates
+from inferencia import SatInference
+from mundo import WumpusWorld
+from planejamento import DistanceField
+from probabilidade import FrontierRisk
+
+# Modos de inferência aceitos por InferenceAgent
+INFERENCE_MODES = ("rules", "sat", "belief")
+# Opções de new_agent que criam o mundo (mundo.WumpusWorld); as demais são do agente
+WORLD_OPTIONS = ("seed", "rng", "grid_size", "num_holes", "num_wumpus", "preset", "noise")
+
+# Estado de um agente em um momento (ver InferenceAgent.snapshot): o mundo e o episódio, o estado
+# escalar, os contêineres do conhecimento, o motor de inferência e o gerador das jogadas
+WorldSnapshot = collections.namedtuple("WorldSnapshot", ["episode", "scalars", "containers", "inference_engine",
+                                                         "rng"])
+
+
+def new_agent(**options):
+    """Um agente (InferenceAgent) no início de um mundo novo (mundo.WumpusWorld).
+
+    As opções de WORLD_OPTIONS criam o mundo e as demais vão para o agente;
+    instrumentation vai para os dois (o mundo cronometra a geração do mapa).
+    """
+    world_options = {name: options.pop(name) for name in WORLD_OPTIONS if name in options}
+    world = WumpusWorld(instrumentation=options.get("instrumentation"), **world_options)
+    return InferenceAgent(world, **options)
+
+
+class InferenceAgent:
+    """Conhecimento e decisões do agente em um mundo (mundo.WumpusWorld)."""
+
+    # Estado do agente guardado pelos retratos (ver snapshot)
+    _SCALAR_STATE = ("agent_pos", "has_gold", "game_over", "victory", "_holes_found", "_wumpus_found")
+    _SHARED_STATE = {
+        "_cells": CellStates.copy,
+        "knowledge_base": dict.copy,
+        "history": list.copy,
+        "_frontier": set.copy,
+        "_home_field": DistanceField.copy,
+        "_explore_field": DistanceField.copy,
+        "_safe_neighbors": bytearray.copy,
+        "_stench_count": bytearray.copy,
+        "_breeze_count": bytearray.copy,
+        "_wumpus_candidates": set.copy,
+        "_hole_candidates": set.copy,
+        "_percept_cells": set.copy,
+        "_dirty": set.copy,
+        "_stench_pending": list.copy,
+        "_kb_index": dict.copy,
+    }
+    # O mundo e o que vale para o episódio inteiro: nunca são alterados, só trocados (ver snapshot)
+    _EPISODE_STATE = ("world", "_play_rng_state", "_checkpoints")
+
+    def __init__(self, world, verbose=False, inference="rules", probabilistic=False, planner=None,
+                 instrumentation=None, rng=None):
+        if inference not in INFERENCE_MODES:
+            raise ValueError(f"Modo de inferência desconhecido: {inference!r} (use um de {INFERENCE_MODES})")
+        self.world = world
+        # O que o agente sabe do jogo (mas não do mapa): o tamanho da grade, as quantidades de
+        # perigos, o início e o ruído dos sensores
+        self.GRID_SIZE = world.GRID_SIZE
+        self.num_holes = world.num_holes
+        self.num_wumpus = world.num_wumpus
+        self.start_pos = world.start_pos
+        self.noise = world.noise
+        self._adjacent = world._adjacent
+        self._neighbor_ids = world._neighbor_ids
+        self.inference = inference # "rules": regras escritas à mão; "sat": motor SatInference; "belief": HazardBelief
+        self.probabilistic = probabilistic or planner is not None # Sem células seguras, arrisca a de menor probabilidade de perigo
+        self.planner = planner # Escolhe as apostas do modo probabilístico por simulação (ver busca.py)
+        self.verbose = verbose # Mostra as mensagens de depuração no terminal (desligado por padrão)
+        self.instrumentation = instrumentation # Contadores, cronômetros e ganchos (ver instrumentacao.py)
+        # Gerador das escolhas do agente. Por padrão é uma cópia do gerador do mundo logo depois da
+        # geração do mapa (world._play_rng_state): a mesma semente sempre joga as mesmas jogadas.
+        self._rng_from_world = rng is None
+        self.rng = rng if rng is not None else random.Random()
+        self._rng_shared = False # Ver _own_rng
+        # Muda a cada salto do estado (reset, back, restore), e não nas cópias feitas pelos retratos:
+        # quem acompanha as jogadas (gravacao.py, interface.py) sabe quando recomeçar do zero
+        self._timeline = 0
+        self._start_episode()
+
+    def get_adjacent(self, x, y):
+        """Retorna as células adjacentes válidas (tupla pré-calculada, compartilhada entre mundos)."""
+        return self._adjacent[x * self.GRID_SIZE + y]
+
+    def _log(self, message, *args):
+        """Mostra uma mensagem de depuração quando o modo verboso está ativo e a repassa aos ganchos.
+
+        A formatação (message % args) só é feita se alguém for ler a mensagem.
+        """
+        probe = self.instrumentation
+        if self.verbose or probe is not None and probe.hooks:
+            if args:
+                message = message % args
+            if self.verbose:
+                print(message)
+            if probe is not None:
+                probe.message(self, message)
+
+    def reset(self, preset=None):
+        """Gera outro mapa (ou usa preset, um mundo.MapPreset) e recomeça o episódio.
+
+        O mapa novo fica em uma cópia do mundo (com o mesmo gerador): as cópias
+        e os retratos deste agente continuam no mundo em que estavam.
+        """
+        world = copy.copy(self.world)
+        world.reset(preset)
+        self.world = world
+        self._start_episode()
+
+    def _start_episode(self):
+        """Recomeça o episódio no mapa atual do mundo, com o gerador das jogadas do início."""
+        n = self.GRID_SIZE
+        if self._rng_from_world:
+            self._own_rng().setstate(self.world._play_rng_state)
+        # Estado do gerador no início das jogadas: com ele, back() refaz o episódio até qualquer passo
+        self._play_rng_state = self.rng.getstate()
+        # Apostas escolhidas pelo planejador, por jogada: back() as repete em vez de planejar de novo
+        self._planned = {}
+        self._replaying = False
+        # Retratos periódicos para back() (ver _checkpoint): ((jogada, retrato), ...) em ordem de jogada
+        self._checkpoints = ()
+        self._checkpoint_interval = max(self.CHECKPOINT_INTERVAL, n * n // 256)
+        self._reset_agent()
+
+    def replace_map(self, wumpuses, holes, gold, percepts=None):
+        """Troca o mapa escondido (por um mundo igual com outro mapa) mantendo o conhecimento do agente.
+
+        Usado pelo planejador (busca.py) para jogar simulações em mapas sorteados
+        a partir de um retrato. percepts é o mapa de percepções já calculado
+        para esse mapa (se omitido, é recalculado).
+        """
+        self.world = self.world.with_map(wumpuses, holes, gold, percepts)
+        n = self.GRID_SIZE
+        flags = self._cells.flags
+        self._holes_found = sum(1 for x, y in holes if flags[x * n + y] & DANGER)
+        self._wumpus_found = sum(1 for x, y in wumpuses if flags[x * n + y] & DANGER)
+
+    def sense_at_current_pos(self):
+        """O agente sente o ambiente na sua posição atual: (fedor, vento, brilho)."""
+        return self.world.percepts_at(self.agent_pos)
+
+    # --- Retratos (snapshot/restore) com cópia na escrita ---
+    # O mundo nunca muda durante o episódio e é sempre compartilhado (os retratos de
+    # back() também: a tupla é trocada, nunca alterada). O conhecimento fica nos contêineres
+    # de _SHARED_STATE: snapshot() só guarda referências a eles, e o agente copia tudo na
+    # primeira escrita depois de um snapshot() ou restore() (ver _own_state). Escrever direto nas
+    # visões (agent.safe.add etc.) enquanto há retratos pendentes altera os retratos também.
+
+    def snapshot(self):
+        """Retrato imutável do estado atual (mundo, agente, conhecimento e gerador).
+
+        Custa só algumas referências: nada é copiado agora. O agente passa a
+        copiar o conhecimento na próxima jogada, e o gerador no próximo sorteio.
+        """
+        self._shared = self._rng_shared = True
+        return WorldSnapshot(tuple(getattr(self, name) for name in self._EPISODE_STATE),
+                             tuple(getattr(self, name) for name in self._SCALAR_STATE),
+                             tuple(getattr(self, name) for name in self._SHARED_STATE),
+                             self.inference_engine, self.rng)
+
+    def restore(self, snapshot):
+        """Volta ao estado de um retrato (deste ou de outro agente com a mesma configuração).
+
+        Como snapshot(), não copia nada: o mesmo retrato pode ser restaurado
+        quantas vezes for preciso (por exemplo, no início de cada simulação).
+        """
+        for name, value in zip(self._EPISODE_STATE, snapshot.episode):
+            setattr(self, name, value)
+        for name, value in zip(self._SCALAR_STATE, snapshot.scalars):
+            setattr(self, name, value)
+        for name, value in zip(self._SHARED_STATE, snapshot.containers):
+            setattr(self, name, value)
+        self.inference_engine = snapshot.inference_engine
+        self.rng = snapshot.rng
+        self._shared = self._rng_shared = True
+        self._timeline += 1
+        self._bind_views()
+
+    def fork(self):
+        """Outro agente no mesmo estado (e no mesmo mundo), independente deste."""
+        clone = copy.copy(self)
+        clone._planned = dict(self._planned)
+        clone.restore(self.snapshot())
+        return clone
+
+    def _own_state(self):
+        """Copia o conhecimento compartilhado com algum retrato antes de alterá-lo."""
+        if not self._shared:
+            return
+        for name, copy_container in self._SHARED_STATE.items():
+            setattr(self, name, copy_container(getattr(self, name)))
+        engine = self.inference_engine
+        if engine is not None:
+            # O motor SAT guarda o resolvedor inteiro e é copiado por completo (a vizinhança, não)
+            self.inference_engine = copy.deepcopy(engine, {id(engine.get_adjacent): engine.get_adjacent})
+        self._shared = False
+        self._bind_views()
+
+    def _own_rng(self):
+        """Gerador das jogadas, copiado antes do primeiro sorteio se for compartilhado com um retrato."""
+        if self._rng_shared:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+            self.rng = rng
+            self._rng_shared = False
+        return self.rng
+
+    def step(self):
+        """Executa uma jogada do agente."""
+        if self.game_over or self.victory:
+            return
+
+        self._own_state()
+        if self.instrumentation is not None:
+            self.instrumentation.run_step(self)  # O mesmo que abaixo, cronometrando cada parte
+        else:
+            self.logical_update()
+            self._move()
+        self._checkpoint()
+
+    # Movimentos entre dois retratos de back(). Em grades grandes o intervalo cresce com a área
+    # (n * n // 256), para a memória dos retratos por jogada não crescer com a grade.
+    CHECKPOINT_INTERVAL = 32
+
+    def _checkpoint(self):
+        """Guarda um retrato logo depois de cada _checkpoint_interval movimentos.
+
+        Os passos seguintes sem movimento não geram outro retrato: o retrato
+        do movimento k é sempre o estado logo depois desse movimento.
+        """
+        played = len(self.history)
+        interval = self._checkpoint_interval
+        if played and interval and played % interval == 0 and \
+                (not self._checkpoints or self._checkpoints[-1][0] < played):
+            self._checkpoints += ((played, self.snapshot()),)
+
+    def back(self, count=1):
+        """Desfaz os últimos count movimentos, restaurando todo o estado do agente (não só a posição).
+
+        O agente volta ao estado logo depois do movimento len(history) - count
+        (ou ao início do episódio), desfazendo também as jogadas sem movimento
+        feitas depois dele. As jogadas só dependem do mapa e do gerador, então
+        desfazer é refazer, sem mensagens, as jogadas a partir do retrato
+        anterior mais próximo (ou do estado do gerador no início do episódio):
+        no máximo _checkpoint_interval movimentos, seja qual for count.
+        Também desfaz a jogada que terminou o jogo.
+        """
+        if count < 1:
+            return
+        target = max(0, len(self.history) - count)
+        checkpoints = self._checkpoints
+        k = bisect.bisect_right([played for played, _ in checkpoints], target)
+        verbose, self.verbose = self.verbose, False
+        probe, self.instrumentation = self.instrumentation, None  # Refazer não conta nos contadores
+        self._replaying = True
+        try:
+            if k:
+                self.restore(checkpoints[k - 1][1])
+                self._checkpoints = checkpoints[:k]
+            else:
+                self._own_rng().setstate(self._play_rng_state)
+                self._reset_agent()
+                self._checkpoints = ()
+            while len(self.history) < target and not self.game_over and not self.victory:
+                self.step()
+        finally:
+            self.verbose = verbose
+            self.instrumentation = probe
+            self._replaying = False
+
+    def _bind_views(self):
+        """Recria as visões de conjunto sobre as flags atuais."""
+        self.visited = self._cells.view(VISITED)
+        self.safe = self._cells.view(SAFE)
+        self.danger = self._cells.view(DANGER)
+        self.unknown = self._cells.view(UNKNOWN)
+        self._walkable = CellSet(self._cells, SAFE | DANGER, SAFE)  # Seguras e não perigosas
+
+    def _reset_agent(self):
+        """Coloca o agente no início, sem nenhum conhecimento, no mapa atual."""
+        n = self.GRID_SIZE
+        self._timeline += 1
+        self.agent_pos = self.start_pos
+        self.has_gold = False
+        self.game_over = False
+        self.victory = False
+
+        # --- Conhecimento do agente ---
+        # Um byte de flags por célula; visited, safe, danger e unknown são visões de conjunto dele.
+        self._cells = CellStates(n, UNKNOWN)
+        self._bind_views()
+        self._shared = False                                   # Conhecimento compartilhado com um retrato
+        self.knowledge_base = {}
+        self.history = []                                      # Posição do agente antes de cada movimento
+
+        # --- Estado incremental da inferência (ver logical_update) ---
+        self._frontier = set()                                 # Seguras, não visitadas e não perigosas
+        # Campos de distância sobre as células seguras e não perigosas (ver planejamento.py)
+        self._home_field = DistanceField(n)                    # Até o início (volta com o ouro)
+        self._home_field.add_source(self.start_pos[0] * n + self.start_pos[1])
+        self._explore_field = DistanceField(n)                 # Até a célula de self._frontier mais próxima
+        self._safe_neighbors = bytearray(n * n)                # Vizinhos seguros de cada célula
+        self._stench_count = bytearray(n * n)                  # Células com fedor adjacentes
+        self._breeze_count = bytearray(n * n)                  # Células com vento adjacentes
+        self._wumpus_candidates = set()                        # Apontadas por 2+ fedores
+        self._hole_candidates = set()                          # Apontadas por 2+ ventos
+        self._percept_cells = set()                            # Células visitadas com fedor ou vento
+        self._dirty = set()                                    # Células com percepção a reexaminar (Regra 2)
+        self._stench_pending = []                              # Células com fedor ainda não usadas pela Regra 4
+        self._kb_index = {}                                    # Ordem de inserção na base de conhecimento
+        self._holes_found = 0                                  # Buracos reais marcados como perigo
+        self._wumpus_found = 0                                 # Wumpus reais marcados como perigo
+
+        self.inference_engine = None
+        if self.inference == "sat":
+            self.inference_engine = SatInference(self.GRID_SIZE, self.num_holes, self.num_wumpus, self.get_adjacent)
+        elif self.inference == "belief":
+            self.inference_engine = HazardBelief(self.GRID_SIZE, self.num_holes, self.num_wumpus, self.get_adjacent,
+                                                 self.noise)
+        self.risk_engine = None
+        if self.probabilistic and self.inference != "belief":  # HazardBelief já dá o risco da fronteira
+            self.risk_engine = FrontierRisk(self.GRID_SIZE, self.num_holes, self.num_wumpus, self.get_adjacent)
+        self._mark_safe(self.start_pos)
+
+    def _get_percept_counts(self, cell_type):
+        """Conta quantas células adjacentes a uma célula desconhecida possuem a percepção de fedor ou vento."""
+        counts = collections.defaultdict(int)
+
+        for pos, (fedor, vento, brilho) in self.knowledge_base.items():
+            if (cell_type == 'wumpus' and fedor) or (cell_type == 'hole' and vento):
+                for neighbor in self.get_adjacent(pos[0], pos[1]):
+                    if neighbor in self.unknown:
+                        counts[neighbor] += 1
+        return counts
+
+    def _mark_safe(self, cell):
+        """Marca uma célula como segura e avisa as células com percepção ao redor dela."""
+        i = cell[0] * self.GRID_SIZE + cell[1]
+        cells = self._cells
+        cells.clear(i, UNKNOWN)
+        if not cells.set(i, SAFE):
+            return
+        if not cells.flags[i] & DANGER:
+            self._home_field.add_walkable(i)
+            self._explore_field.add_walkable(i)
+            if not cells.flags[i] & VISITED:
+                self._frontier.add(cell)
+                self._explore_field.add_source(i)
+        safe_neighbors = self._safe_neighbors
+        for neighbor, j in zip(self._adjacent[i], self._neighbor_ids[i]):
+            safe_neighbors[j] += 1
+            if neighbor in self._percept_cells:
+                self._dirty.add(neighbor)
+
+    def _unmark_safe(self, cell):
+        """Remove uma célula do conjunto seguro, mantendo os contadores coerentes."""
+        i = cell[0] * self.GRID_SIZE + cell[1]
+        if not self._cells.clear(i, SAFE):
+            return
+        if not self._cells.flags[i] & DANGER:
+            self._home_field.remove_walkable(i)
+            self._explore_field.remove_walkable(i)
+        self._leave_frontier(cell, i)
+        for neighbor, j in zip(self._adjacent[i], self._neighbor_ids[i]):
+            self._safe_neighbors[j] -= 1
+            if neighbor in self._percept_cells:
+                self._dirty.add(neighbor)
+
+    def _mark_danger(self, cell):
+        """Marca uma célula como perigosa. Devolve False se ela já era perigosa."""
+        i = cell[0] * self.GRID_SIZE + cell[1]
+        if not self._cells.set(i, DANGER):
+            return False
+        self._cells.clear(i, UNKNOWN)
+        if self._cells.flags[i] & SAFE:
+            self._home_field.remove_walkable(i)
+            self._explore_field.remove_walkable(i)
+        self._leave_frontier(cell, i)
+        if cell in self.world.holes:
+            self._holes_found += 1
+        if cell in self.world.wumpuses:
+            self._wumpus_found += 1
+        return True
+
+    def _leave_frontier(self, cell, i):
+        """Tira a célula (identificador i) do conjunto de exploração e das fontes do campo de exploração."""
+        self._frontier.discard(cell)
+        self._explore_field.remove_source(i)
+
+    def _first_stench_candidate(self, candidates):
+        """Escolhe o candidato a Wumpus que a varredura da base de conhecimento encontraria primeiro.
+
+        A varredura percorre a base na ordem de inserção e, em cada célula com fedor,
+        os vizinhos na ordem de get_adjacent; a chave reproduz essa ordem.
+        """
+        def scan_order(cell):
+            order = []
+            for k in self.get_adjacent(cell[0], cell[1]):
+                if k in self.knowledge_base and self.knowledge_base[k][0]:
+                    order.append((self._kb_index[k], self.get_adjacent(k[0], k[1]).index(cell)))
+            return min(order)
+        return min(candidates, key=scan_order)
+
+    def logical_update(self):
+        """Atualiza a base de conhecimento e realiza inferências lógicas.
+
+        Com inference="rules" usa as regras de _apply_rules; com inference="sat"
+        (ou "belief") repassa a percepção ao motor SatInference (ou HazardBelief),
+        que não consulta o mapa real.
+        """
+        pos = self.agent_pos
+        i = pos[0] * self.GRID_SIZE + pos[1]
+        if self._cells.flags[i] & VISITED:
+            return
+        self._own_state()
+        self._cells.set(i, VISITED)
+
+        self._leave_frontier(pos, i)
+        self._mark_safe(pos)
+
+        fedor, vento, brilho = self.sense_at_current_pos()
+        self._kb_index[pos] = len(self.knowledge_base)
+        self.knowledge_base[pos] = (fedor, vento, brilho)
+
+        if brilho:
+            self.has_gold = True
+            self._log("OURO ENCONTRADO E COLETADO!")
+
+        if self.inference_engine is None:
+            self._apply_rules(pos, fedor, vento)
+        elif self.instrumentation is not None:
+            self.instrumentation.run_rule(self, self.inference, self._apply_engine, pos, (fedor, vento, brilho))
+        else:
+            self._apply_engine(pos, (fedor, vento, brilho))
+
+        # --- Verificação de Game Over ---
+        # Sem células seguras não visitadas não há alvo alcançável para explorar.
+        # (No modo probabilístico quem decide é step(), que ainda pode arriscar uma célula.)
+        if not self.has_gold and not self.victory and not self._frontier and self.agent_pos != self.start_pos \
+                and not self.probabilistic:
+            self.game_over = True
+            self._log("GAME OVER: Agente preso ou sem movimentos seguros para explorar novas células.")
+
+    def _apply_engine(self, pos, percept):
+        """Repassa a percepção ao motor de inferência e marca as células que ele deduziu."""
+        new_safe, new_danger = self.inference_engine.observe(pos, percept)
+        for cell in new_safe:
+            self._mark_safe(cell)
+            self._log("Inferido segurança em %s (motor de inferência).", cell)
+        for cell in new_danger:
+            self._mark_danger(cell)
+            self._log("Inferido perigo em %s (motor de inferência).", cell)
+
+    def _apply_rules(self, pos, fedor, vento):
+        """Aplica as regras escritas à mão depois da percepção em pos.
+
+        As regras são aplicadas de forma incremental: em vez de percorrer toda a
+        base a cada passo, só são reexaminadas as células com percepção cuja
+        vizinhança mudou (fila self._dirty), e as contagens de vizinhos seguros,
+        de fedores e de ventos são mantidas por célula. Com instrumentação, cada
+        regra é contada e cronometrada (nomes em instrumentacao.RULES).
+        """
+        if fedor or vento:
+            self._percept_cells.add(pos)
+            self._dirty.add(pos)
+            i = pos[0] * self.GRID_SIZE + pos[1]
+            for neighbor, j in zip(self._adjacent[i], self._neighbor_ids[i]):
+                if fedor:
+                    self._stench_count[j] += 1
+                    if self._stench_count[j] == 2:
+                        self._wumpus_candidates.add(neighbor)
+                if vento:
+                    self._breeze_count[j] += 1
+                    if self._breeze_count[j] == 2:
+                        self._hole_candidates.add(neighbor)
+            if fedor:
+                self._stench_pending.append(pos)
+
+        if self.instrumentation is None:
+            if not fedor and not vento:
+                self._rule_no_percepts(pos)
+            self._rule_elimination()
+            inferred_wumpus = self._rule_multiple_percepts()
+            self._rule_hazards_exhausted(inferred_wumpus)
+            self._rule_known_wumpus()
+        else:
+            run = self.instrumentation.run_rule
+            if not fedor and not vento:
+                run(self, "1", self._rule_no_percepts, pos)
+            run(self, "2", self._rule_elimination)
+            inferred_wumpus = run(self, "2.5", self._rule_multiple_percepts)
+            run(self, "esgotados", self._rule_hazards_exhausted, inferred_wumpus)
+            run(self, "4", self._rule_known_wumpus)
+
+    def _rule_no_percepts(self, pos):
+        # Regra 1: Se não há percepções, todos os vizinhos são seguros.
+        for neighbor in self.get_adjacent(pos[0], pos[1]):
+            if neighbor not in self.visited:
+                self._mark_safe(neighbor)
+
+    def _rule_elimination(self):
+        # Regra 2: Inferir perigo por eliminação (Poço ou Wumpus).
+        # Se uma célula tem vento/fedor e todos os seus vizinhos, exceto um, são seguros,
+        # então o vizinho restante deve ser um buraco/wumpus.
+        # Só as células cuja contagem de vizinhos seguros mudou precisam ser reexaminadas.
+        dirty, self._dirty = self._dirty, set()
+        for cell in dirty:
+            f, v, b = self.knowledge_base[cell]
+            i = cell[0] * self.GRID_SIZE + cell[1]
+            adjacents = self._adjacent[i]
+            if len(adjacents) - self._safe_neighbors[i] != 1:
+                continue
+            unknown_neighbors = [n for n in adjacents if n in self.unknown]
+            if v: # Vento -> Poço
+                for un in unknown_neighbors:
+                    if self._mark_danger(un):
+                        self._log("Inferido perigo (Buraco) em %s devido a vento em %s", un, cell)
+            if f: # Fedor -> Wumpus
+                for un in unknown_neighbors:
+                    if self._mark_danger(un):
+                        self._log("Inferido perigo (Wumpus) em %s devido a fedor em %s", un, cell)
+
+    def _rule_multiple_percepts(self):
+        """Regra 2.5. Devolve o Wumpus inferido por múltiplos fedores (ou None)."""
+        # Regra 2.5: Inferir perigo por múltiplas percepções (Wumpus e Buracos)
+        # Candidatos: células desconhecidas apontadas por 2 ou mais fedores/ventos.
+        wumpus_candidates = [c for c in self._wumpus_candidates if c in self.unknown]
+        hole_candidates = [c for c in self._hole_candidates if c in self.unknown]
+
+        # --- Inferência de Wumpus por múltiplos fedores ---
+        # Só vale com um único Wumpus: com vários, dois fedores podem vir de Wumpus diferentes.
+        inferred_wumpus = None
+        if self.num_wumpus == 1 and wumpus_candidates:
+            inferred_wumpus = self._first_stench_candidate(wumpus_candidates)
+
+        if inferred_wumpus and inferred_wumpus not in self.danger:
+            self._mark_danger(inferred_wumpus)
+            self._log("Inferido Wumpus em %s por múltiplas percepções adjacentes de fedor.", inferred_wumpus)
+
+            # Marca as células adjacentes ao Wumpus inferido como seguras, exceto buracos
+            for neighbor in self.get_adjacent(inferred_wumpus[0], inferred_wumpus[1]):
+                if neighbor not in self.world.holes and neighbor not in self.danger:
+                    self._mark_safe(neighbor)
+                    self._log("Inferido segurança em %s (adjacente ao Wumpus inferido).", neighbor)
+
+        # --- Inferência de Buracos por múltiplas percepções de vento ---
+        known_bomb_exists = self._wumpus_found > 0 or self._holes_found > 0
+
+        for cell in hole_candidates:
+            if cell not in self.danger:
+                if self._breeze_count[cell[0] * self.GRID_SIZE + cell[1]] >= 3:
+                    self._mark_danger(cell)
+                    self._log("Inferido perigo (Buraco) em %s por ser adjacente a 3 ou mais células com vento.", cell)
+
+                elif known_bomb_exists:
+                    self._mark_danger(cell)
+                    self._log("Inferido perigo (Buraco) em %s por múltiplas percepções de vento e bomba conhecida.", cell)
+        return inferred_wumpus
+
+    def _rule_hazards_exhausted(self, inferred_wumpus):
+        # Nova Regra: Se todos os buracos do mapa (self.num_holes) foram inferidos,
+        # marcar células desconhecidas como seguras (exceto Wumpus)
+        if self._holes_found >= self.num_holes:
+            self._log("Todos os buracos foram inferidos! Marcando células desconhecidas restantes como seguras (exceto Wumpus).")
+            for unknown_cell in list(self.unknown):  # Usar list() para evitar modificação durante iteração
+                if unknown_cell not in self.world.wumpuses and unknown_cell not in self.danger:
+                    self._mark_safe(unknown_cell)
+                    self._log("Inferido segurança em %s (todos os buracos já foram localizados).", unknown_cell)
+
+        # Nova Regra: Se o Wumpus e todos os buracos foram inferidos, todas as células desconhecidas são seguras
+        wumpus_inferred = self._wumpus_found >= self.num_wumpus or inferred_wumpus is not None
+
+        if wumpus_inferred and self._holes_found >= self.num_holes:
+            self._log("Wumpus e todos os buracos inferidos! Todas as células desconhecidas são seguras.")
+            for unknown_cell in list(self.unknown):
+                if unknown_cell not in self.danger:
+                    self._mark_safe(unknown_cell)
+                    self._log("Inferido segurança em %s (todos os perigos foram localizados).", unknown_cell)
+
+    def _rule_known_wumpus(self):
+        # Regra 4: Se a localização do Wumpus é conhecida, as células adjacentes às que têm fedor são seguras (exceto buracos).
+        # (Com vários Wumpus, exige ao menos tantas células perigosas quanto Wumpus.)
+        # A condição nunca deixa de valer e as células marcadas seguras não voltam a ser
+        # desconhecidas, então cada célula com fedor só precisa ser processada uma vez.
+        wumpus_known = self.num_wumpus > 0 and (self._wumpus_found >= self.num_wumpus or
+                                                len(self.danger) - self._wumpus_found >= self.num_wumpus)
+        if wumpus_known:
+            for cell in self._stench_pending:
+                for neighbor in self.get_adjacent(cell[0], cell[1]):
+                    if neighbor not in self.world.holes and neighbor not in self.danger and neighbor not in self.safe:
+                        self._mark_safe(neighbor)
+                        self._log("Inferido segurança em %s (adjacente a célula com fedor e Wumpus conhecido).", neighbor)
+            self._stench_pending = []
+
+    def _move(self):
+        """Escolhe o próximo movimento (depois da inferência) e verifica vitória e derrota."""
+        safe_unvisited = self._frontier
+        agent_id = self.agent_pos[0] * self.GRID_SIZE + self.agent_pos[1]
+
+        next_pos = None
+        risky = False
+
+        # 1. Se tem o ouro, o objetivo é voltar para o início
+        if self.has_gold:
+            hop_home = self._home_field.next_hop(agent_id)
+            if hop_home is not None:
+                next_pos = divmod(hop_home, self.GRID_SIZE)
+            else:
+                # Se não encontrou um caminho para o início (o que não deveria acontecer em um mapa solucionável)
+                # Tenta mover para uma célula segura adjacente já visitada para não ficar preso
+                adj_safe_visited = [c for c in self.get_adjacent(self.agent_pos[0], self.agent_pos[1]) if self._is_safe_visited(c)]
+                if adj_safe_visited:
+                    next_pos = self._own_rng().choice(adj_safe_visited)
+
+        # 2. Se não tem o ouro, explora
+        if not self.has_gold and next_pos is None:
+            # Prioriza células seguras e não visitadas adjacentes
+            adj_safe_unvisited = [c for c in self.get_adjacent(self.agent_pos[0], self.agent_pos[1]) if c in safe_unvisited]
+            if adj_safe_unvisited:
+                next_pos = self._own_rng().choice(adj_safe_unvisited)
+            else:
+                # Se não há células seguras e não visitadas adjacentes, tenta encontrar um caminho para a célula segura não visitada mais próxima
+                # Isso evita que o agente fique preso em um loop de células visitadas
+                if safe_unvisited:
+                    hop = self._explore_field.next_hop(agent_id)
+                    if hop is not None:
+                        next_pos = divmod(hop, self.GRID_SIZE)
+                    elif self.probabilistic:
+                        # As células seguras restantes estão isoladas por perigos: arrisca como abaixo
+                        next_pos, risky = self._risky_step()
+                    else:
+                        # Se não encontrou um caminho para uma célula segura não visitada, tenta mover para uma célula segura adjacente já visitada
+                        adj_safe_visited = [c for c in self.get_adjacent(self.agent_pos[0], self.agent_pos[1]) if self._is_safe_visited(c)]
+                        if adj_safe_visited:
+                            next_pos = self._own_rng().choice(adj_safe_visited)
+                elif self.probabilistic:
+                    # Modo probabilístico: segue para a célula da fronteira com menor risco
+                    next_pos, risky = self._risky_step()
+                else:
+                    # Se todas as células seguras foram visitadas, o agente pode estar preso ou o mapa é muito restritivo
+                    # Tenta mover para uma célula segura adjacente já visitada para não ficar parado
+                    adj_safe_visited = [c for c in self.get_adjacent(self.agent_pos[0], self.agent_pos[1]) if self._is_safe_visited(c)]
+                    if adj_safe_visited:
+                        next_pos = self._own_rng().choice(adj_safe_visited)
+                    else:
+                        # Se não há mais células seguras para explorar e o ouro não foi encontrado,
+                        # o agente pode estar preso ou não há mais movimentos possíveis.
+                        # Neste caso, o jogo deve terminar, mas não como uma derrota se ainda houver células desconhecidas.
+                        # A condição de game over será ajustada na próxima fase.
+                        pass
+
+        # --- GARANTIA: O agente nunca entra na célula do Wumpus ---
+        # (Não vale para uma aposta deliberada do modo probabilístico, nem para os motores
+        # SAT e de crenças ou com sensores ruidosos: aí o agente só sabe o que percebeu.)
+        if next_pos in self.world.wumpuses and not risky and self.inference_engine is None and self.noise is None:
+            self._log("Evitei mover para %s (Wumpus conhecido). Procurando alternativa segura.", next_pos)
+            # remove essa célula do conjunto seguro para evitar futuros erros
+            self._unmark_safe(next_pos)
+            self._mark_danger(next_pos)
+            next_pos = None
+
+        # Se ainda há movimento possível
+        if next_pos:
+            self.history.append(self.agent_pos)  # Só os movimentos: uma jogada parada não entra no histórico
+            self.agent_pos = next_pos
+
+            # Verifica as condições de vitória/derrota após o movimento
+            world = self.world
+            if self.agent_pos in world.holes:
+                self._log("GAME OVER! Agente caiu em um buraco.")
+                self.game_over = True
+            elif self.agent_pos in world.wumpuses:
+                self._log("GAME OVER! O agente foi morto pelo Wumpus.")
+                self.game_over = True
+            elif self.has_gold and self.agent_pos == self.start_pos:
+                self._log("VITÓRIA! O agente escapou com o ouro.")
+                self.victory = True
+
+
+    def _risky_step(self):
+        """Passo do modo probabilístico: devolve (próxima posição, se é uma aposta)."""
+        if self.planner is None:
+            next_pos = self._least_risky_step()
+        elif self._replaying:
+            next_pos = self._planned.get(len(self.history))
+        else:
+            next_pos = self._planned[len(self.history)] = self.planner.choose(self)
+        if next_pos is None:
+            self.game_over = True
+            self._log("GAME OVER: nenhuma célula restante para arriscar.")
+            return None, False
+        return next_pos, next_pos not in self.safe
+
+    def risky_targets(self):
+        """Células que o agente pode arriscar, com a probabilidade de perigo de cada uma.
+
+        São as células da fronteira ainda não visitadas nem marcadas como perigosas
+        (com probabilidade menor que 1); o caminho até elas pode não existir.
+        """
+        engine = self.risk_engine if self.risk_engine is not None else self.inference_engine
+        probabilities, _ = engine.probabilities(self.knowledge_base)
+        return {c: p for c, p in (probabilities or {}).items()
+                if c not in self.visited and c not in self.danger and p < 1.0}
+
+    def _least_risky_step(self):
+        """Próximo passo em direção à célula da fronteira com menor probabilidade de perigo."""
+        options = self.risky_targets()
+        if not options:
+            return None
+        risk = min(options.values())
+        targets = {c for c, p in options.items() if p <= risk + 1e-12}
+        path = self._find_path_to_target(self.agent_pos, None, self._walkable, target_is_set=True, target_set=targets)
+        if not path or len(path) < 2:
+            return None
+        self._log("Arriscando %s (probabilidade de perigo %.1f%%).", path[-1], risk * 100)
+        return path[1]
+
+    def _is_safe_visited(self, cell):
+        """Indica se a célula já foi visitada e continua segura."""
+        return self._cells.flags[cell[0] * self.GRID_SIZE + cell[1]] & (VISITED | SAFE | DANGER) == VISITED | SAFE
+
+    def _find_path_to_target(self, start, target, safe_cells, target_is_set=False, target_set=None):
+        """Encontra um caminho seguro do início ao alvo (ou ao conjunto de alvos) usando BFS.
+
+        O caminho só passa por células de safe_cells, mas pode terminar em qualquer célula de target_set.
+        """
+        parent = {start: None}  # De onde cada célula foi alcançada (reconstrói o caminho no fim)
+        queue = collections.deque([start])
+
+        while queue:
+            current_pos = queue.popleft()
+
+            if (current_pos in target_set) if target_is_set else (current_pos == target):
+                path = []
+                while current_pos is not None:
+                    path.append(current_pos)
+                    current_pos = parent[current_pos]
+                return path[::-1]
+
+            for neighbor in self.get_adjacent(current_pos[0], current_pos[1]):
+                if (neighbor in safe_cells or (target_is_set and neighbor in target_set)) \
+                        and neighbor not in parent:
+                    parent[neighbor] = current_pos
+                    queue.append(neighbor)
+        return None # Nenhum caminho encontrado
+
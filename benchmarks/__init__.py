@@ -0,0 +1,6 @@
+"""
+Benchmarks do Mundo do Wumpus.
+
+Execute a partir da raiz do repositório, por exemplo:
+    python -m benchmarks.bench_escala
+"""
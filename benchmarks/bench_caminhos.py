@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do planejamento de caminhos em mapas grandes e abertos.
+
+Joga um episódio em cada tamanho de grade com poucos perigos (mapas
+abertos, onde a região segura cresce muito) e, a cada passo, mede:
+- a consulta ao campo de distâncias (next_hop) que step() usa hoje;
+- a BFS da versão antiga, refeita do zero a partir do agente e copiando
+  o caminho inteiro a cada célula enfileirada, para o mesmo alvo.
+O custo de manter os campos atualizados entra no tempo de step().
+
+Uso:
+    python -m benchmarks.bench_caminhos
+    python -m benchmarks.bench_caminhos --tamanhos 32 64 --buracos 0 --max-passos 3000
+"""
+
+import argparse
+import collections
+import statistics
+import time
+
+from agente import new_agent
+
+
+def legacy_path(agent, targets):
+    """BFS antiga: do agente até o alvo mais próximo, com uma cópia do caminho por entrada da fila."""
+    start = agent.agent_pos
+    queue = collections.deque([(start, [start])])
+    seen = {start}
+    while queue:
+        cell, path = queue.popleft()
+        if cell in targets:
+            return path
+        for neighbor in agent.get_adjacent(cell[0], cell[1]):
+            if neighbor in agent._walkable and neighbor not in seen:
+                seen.add(neighbor)
+                queue.append((neighbor, path + [neighbor]))
+    return None
+
+
+def play(options, seed, max_steps):
+    """Devolve os tempos (s) de step(), de next_hop e da BFS antiga em cada passo."""
+    agent = new_agent(verbose=False, seed=seed, **options)
+    step_times, field_times, bfs_times = [], [], []
+    n = agent.GRID_SIZE
+    while not agent.game_over and not agent.victory and len(step_times) < max_steps:
+        start = time.perf_counter()
+        agent.step()
+        step_times.append(time.perf_counter() - start)
+
+        agent_id = agent.agent_pos[0] * n + agent.agent_pos[1]
+        field, targets = ((agent._home_field, {agent.start_pos}) if agent.has_gold
+                          else (agent._explore_field, agent._frontier))
+        start = time.perf_counter()
+        field.next_hop(agent_id)
+        field_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        legacy_path(agent, targets)
+        bfs_times.append(time.perf_counter() - start)
+    return step_times, field_times, bfs_times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o planejamento de caminhos em mapas abertos.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos (poucos = mapa aberto)")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--max-passos", type=int, default=40000, help="limite de passos por episódio")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'grade':>9} {'passos':>7} {'step médio (µs)':>16} {'next_hop (µs)':>14} "
+          f"{'BFS antiga (µs)':>16} {'BFS máx (ms)':>13}")
+    for size in args.tamanhos:
+        options = {"grid_size": size, "num_holes": args.buracos, "num_wumpus": args.wumpus}
+        steps, field, bfs = play(options, args.semente, args.max_passos)
+        print(f"{size:>4}x{size:<4} {len(steps):>7} {statistics.fmean(steps) * 1e6:>16.1f} "
+              f"{statistics.fmean(field) * 1e6:>14.2f} {statistics.fmean(bfs) * 1e6:>16.1f} "
+              f"{max(bfs) * 1e3:>13.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
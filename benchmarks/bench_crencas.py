@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do custo por passo das crenças com ruído (crencas.HazardBelief) por tamanho de grade.
+
+Para cada tamanho N joga um episódio com inference="belief", o modo
+probabilístico e percepções ruidosas (--ruido) e mostra, por observação:
+- o tempo médio e o máximo de HazardBelief.observe (a atualização local);
+- quantos recálculos de célula cada observação fez;
+- o tempo de recalcular o tabuleiro inteiro (HazardBelief.recompute, até
+  estabilizar) a partir do estado final, o custo que cada passo teria sem
+  a atualização local, e a maior diferença entre as duas probabilidades.
+
+A quantidade de buracos acompanha a área da grade (--densidade), como em
+bench_escala.
+
+Uso:
+    python -m benchmarks.bench_crencas
+    python -m benchmarks.bench_crencas --tamanhos 8 32 128 --ruido 0.1 --max-passos 300
+"""
+
+import argparse
+import copy
+import time
+
+from benchmarks.bench_escala import hazard_counts
+from benchmarks.bench_risco import play
+from mundo import PerceptNoise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o custo por passo da atualização local das crenças.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256],
+                        help="lados das grades")
+    parser.add_argument("--densidade", type=float, default=0.05, help="buracos por célula")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--ruido", type=float, default=0.05,
+                        help="taxa de falso positivo e de falso negativo do fedor e do vento")
+    parser.add_argument("--max-passos", type=int, default=500, help="limite de passos por episódio")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    noise = PerceptNoise(args.ruido, args.ruido, args.ruido, args.ruido)
+    print(f"Ruído {args.ruido:.0%} (falso positivo e falso negativo), densidade {args.densidade}, "
+          f"{args.wumpus} Wumpus")
+    print(f"{'grade':>9} {'observações':>12} {'médio (µs)':>11} {'máx. (µs)':>10} {'recálculos/obs.':>16} "
+          f"{'completo (ms)':>14} {'varreduras':>11} {'dif. máx.':>10}")
+    for n in args.tamanhos:
+        options = dict(hazard_counts(n, args.densidade, args.wumpus), inference="belief", probabilistic=True,
+                       noise=noise)
+        belief = play(options, args.semente, args.max_passos).inference_engine
+        stats = belief.stats
+        observations = stats["observations"]
+
+        full = copy.deepcopy(belief)
+        start = time.perf_counter()
+        sweeps = full.recompute()
+        full_ms = (time.perf_counter() - start) * 1e3
+        difference = max(abs(a - b) for a, b in zip(belief.pit + belief.wumpus, full.pit + full.wumpus))
+
+        print(f"{f'{n}x{n}':>9} {observations:>12} {stats['time'] / observations * 1e6:>11.1f} "
+              f"{stats['max_time'] * 1e6:>10.1f} {stats['updates'] / observations:>16.1f} "
+              f"{full_ms:>14.2f} {sweeps:>11} {difference:>10.2e}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
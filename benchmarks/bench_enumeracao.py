@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da avaliação exata (enumeracao.py) contra a amostragem por sementes.
+
+Para a configuração dada, mostra o tempo e a taxa de vitórias de:
+- enumerate_maps sozinho, com e sem deduplicação por simetria (só gerar os mapas);
+- evaluate_exact sem simetria (o valor exato do agente como está);
+- evaluate_exact com simetria (um mapa por classe, pesado pela multiplicidade:
+  uma aproximação, porque o agente não é simétrico);
+- simulacao.run_seed_range com --episodios sementes, com o intervalo de
+  confiança de 95% e quantos episódios a amostragem precisaria para um
+  intervalo de ±0,1 ponto percentual.
+
+Uso:
+    python -m benchmarks.bench_enumeracao
+    python -m benchmarks.bench_enumeracao --probabilistico --episodios 50000
+"""
+
+import argparse
+import math
+import time
+
+from agente import INFERENCE_MODES
+from enumeracao import enumerate_maps, evaluate_exact
+from simulacao import run_seed_range, summarize
+
+# Meia largura do intervalo de confiança usada para estimar o custo da amostragem
+TARGET_HALF_WIDTH = 0.001
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara a avaliação exata com a amostragem por sementes.")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--inferencia", choices=INFERENCE_MODES, default="rules", help="motor de inferência do agente")
+    parser.add_argument("--probabilistico", action="store_true",
+                        help="sem células seguras, arrisca a de menor probabilidade de perigo")
+    parser.add_argument("--episodios", type=int, default=20000, help="sementes da amostragem")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {"inference": args.inferencia, "probabilistic": args.probabilistico}
+    print(f"Grade {args.grade}x{args.grade}, {args.buracos} buracos, {args.wumpus} Wumpus")
+    for dedup in (False, True):
+        start = time.perf_counter()
+        maps = [m.multiplicity for m in enumerate_maps(args.grade, args.buracos, args.wumpus, dedup)]
+        print(f"enumerate_maps(dedup={dedup}): {len(maps)} mapas ({sum(maps)} com as multiplicidades) "
+              f"em {(time.perf_counter() - start) * 1e3:.1f} ms")
+    print()
+
+    print(f"{'método':>22} {'mapas':>7} {'tempo (s)':>10} {'vitórias':>10} {'IC 95%':>9} {'dif. exato':>11}")
+    exact = evaluate_exact(args.grade, args.buracos, args.wumpus, dedup=False, world_options=options)
+    rows = [("exato", exact), ("simetria (aprox.)", evaluate_exact(args.grade, args.buracos, args.wumpus,
+                                                                   dedup=True, world_options=options))]
+    for label, summary in rows:
+        print(f"{label:>22} {summary['evaluated']:>7} {summary['elapsed']:>10.2f} "
+              f"{float(summary['win_rate']):>10.4%} {'-':>9} {float(summary['win_rate'] - exact['win_rate']):>+11.4%}",
+              flush=True)
+
+    world_options = dict(options, grid_size=args.grade, num_holes=args.buracos, num_wumpus=args.wumpus)
+    start = time.perf_counter()
+    counts = run_seed_range(args.semente, args.semente + args.episodios, world_options=world_options)
+    sampled = summarize(counts, time.perf_counter() - start)
+    p = sampled["win_rate"]
+    half_width = 1.96 * math.sqrt(p * (1 - p) / sampled["episodes"])
+    print(f"{'amostragem':>22} {sampled['episodes']:>7} {sampled['elapsed']:>10.2f} {p:>10.4%} "
+          f"{'±%.2f%%' % (half_width * 100):>9} {p - float(exact['win_rate']):>+11.4%}")
+
+    needed = math.ceil(p * (1 - p) * (1.96 / TARGET_HALF_WIDTH) ** 2)
+    print(f"\nPara ±{TARGET_HALF_WIDTH:.1%}, a amostragem precisaria de {needed} episódios "
+          f"(~{needed / sampled['episodes_per_second']:.0f} s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de escala: geração de mapa, custo por passo e memória por tamanho de grade.
+
+Para cada tamanho N (de 4x4 até 256x256 por padrão) mede:
+- o tempo médio de _generate_solvable_map;
+- o tempo de cada step() (inferência + planejamento) ao longo de um episódio;
+- o pico de memória (tracemalloc) para criar o mundo e jogar o episódio.
+
+A quantidade de buracos acompanha a área da grade (--densidade), com no
+mínimo 2 buracos, como no mapa 4x4 original.
+
+Uso:
+    python -m benchmarks.bench_escala
+    python -m benchmarks.bench_escala --tamanhos 4 16 64 --max-passos 200
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from agente import new_agent
+from mundo import WumpusWorld
+
+
+def hazard_counts(grid_size, density, num_wumpus):
+    """Quantidade de buracos e Wumpus para uma grade de lado grid_size."""
+    return {"grid_size": grid_size, "num_holes": max(2, round(density * grid_size * grid_size)),
+            "num_wumpus": num_wumpus}
+
+
+def time_map_generation(options, repeats, seed=0):
+    """Tempo médio (s) para gerar um mapa solucionável com as opções dadas."""
+    world = WumpusWorld(seed=seed, **options)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        world._generate_solvable_map(world.GRID_SIZE, world.start_pos, world.num_holes, world.num_wumpus)
+    return (time.perf_counter() - start) / repeats
+
+
+def time_steps(options, max_steps, seed=0):
+    """Joga um episódio e devolve a duração (s) de cada chamada a step()."""
+    agent = new_agent(verbose=False, seed=seed, **options)
+    durations = []
+    while not agent.game_over and not agent.victory and len(durations) < max_steps:
+        previous_pos = agent.agent_pos
+        start = time.perf_counter()
+        agent.step()
+        durations.append(time.perf_counter() - start)
+        if agent.agent_pos == previous_pos:
+            break
+    return durations
+
+
+def peak_memory(options, max_steps, seed=0):
+    """Pico de memória (bytes) para criar o mundo e jogar um episódio."""
+    tracemalloc.start()
+    try:
+        agent = new_agent(verbose=False, seed=seed, **options)
+        for _ in range(max_steps):
+            if agent.game_over or agent.victory:
+                break
+            agent.step()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede como o Mundo do Wumpus escala com o tamanho da grade.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[4, 8, 16, 32, 64, 128, 256])
+    parser.add_argument("--densidade", type=float, default=0.125, help="fração das células com buraco")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--mapas", type=int, default=5, help="mapas gerados por tamanho")
+    parser.add_argument("--max-passos", type=int, default=500, help="limite de passos por episódio")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'grade':>9} {'buracos':>8} {'mapa (ms)':>10} {'passos':>7} "
+          f"{'passo médio (µs)':>17} {'passo p95 (µs)':>15} {'pico mem (KiB)':>15}")
+    for size in args.tamanhos:
+        options = hazard_counts(size, args.densidade, args.wumpus)
+        generation = time_map_generation(options, args.mapas, args.semente)
+        durations = time_steps(options, args.max_passos, args.semente)
+        memory = peak_memory(options, args.max_passos, args.semente)
+        mean_step = statistics.fmean(durations) if durations else 0.0
+        p95_step = sorted(durations)[int(0.95 * (len(durations) - 1))] if durations else 0.0
+        print(f"{size:>4}x{size:<4} {options['num_holes']:>8} {generation * 1e3:>10.2f} {len(durations):>7} "
+              f"{mean_step * 1e6:>17.1f} {p95_step * 1e6:>15.1f} {memory / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da gravação de episódios (gravacao.py).
+
+Grava os mesmos episódios com quadros-chave a cada K jogadas (vários K)
+e mostra:
+- o custo da gravação por jogada (tempo de record());
+- bytes por jogada no arquivo, ao lado de um retrato completo por jogada
+  (um byte por célula, o mínimo para guardar o estado inteiro);
+- o tempo médio de seek() para jogadas sorteadas, ao lado de refazer o
+  episódio desde o início até a jogada pedida.
+
+Uso:
+    python -m benchmarks.bench_gravacao
+    python -m benchmarks.bench_gravacao --grade 32 --buracos 60 --episodios 50 --intervalos 16 256
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from gravacao import EpisodeLog, EpisodeRecorder
+from agente import new_agent
+
+
+def record(path, options, seeds, max_steps, keyframe_interval):
+    """Grava um episódio por semente. Devolve (jogadas gravadas, tempos de record())."""
+    durations = []
+    with EpisodeRecorder(path, keyframe_interval) as recorder:
+        for seed in seeds:
+            agent = new_agent(verbose=False, seed=seed, **options)
+            recorder.begin(agent, seed)
+            for _ in range(max_steps):
+                if agent.game_over or agent.victory:
+                    break
+                agent.step()
+                start = time.perf_counter()
+                recorder.record(agent)
+                durations.append(time.perf_counter() - start)
+    return len(durations), durations
+
+
+def replay_from_start(replay, step):
+    """Refaz o episódio desde o quadro inicial até step, sem usar os quadros-chave seguintes."""
+    replay.seek(0)
+    for _ in range(step):
+        replay._advance()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede tamanho, custo e busca da gravação de episódios.")
+    parser.add_argument("--grade", type=int, default=16, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=20, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--episodios", type=int, default=200)
+    parser.add_argument("--max-passos", type=int, default=5000, help="limite de passos por episódio")
+    parser.add_argument("--intervalos", type=int, nargs="+", default=[16, 64, 256],
+                        help="jogadas entre quadros-chave")
+    parser.add_argument("--buscas", type=int, default=2000, help="buscas sorteadas por intervalo")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus, "probabilistic": True}
+    seeds = range(args.semente, args.semente + args.episodios)
+    cells = args.grade * args.grade
+    rng = random.Random(args.semente)
+    print(f"Grade {args.grade}x{args.grade}, {args.episodios} episódios "
+          f"(retrato completo: {cells} bytes por jogada)")
+    print(f"{'intervalo':>9} {'jogadas':>8} {'bytes/jogada':>13} {'record (µs)':>12} "
+          f"{'seek (µs)':>10} {'refazer (µs)':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for interval in args.intervalos:
+            path = os.path.join(directory, f"episodios-{interval}.wump")
+            steps, durations = record(path, options, seeds, args.max_passos, interval)
+            size = os.path.getsize(path)
+            seek_times, replay_times = [], []
+            with EpisodeLog(path) as log:
+                for _ in range(args.buscas):
+                    replay = log.episode(rng.randrange(len(log)))
+                    step = rng.randrange(len(replay))
+                    replay.seek(rng.randrange(len(replay)))  # Parte de uma jogada qualquer, como ao arrastar
+                    start = time.perf_counter()
+                    replay.seek(step)
+                    seek_times.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    replay_from_start(replay, step)
+                    replay_times.append(time.perf_counter() - start)
+            print(f"{interval:>9} {steps:>8} {size / steps:>13.1f} {statistics.fmean(durations) * 1e6:>12.2f} "
+                  f"{statistics.fmean(seek_times) * 1e6:>10.1f} {statistics.fmean(replay_times) * 1e6:>13.1f}",
+                  flush=True)
+
+
+if __name__ == "__main__":
+    main()
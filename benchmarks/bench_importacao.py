@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do tempo de importação dos módulos (o custo de subir um processo trabalhador).
+
+Cada medida roda em um interpretador novo (a mediana de algumas
+repetições). O Pygame é bloqueado (como se não estivesse instalado):
+importar o simulador (mundo e agente), a simulação ou o
+servidor não pode precisar dele. Para comparar, mede também o que a interface gráfica paga
+ao abrir (init_display: importar o Pygame, criar a janela e carregar as
+fontes), com o driver de vídeo "dummy" do SDL.
+
+Uso:
+    python -m benchmarks.bench_importacao
+    python -m benchmarks.bench_importacao --repeticoes 20 --modulos agente simulacao
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = ["mundo", "agente", "simulacao", "servidor", "interface", "codigo"]
+
+# Importa um módulo com o Pygame bloqueado e mostra o tempo e se o Pygame foi carregado
+_IMPORT_SCRIPT = """
+import sys, time
+class Blocker:
+    def find_spec(self, name, path=None, target=None):
+        if name == "pygame" or name.startswith("pygame."):
+            raise ImportError("pygame bloqueado pelo benchmark")
+sys.meta_path.insert(0, Blocker())
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "pygame" in sys.modules)
+"""
+
+# Abre a interface (sem janela de verdade) e mostra o tempo de init_display()
+_DISPLAY_SCRIPT = """
+import time
+import interface
+start = time.perf_counter()
+interface.init_display()
+print(time.perf_counter() - start, True)
+"""
+
+
+def run_script(script):
+    """Roda script em um interpretador novo na raiz do projeto. Devolve (segundos, carregou o Pygame)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True, text=True,
+                            check=True).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação dos módulos, sem o Pygame.")
+    parser.add_argument("--repeticoes", type=int, default=10, help="interpretadores por medida")
+    parser.add_argument("--modulos", nargs="+", default=MODULES, help="módulos a importar")
+    parser.add_argument("--sem-janela", action="store_true", help="não mede init_display()")
+    args = parser.parse_args(argv)
+
+    print(f"{'módulo':>24} {'mediana (ms)':>13} {'mín. (ms)':>10} {'Pygame':>7}")
+    rows = [(module, _IMPORT_SCRIPT.format(module=module)) for module in args.modulos]
+    if not args.sem_janela:
+        rows.append(("init_display()", _DISPLAY_SCRIPT))
+    for label, script in rows:
+        runs = [run_script(script) for _ in range(args.repeticoes)]
+        times = [seconds * 1e3 for seconds, _ in runs]
+        loaded = "sim" if any(pygame for _, pygame in runs) else "não"
+        print(f"{label:>24} {statistics.median(times):>13.2f} {min(times):>10.2f} {loaded:>7}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da inferência incremental: custo de logical_update ao longo do episódio.
+
+Joga episódios longos em mapas grandes e abertos e agrupa o tempo de cada
+chamada a logical_update pelo número do passo. Com a inferência incremental,
+o custo médio de cada faixa deve se manter estável à medida que a base de
+conhecimento cresce (antes ele crescia com o número de células visitadas).
+
+Uso:
+    python -m benchmarks.bench_inferencia
+    python -m benchmarks.bench_inferencia --grade 256 --max-passos 5000
+"""
+
+import argparse
+import collections
+import statistics
+import time
+
+from agente import new_agent
+
+
+def inference_times(options, max_steps, seed):
+    """Joga um episódio e devolve o tempo (s) de logical_update em cada passo."""
+    agent = new_agent(verbose=False, seed=seed, **options)
+    durations = []
+    while not agent.game_over and not agent.victory and len(durations) < max_steps:
+        previous_pos = agent.agent_pos
+        start = time.perf_counter()
+        agent.logical_update()
+        durations.append(time.perf_counter() - start)
+        agent.step() # logical_update já rodou nesta posição; step() só escolhe o movimento
+        if agent.agent_pos == previous_pos:
+            break
+    return durations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o custo por passo da inferência ao longo de episódios longos.")
+    parser.add_argument("--grade", type=int, default=128, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=40, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--episodios", type=int, default=5)
+    parser.add_argument("--max-passos", type=int, default=3000, help="limite de passos por episódio")
+    parser.add_argument("--faixa", type=int, default=500, help="passos por faixa do relatório")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus}
+    buckets = collections.defaultdict(list)
+    for seed in range(args.semente, args.semente + args.episodios):
+        for i, duration in enumerate(inference_times(options, args.max_passos, seed)):
+            buckets[i // args.faixa].append(duration)
+
+    print(f"Grade {args.grade}x{args.grade}, {args.buracos} buracos, {args.wumpus} Wumpus, {args.episodios} episódios")
+    print(f"{'passos':>13} {'amostras':>9} {'médio (µs)':>11} {'máximo (µs)':>12}")
+    for bucket in sorted(buckets):
+        durations = buckets[bucket]
+        first = bucket * args.faixa
+        print(f"{first:>6}-{first + args.faixa - 1:<6} {len(durations):>9} "
+              f"{statistics.fmean(durations) * 1e6:>11.1f} {max(durations) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
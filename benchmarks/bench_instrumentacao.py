@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do custo da instrumentação (instrumentacao.py) e das mensagens de depuração.
+
+Joga os mesmos episódios em quatro modos e mostra jogadas por segundo
+(a melhor de algumas repetições, alternando os modos):
+- sem instrumentação e sem mensagens (o padrão);
+- com Instrumentation (contadores por regra e cronômetros);
+- com Instrumentation e um gancho que recebe as mensagens formatadas;
+- com verbose=True, escrevendo as mensagens em os.devnull (o custo dos
+  print() de antes, sem o terminal).
+Depois mostra o relatório da instrumentação.
+
+Uso:
+    python -m benchmarks.bench_instrumentacao
+    python -m benchmarks.bench_instrumentacao --grade 16 --buracos 20 --episodios 200
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+from instrumentacao import EventHook, Instrumentation
+from agente import INFERENCE_MODES, new_agent
+
+
+class CountingHook(EventHook):
+    """Gancho que só conta as mensagens (para medir o custo de formatá-las)."""
+
+    def __init__(self):
+        self.messages = 0
+
+    def on_message(self, agent, message):
+        self.messages += 1
+
+
+def play(seeds, max_steps, options):
+    """Joga um episódio por semente. Devolve (jogadas, segundos)."""
+    steps = 0
+    start = time.perf_counter()
+    for seed in seeds:
+        agent = new_agent(seed=seed, **options)
+        for _ in range(max_steps):
+            if agent.game_over or agent.victory:
+                break
+            agent.step()
+            steps += 1
+    return steps, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o custo da instrumentação e das mensagens de depuração.")
+    parser.add_argument("--grade", type=int, default=8, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=6, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--inferencia", choices=INFERENCE_MODES, default="rules", help="motor de inferência")
+    parser.add_argument("--episodios", type=int, default=1000)
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus,
+               "inference": args.inferencia, "probabilistic": True}
+    seeds = range(args.semente, args.semente + args.episodios)
+    probe = Instrumentation()
+    hooked = Instrumentation([CountingHook()])
+    modes = [
+        ("sem instrumentação", {}),
+        ("Instrumentation", {"instrumentation": probe}),
+        ("Instrumentation + gancho", {"instrumentation": hooked}),
+        ("verbose (os.devnull)", {"verbose": True}),
+    ]
+    print(f"Grade {args.grade}x{args.grade}, {args.episodios} episódios")
+    print(f"{'modo':>26} {'jogadas/s':>10} {'µs/jogada':>10} {'custo':>7}")
+    best = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        play(seeds, args.max_passos, options)  # Aquecimento (tabelas de vizinhos, caches)
+        for _ in range(args.repeticoes):
+            for label, extra in modes:
+                steps, elapsed = play(seeds, args.max_passos, dict(options, **extra))
+                best[label] = min(best.get(label, (steps, elapsed)), (steps, elapsed), key=lambda r: r[1])
+    probe.clear()
+    play(seeds, args.max_passos, dict(options, instrumentation=probe))
+    baseline = None
+    for label, _ in modes:
+        steps, elapsed = best[label]
+        per_step = elapsed / steps * 1e6
+        baseline = baseline or per_step
+        print(f"{label:>26} {steps / elapsed:>10.0f} {per_step:>10.2f} {per_step / baseline - 1:>+7.1%}", flush=True)
+    print()
+    print(probe.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do lote vetorizado (lote.BatchedWumpusWorld) contra o laço por mundo.
+
+Para cada tamanho de lote joga os mesmos mapas com run_batched e mostra
+episódios por segundo ao lado de simulacao.run_batch (um agente.InferenceAgent
+por vez). Os agentes são diferentes: o do lote é uma versão simplificada do
+agente de regras, então as taxas de vitória não precisam coincidir. Requer NumPy.
+
+Uso:
+    python -m benchmarks.bench_lote
+    python -m benchmarks.bench_lote --grade 16 --buracos 30 --episodios 2000 --lotes 256 2048
+"""
+
+import argparse
+
+from lote import run_batched
+from simulacao import run_batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara o lote vetorizado com a simulação mundo a mundo.")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--episodios", type=int, default=20000)
+    parser.add_argument("--lotes", type=int, nargs="+", default=[64, 512, 4096], help="tamanhos de lote")
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus}
+    print(f"Grade {args.grade}x{args.grade}, {args.buracos} buracos, {args.wumpus} Wumpus, {args.episodios} episódios")
+    print(f"{'modo':>14} {'agente':>13} {'vitórias':>9} {'episódios/s':>12}")
+    scalar = run_batch(args.episodios, args.semente, args.max_passos, options)
+    print(f"{'mundo a mundo':>14} {'regras':>13} {scalar['win_rate']:>9.2%} {scalar['episodes_per_second']:>12.1f}")
+    for batch_size in args.lotes:
+        summary = run_batched(args.episodios, args.semente, args.max_passos, batch_size, options)
+        print(f"{f'lote {batch_size}':>14} {'simplificado':>13} {summary['win_rate']:>9.2%} "
+              f"{summary['episodes_per_second']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da geração de mapas solucionáveis (mapas por segundo).
+
+Para cada tamanho de grade e densidade de buracos mede quantos mapas
+_generate_solvable_map gera por segundo. Com --legado, mede também a
+geração antiga (rejeição com duas BFS que copiam o caminho a cada passo)
+nos tamanhos até --legado-ate, para comparação.
+
+Uso:
+    python -m benchmarks.bench_mapas
+    python -m benchmarks.bench_mapas --tamanhos 16 64 --densidades 0.1 0.3 --legado
+"""
+
+import argparse
+import collections
+import time
+
+from mundo import WumpusWorld
+
+
+def legacy_path_exists(start, end, obstacles, grid_size):
+    """BFS da versão antiga, que guarda uma cópia do caminho em cada entrada da fila."""
+    queue = collections.deque([(start, [start])])
+    visited = {start}
+    while queue:
+        (r, c), path = queue.popleft()
+        if (r, c) == end:
+            return True
+        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < grid_size and 0 <= nc < grid_size and \
+               (nr, nc) not in obstacles and (nr, nc) not in visited:
+                visited.add((nr, nc))
+                queue.append(((nr, nc), path + [(nr, nc)]))
+    return False
+
+
+def legacy_generate(world, grid_size, start_pos, num_holes, num_wumpus):
+    """Geração por rejeição da versão antiga (listas refeitas e duas BFS a cada tentativa)."""
+    all_cells = [(x, y) for x in range(grid_size) for y in range(grid_size)]
+    forbidden = {start_pos} | set(world.get_adjacent(start_pos[0], start_pos[1]))
+    while True:
+        possible_wumpus_cells = [c for c in all_cells if c not in forbidden]
+        wumpus_pos = world.rng.sample(possible_wumpus_cells, num_wumpus)
+        possible_gold_cells = [c for c in possible_wumpus_cells if c not in wumpus_pos]
+        gold_pos = world.rng.choice(possible_gold_cells)
+        possible_hole_cells = [c for c in possible_gold_cells if c != gold_pos]
+        holes_pos = world.rng.sample(possible_hole_cells, num_holes)
+        obstacles = set(wumpus_pos) | set(holes_pos)
+        if legacy_path_exists(start_pos, gold_pos, obstacles, grid_size) and \
+           legacy_path_exists(gold_pos, start_pos, obstacles, grid_size):
+            return wumpus_pos, holes_pos, gold_pos
+
+
+def maps_per_second(generate, world, min_time):
+    """Gera mapas por pelo menos min_time segundos e devolve a taxa."""
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        generate(world, world.GRID_SIZE, world.start_pos, world.num_holes, world.num_wumpus)
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def current_generate(world, grid_size, start_pos, num_holes, num_wumpus):
+    return world._generate_solvable_map(grid_size, start_pos, num_holes, num_wumpus)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a geração de mapas solucionáveis.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[4, 8, 16, 32, 64, 128, 256])
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.05, 0.125, 0.25, 0.35],
+                        help="frações das células com buraco")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--tempo", type=float, default=0.5, help="segundos de medição por configuração")
+    parser.add_argument("--legado", action="store_true", help="mede também a geração antiga")
+    parser.add_argument("--legado-ate", type=int, default=64, help="maior grade medida com a geração antiga")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    header = f"{'grade':>9} {'densidade':>10} {'buracos':>8} {'mapas/s':>10}"
+    if args.legado:
+        header += f" {'legado/s':>10} {'ganho':>7}"
+    print(header)
+    for size in args.tamanhos:
+        for density in args.densidades:
+            num_holes = max(2, round(density * size * size))
+            try:
+                world = WumpusWorld(seed=args.semente, grid_size=size,
+                                    num_holes=num_holes, num_wumpus=args.wumpus)
+            except ValueError as error:
+                print(f"{size:>4}x{size:<4} {density:>10.3f} {num_holes:>8} {error}")
+                continue
+            rate = maps_per_second(current_generate, world, args.tempo)
+            line = f"{size:>4}x{size:<4} {density:>10.3f} {num_holes:>8} {rate:>10.1f}"
+            if args.legado and size <= args.legado_ate:
+                legacy_rate = maps_per_second(legacy_generate, world, args.tempo)
+                line += f" {legacy_rate:>10.1f} {rate / legacy_rate:>6.1f}x"
+            print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
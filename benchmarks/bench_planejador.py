@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do planejador por Monte Carlo (busca.MonteCarloPlanner).
+
+Joga as mesmas sementes com o agente probabilístico guloso (arrisca a
+célula de menor probabilidade de perigo) e com o planejador em vários
+orçamentos de tempo por decisão, e mostra a taxa de vitórias, o tempo
+médio e o máximo de cada decisão do planejador e quantas simulações ele
+jogou por decisão. Só as apostas passam pelo planejador; as jogadas
+seguras custam o mesmo nos dois agentes.
+
+Uso:
+    python -m benchmarks.bench_planejador
+    python -m benchmarks.bench_planejador --grade 6 --buracos 5 --episodios 300 --orcamentos 10 50 200
+"""
+
+import argparse
+import time
+
+from busca import MonteCarloPlanner
+from simulacao import run_episode
+
+
+def evaluate(seeds, max_steps, options):
+    """Vitórias e tempo total jogando uma semente de cada vez."""
+    victories = 0
+    start = time.perf_counter()
+    for seed in seeds:
+        victories += run_episode(seed, max_steps, options).victory
+    return victories, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara o agente guloso com o planejador por Monte Carlo.")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=3, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--episodios", type=int, default=300)
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--orcamentos", type=float, nargs="+", default=[5, 20, 50],
+                        help="tempos por decisão do planejador, em ms")
+    parser.add_argument("--trabalhadores", type=int, default=1, help="processos de cada planejador")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus, "probabilistic": True}
+    seeds = range(args.semente, args.semente + args.episodios)
+    print(f"Grade {args.grade}x{args.grade}, {args.buracos} buracos, {args.wumpus} Wumpus, {args.episodios} episódios")
+    print(f"{'agente':>18} {'vitórias':>9} {'decisões':>9} {'decisão (ms)':>13} {'máx (ms)':>9} "
+          f"{'simulações':>11} {'tempo (s)':>10}")
+    victories, elapsed = evaluate(seeds, args.max_passos, options)
+    print(f"{'guloso':>18} {victories / args.episodios:>9.2%} {'-':>9} {'-':>13} {'-':>9} {'-':>11} {elapsed:>10.2f}",
+          flush=True)
+    for budget in args.orcamentos:
+        planner = MonteCarloPlanner(time_budget=budget / 1000, workers=args.trabalhadores, seed=args.semente)
+        try:
+            victories, elapsed = evaluate(seeds, args.max_passos, dict(options, planner=planner))
+        finally:
+            planner.close()
+        stats = planner.stats
+        decisions = max(1, stats["decisions"])
+        print(f"{f'planejador {budget:g} ms':>18} {victories / args.episodios:>9.2%} {stats['decisions']:>9} "
+              f"{stats['time'] / decisions * 1e3:>13.2f} {stats['max_time'] * 1e3:>9.2f} "
+              f"{stats['rollouts'] / decisions:>11.1f} {elapsed:>10.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do desenho: redesenho completo x regiões sujas (interface.Renderer).
+
+Usa o driver de vídeo "dummy" do SDL (não abre janela) e mede, por
+tamanho de grade, o tempo de um quadro:
+- no desenho antigo (tela inteira, fontes renderizadas de novo a cada quadro);
+- no Renderer depois de um step() (só as células alteradas);
+- no Renderer sem mudanças (quadro ocioso).
+
+Uso:
+    python -m benchmarks.bench_render
+    python -m benchmarks.bench_render --tamanhos 4 32 --passos 100
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import interface
+from agente import new_agent
+from grade import DANGER, SAFE, VISITED
+from interface import BLACK, BLUE, BROWN, GOLD, GRAY, GREEN, RED, WHITE
+
+
+def legacy_draw(surface, agent, tile):
+    """Desenho da versão antiga: limpa a tela e renderiza todas as células e letras a cada quadro."""
+    pygame = interface.pygame
+    surface.fill(BROWN)
+    for x in range(agent.GRID_SIZE):
+        for y in range(agent.GRID_SIZE):
+            rect = pygame.Rect(x * tile, y * tile, tile, tile)
+            cell = (x, y)
+            flags = agent._cells.flags[x * agent.GRID_SIZE + y]
+            color = WHITE if flags & VISITED else GREEN if flags & SAFE else RED if flags & DANGER else GRAY
+            pygame.draw.rect(surface, color, rect)
+            if cell == agent.world.gold:
+                text = interface.danger_font.render("G", True, GOLD)
+                surface.blit(text, text.get_rect(center=rect.center))
+            if cell in agent.world.wumpuses:
+                text = interface.danger_font.render("W", True, (150, 0, 0))
+                surface.blit(text, text.get_rect(center=rect.center))
+            elif cell in agent.world.holes:
+                text = interface.danger_font.render("B", True, BLACK)
+                surface.blit(text, text.get_rect(center=rect.center))
+            pygame.draw.rect(surface, BLACK, rect, 2)
+            if cell in agent.knowledge_base:
+                fedor, vento, brilho = agent.knowledge_base[cell]
+                if fedor: surface.blit(interface.icon_font.render("F", True, BLACK), (rect.left + 5, rect.top))
+                if vento: surface.blit(interface.icon_font.render("V", True, BLUE), (rect.right - 35, rect.top))
+    pygame.draw.circle(surface, BLUE, (agent.agent_pos[0] * tile + tile // 2, agent.agent_pos[1] * tile + tile // 2),
+                       tile // 3)
+    for label in ("← Voltar", "Próximo →", "Reiniciar"):
+        interface.font.render(label, True, BLACK)
+    interface.status_font.render("Caçando o ouro...", True, WHITE)
+
+
+def mean_ms(durations):
+    return statistics.fmean(durations) * 1e3 if durations else float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara o desenho completo com o desenho por regiões sujas.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--passos", type=int, default=200, help="passos (quadros) por tamanho")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    interface.init_display()
+    pygame = interface.pygame
+    print(f"{'grade':>9} {'antigo (ms)':>12} {'após step (ms)':>15} {'ocioso (ms)':>12} {'retângulos':>11}")
+    for size in args.tamanhos:
+        tile = max(8, interface.TILE_SIZE * interface.GRID_SIZE // size)
+        surface = pygame.Surface((max(size * tile, interface.WIDTH), size * tile + 100))
+        agent = new_agent(verbose=False, seed=args.semente, grid_size=size,
+                          num_holes=max(2, size * size // 8), probabilistic=True)
+        renderer = interface.Renderer(surface, tile)
+        renderer.draw(agent)
+        legacy, stepped, idle, rects = [], [], [], []
+        for _ in range(args.passos):
+            if agent.game_over or agent.victory:
+                agent.reset()
+            agent.step()
+            start = time.perf_counter()
+            legacy_draw(surface, agent, tile)
+            legacy.append(time.perf_counter() - start)
+            renderer.invalidate()
+            renderer.draw(agent)
+            agent.step()
+            start = time.perf_counter()
+            rects.append(len(renderer.draw(agent)))
+            stepped.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            renderer.draw(agent)
+            idle.append(time.perf_counter() - start)
+        print(f"{size:>4}x{size:<4} {mean_ms(legacy):>12.3f} {mean_ms(stepped):>15.3f} {mean_ms(idle):>12.4f} "
+              f"{statistics.fmean(rects):>11.1f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
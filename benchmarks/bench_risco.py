@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do modo probabilístico (probabilidade.FrontierRisk).
+
+Joga os mesmos mapas com e sem o modo probabilístico, para cada motor de
+inferência, e mostra a taxa de vitória, o tempo médio de cada cálculo de
+risco da fronteira e o aproveitamento do cache de componentes.
+
+Uso:
+    python -m benchmarks.bench_risco
+    python -m benchmarks.bench_risco --grade 8 --buracos 6 --episodios 500
+"""
+
+import argparse
+
+from agente import INFERENCE_MODES, new_agent
+from probabilidade import FrontierRisk
+from simulacao import progress_key
+
+
+def play(options, seed, max_steps):
+    """Joga um episódio e devolve o mundo no estado final."""
+    agent = new_agent(verbose=False, seed=seed, **options)
+    steps = 0
+    while not agent.game_over and not agent.victory and steps < max_steps:
+        previous = progress_key(agent)
+        agent.step()
+        if progress_key(agent) == previous:
+            break
+        steps += 1
+    return agent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o modo probabilístico do agente.")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--episodios", type=int, default=1000)
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"Grade {args.grade}x{args.grade}, {args.buracos} buracos, {args.wumpus} Wumpus, {args.episodios} episódios")
+    print(f"{'motor':>6} {'probabilístico':>15} {'vitórias':>9} {'mortes':>7} {'cálculos':>9} {'médio (µs)':>11}")
+    for mode in INFERENCE_MODES:
+        for probabilistic in (False, True):
+            options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus,
+                       "inference": mode, "probabilistic": probabilistic}
+            victories = deaths = calls = 0
+            elapsed = 0.0
+            for seed in range(args.semente, args.semente + args.episodios):
+                agent = play(options, seed, args.max_passos)
+                victories += agent.victory
+                deaths += agent.agent_pos in agent.world.holes or agent.agent_pos in agent.world.wumpuses
+                if agent.risk_engine is not None:
+                    calls += agent.risk_engine.stats["calls"]
+                    elapsed += agent.risk_engine.stats["time"]
+            mean = f"{elapsed / calls * 1e6:.1f}" if calls else "-"
+            print(f"{mode:>6} {'sim' if probabilistic else 'não':>15} {victories / args.episodios:>9.2%} "
+                  f"{deaths:>7} {calls:>9} {mean:>11}")
+
+    info = FrontierRisk.cache_info()
+    lookups = info.hits + info.misses
+    if lookups:
+        print(f"Cache de componentes: {info.hits}/{lookups} acertos ({info.hits / lookups:.1%}), "
+              f"{info.currsize} assinaturas guardadas")
+
+
+if __name__ == "__main__":
+    main()
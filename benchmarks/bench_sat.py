@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos motores de inferência: regras escritas à mão x SAT.
+
+Joga os mesmos mapas com inference="rules" e inference="sat" e compara
+taxa de vitória, mortes, quantas células o agente conhece como seguras a
+cada passo e a latência da inferência por passo (média, p95 e máxima),
+além das estatísticas do resolvedor SAT.
+
+Uso:
+    python -m benchmarks.bench_sat
+    python -m benchmarks.bench_sat --grade 16 --buracos 20 --episodios 200
+"""
+
+import argparse
+import statistics
+import time
+
+from agente import INFERENCE_MODES, new_agent
+from simulacao import progress_key
+
+
+def play(options, seed, max_steps):
+    """Joga um episódio e devolve (mundo, tempos de inferência, células seguras por passo)."""
+    agent = new_agent(verbose=False, seed=seed, **options)
+    durations, safe_counts = [], []
+    while not agent.game_over and not agent.victory and len(durations) < max_steps:
+        previous = progress_key(agent)
+        start = time.perf_counter()
+        agent.logical_update()
+        durations.append(time.perf_counter() - start)
+        safe_counts.append(len(agent.safe - agent.danger))
+        agent.step()
+        if progress_key(agent) == previous:
+            break
+    return agent, durations, safe_counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara os motores de inferência do agente.")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--episodios", type=int, default=1000)
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"Grade {args.grade}x{args.grade}, {args.buracos} buracos, {args.wumpus} Wumpus, {args.episodios} episódios")
+    print(f"{'motor':>6} {'vitórias':>9} {'mortes':>7} {'seguras/passo':>14} "
+          f"{'médio (µs)':>11} {'p95 (µs)':>9} {'máx (µs)':>9}")
+    for mode in INFERENCE_MODES:
+        options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus, "inference": mode}
+        victories = deaths = 0
+        durations, safe_counts, solver_stats = [], [], []
+        for seed in range(args.semente, args.semente + args.episodios):
+            agent, times, safe = play(options, seed, args.max_passos)
+            victories += agent.victory
+            deaths += agent.agent_pos in agent.world.holes or agent.agent_pos in agent.world.wumpuses
+            durations += times
+            safe_counts += safe
+            if mode == "sat":  # O motor de crenças (belief) não tem resolvedor
+                solver_stats.append(agent.inference_engine.stats)
+        durations.sort()
+        print(f"{mode:>6} {victories / args.episodios:>9.2%} {deaths:>7} {statistics.fmean(safe_counts):>14.2f} "
+              f"{statistics.fmean(durations) * 1e6:>11.1f} {durations[int(0.95 * (len(durations) - 1))] * 1e6:>9.1f} "
+              f"{durations[-1] * 1e6:>9.1f}")
+        if solver_stats:
+            totals = {key: sum(s[key] for s in solver_stats) for key in ("solves", "conflicts", "decisions", "learnts")}
+            steps = sum(s["steps"] for s in solver_stats)
+            print(f"{'':>6} resolvedor: {totals['solves'] / steps:.1f} chamadas/passo, "
+                  f"{totals['decisions'] / steps:.1f} decisões/passo, {totals['conflicts']} conflitos, "
+                  f"{totals['learnts']} cláusulas aprendidas")
+
+
+if __name__ == "__main__":
+    main()
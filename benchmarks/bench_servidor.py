@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Teste de carga do servidor de sessões (servidor.py).
+
+Sobe um servidor local em outro processo (ou usa um já rodando, com
+--endereco ou --unix) e, com várias conexões simultâneas (divididas entre
+--processos processos clientes, para o cliente não ser o gargalo):
+1. cria --sessoes sessões, todas vivas ao mesmo tempo;
+2. joga --rodadas rodadas de "step" em todas elas (cada conexão espera a
+   resposta antes do próximo pedido);
+3. consulta o estado completo ("state" com as células) e encerra cada sessão.
+Mostra pedidos por segundo e a latência (p50, p99, máximo) de cada operação,
+medida no cliente, o tempo de CPU do servidor por pedido (a capacidade do
+servidor, mesmo com cliente e servidor dividindo os mesmos núcleos) e as
+estatísticas do servidor no fim.
+
+Durante as fases, outro processo joga uma sessão longa (--grade-longa,
+--jogadas-longas) e alterna "back" e "step" de --volta jogadas nela: os
+pedidos pequenos das outras conexões não podem ficar esperando por eles
+(compare o máximo de "step" com e sem a sessão longa, --grade-longa 0).
+
+Uso:
+    python -m benchmarks.bench_servidor
+    python -m benchmarks.bench_servidor --sessoes 10000 --conexoes 200 --rodadas 5 --processos 4
+    python -m benchmarks.bench_servidor --endereco 127.0.0.1:8765
+    python -m benchmarks.bench_servidor --grade-longa 256 --jogadas-longas 10000 --volta 1000
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import subprocess
+import sys
+import time
+
+from instrumentacao import LatencyHistogram
+
+
+class Client:
+    """Uma conexão com o servidor: um pedido por vez."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, address):
+        if isinstance(address, str):
+            return cls(*await asyncio.open_unix_connection(address))
+        return cls(*await asyncio.open_connection(*address))
+
+    async def request(self, **request):
+        self.writer.write((json.dumps(request, separators=(",", ":")) + "\n").encode())
+        response = json.loads(await self.reader.readline())
+        if not response["ok"]:
+            raise RuntimeError(f"{request['op']}: {response['error']}")
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def timed(histogram, client, **request):
+    start = time.perf_counter()
+    response = await client.request(**request)
+    histogram.add(time.perf_counter() - start)
+    return response
+
+
+def start_server(args):
+    """Sobe python -m servidor em uma porta livre. Devolve (processo, endereço)."""
+    command = [sys.executable, "-m", "servidor", "--porta", "0", "--max-sessoes", str(args.sessoes + 1)]  # + a longa
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Escutando em "):
+        process.kill()
+        raise RuntimeError(f"o servidor não subiu: {line!r}")
+    host, port = line.split()[-1].rsplit(":", 1)
+    return process, (host, int(port))
+
+
+# Fases do teste e as operações medidas em cada uma
+PHASES = (("create", ["create"]), ("step", ["step"]), ("finish", ["state", "close"]))
+
+
+async def run_clients(args, address, seeds, num_connections, barrier=None):
+    """Joga as fases com num_connections conexões e as sementes dadas.
+
+    Devolve ({operação: LatencyHistogram}, {fase: segundos}).
+    """
+    clients = [await Client.connect(address) for _ in range(num_connections)]
+    latencies = {op: LatencyHistogram() for _, ops in PHASES for op in ops}
+    elapsed = {}
+    options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus,
+               "probabilistic": True}
+    shares = [seeds[i::num_connections] for i in range(num_connections)]
+    sessions = [[] for _ in clients]
+
+    async def create(k):
+        for seed in shares[k]:
+            response = await timed(latencies["create"], clients[k], op="create", seed=seed, **options)
+            sessions[k].append(response["session"])
+
+    async def play(k):
+        for _ in range(args.rodadas):
+            for session in sessions[k]:
+                await timed(latencies["step"], clients[k], op="step", session=session, count=args.passos)
+
+    async def finish(k):
+        for session in sessions[k]:
+            await timed(latencies["state"], clients[k], op="state", session=session, cells=True)
+            await timed(latencies["close"], clients[k], op="close", session=session)
+
+    functions = {"create": create, "step": play, "finish": finish}
+    for phase, _ in PHASES:
+        if barrier is not None:
+            await asyncio.get_running_loop().run_in_executor(None, barrier.wait)  # Fases juntas em todos os processos
+        start = time.perf_counter()
+        await asyncio.gather(*(functions[phase](k) for k in range(len(clients))))
+        elapsed[phase] = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return latencies, elapsed
+
+
+def client_process(args, address, seeds, num_connections, barrier):
+    return asyncio.run(run_clients(args, address, seeds, num_connections, barrier))
+
+
+async def drive_long_session(args, address, ready, stop):
+    """Joga a sessão longa até --jogadas-longas e alterna "back" e "step" de --volta jogadas até stop.
+
+    Devolve (jogadas da sessão, LatencyHistogram dos "back").
+    """
+    client = await Client.connect(address)
+    n = args.grade_longa
+    response = await client.request(op="create", seed=args.semente, grid_size=n,
+                                    num_holes=max(2, round(args.buracos / args.grade ** 2 * n * n)),
+                                    num_wumpus=args.wumpus, probabilistic=True)
+    session, state = response["session"], response["state"]
+    while state["steps"] < args.jogadas_longas and not (state["game_over"] or state["victory"]):
+        count = min(1000, args.jogadas_longas - state["steps"])
+        state = (await client.request(op="step", session=session, count=count))["state"]
+    ready.set()
+    backs = LatencyHistogram()
+    while not stop.is_set():
+        await timed(backs, client, op="back", session=session, count=args.volta)
+        await client.request(op="step", session=session, count=args.volta)
+    await client.close()
+    return state["steps"], backs
+
+
+def long_session_process(args, address, ready, stop, results):
+    results.put(asyncio.run(drive_long_session(args, address, ready, stop)))
+
+
+async def server_stats(address):
+    client = await Client.connect(address)
+    try:
+        return (await client.request(op="stats"))["stats"]
+    finally:
+        await client.close()
+
+
+def run(args, address):
+    seeds = list(range(args.semente, args.semente + args.sessoes))
+    long_session = None
+    if args.grade_longa:
+        ready, stop, long_results = multiprocessing.Event(), multiprocessing.Event(), multiprocessing.Queue()
+        long_session = multiprocessing.Process(target=long_session_process,
+                                               args=(args, address, ready, stop, long_results))
+        long_session.start()
+        ready.wait()
+    before = asyncio.run(server_stats(address))
+    workers = max(1, min(args.processos, args.conexoes))
+    if workers == 1:
+        results = [asyncio.run(run_clients(args, address, seeds, args.conexoes))]
+    else:
+        with multiprocessing.Manager() as manager, \
+                concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            barrier = manager.Barrier(workers)
+            futures = [pool.submit(client_process, args, address, seeds[w::workers],
+                                   len(range(w, args.conexoes, workers)), barrier) for w in range(workers)]
+            results = [future.result() for future in futures]
+
+    print(f"{'operação':>8} {'pedidos':>8} {'pedidos/s':>10} {'p50 (µs)':>9} {'p99 (µs)':>9} {'máx (µs)':>10}")
+    for phase, ops in PHASES:
+        elapsed = max(times[phase] for _, times in results)
+        for op in ops:
+            histogram = LatencyHistogram()
+            for latencies, _ in results:
+                histogram.merge(latencies[op])
+            print(f"{op:>8} {histogram.count:>8} {histogram.count / elapsed:>10.0f} "
+                  f"{histogram.percentile(50) * 1e6:>9.1f} {histogram.percentile(99) * 1e6:>9.1f} "
+                  f"{histogram.max * 1e6:>10.1f}")
+    if long_session is not None:
+        stop.set()
+        steps, backs = long_results.get()
+        long_session.join()
+        print(f"Sessão longa {args.grade_longa}x{args.grade_longa} com {steps} jogadas: {backs.count} "
+              f'"back" de {args.volta} durante as fases, p50 {backs.percentile(50) * 1e3:.1f} ms, '
+              f"máx. {backs.max * 1e3:.1f} ms")
+    after = asyncio.run(server_stats(address))
+    requests = after["requests"] - before["requests"]
+    cpu = after["cpu_seconds"] - before["cpu_seconds"]
+    print(f"CPU do servidor: {cpu / requests * 1e6:.1f} µs por pedido ({requests / cpu:.0f} pedidos/s por núcleo)")
+    print(f"Servidor: {after}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de sessões.")
+    parser.add_argument("--endereco", metavar="HOST:PORTA", help="servidor já rodando (padrão: sobe um)")
+    parser.add_argument("--unix", metavar="CAMINHO", help="servidor já rodando em um socket Unix")
+    parser.add_argument("--sessoes", type=int, default=2000, help="sessões simultâneas")
+    parser.add_argument("--conexoes", type=int, default=100, help="conexões simultâneas")
+    parser.add_argument("--processos", type=int, default=1, help="processos clientes")
+    parser.add_argument("--rodadas", type=int, default=10, help="pedidos step por sessão")
+    parser.add_argument("--passos", type=int, default=1, help="jogadas por pedido step")
+    parser.add_argument("--grade", type=int, default=8, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=6, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--grade-longa", type=int, default=128,
+                        help="grade da sessão longa jogada durante o teste (0 = sem sessão longa)")
+    parser.add_argument("--jogadas-longas", type=int, default=2500, help="jogadas da sessão longa")
+    parser.add_argument("--volta", type=int, default=50, help='jogadas de cada "back"/"step" na sessão longa')
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.unix:
+        address = args.unix
+    elif args.endereco:
+        host, port = args.endereco.rsplit(":", 1)
+        address = (host, int(port))
+    else:
+        process, address = start_server(args)
+    print(f"{args.sessoes} sessões em {args.conexoes} conexões ({args.processos} processos clientes), "
+          f"grade {args.grade}x{args.grade}")
+    try:
+        run(args, address)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos retratos do agente (snapshot/restore/fork) contra copy.deepcopy.
+
+Para cada configuração, joga algumas jogadas (parando antes do fim do
+episódio) e mede, a partir desse estado:
+- copy.deepcopy do mundo (o jeito antigo de ramificar uma busca);
+- snapshot() e restore() (sem cópia nenhuma);
+- fork() (um mundo novo independente);
+- uma simulação curta: restaurar o retrato e jogar uma jogada, que paga a
+  cópia na escrita, comparada com deepcopy seguido da mesma jogada.
+
+Uso:
+    python -m benchmarks.bench_snapshot
+    python -m benchmarks.bench_snapshot --jogadas 50 --repeticoes 2000
+"""
+
+import argparse
+import copy
+import time
+
+from agente import new_agent
+
+CONFIGS = [
+    ("4x4", {}),
+    ("4x4 sat", {"inference": "sat"}),
+    ("16x16", {"grid_size": 16, "num_holes": 20, "probabilistic": True}),
+    ("64x64", {"grid_size": 64, "num_holes": 200, "probabilistic": True}),
+]
+
+
+def mean_us(action, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        action()
+    return (time.perf_counter() - start) / repetitions * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara snapshot/restore/fork com copy.deepcopy.")
+    parser.add_argument("--jogadas", type=int, default=20, help="jogadas antes do retrato")
+    parser.add_argument("--repeticoes", type=int, default=500)
+    parser.add_argument("--semente", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'mundo':>9} {'deepcopy':>10} {'snapshot':>9} {'restore':>8} {'fork':>7} "
+          f"{'deepcopy+step':>14} {'restore+step':>13}   (µs)")
+    for label, options in CONFIGS:
+        agent = new_agent(verbose=False, seed=args.semente, **options)
+        for _ in range(args.jogadas):
+            probe = agent.fork()
+            probe.step()
+            if probe.game_over or probe.victory:
+                break  # Para antes do fim: a jogada medida precisa fazer alguma coisa
+            agent.step()
+        snapshot = agent.snapshot()
+        repetitions = args.repeticoes
+
+        deep = mean_us(lambda: copy.deepcopy(agent), max(1, repetitions // 10))
+        snap = mean_us(agent.snapshot, repetitions)
+        restore = mean_us(lambda: agent.restore(snapshot), repetitions)
+        fork = mean_us(agent.fork, repetitions)
+
+        def deepcopy_step():
+            copy.deepcopy(agent).step()
+
+        def restore_step():
+            agent.restore(snapshot)
+            agent.step()
+
+        deep_step = mean_us(deepcopy_step, max(1, repetitions // 10))
+        restore_step_us = mean_us(restore_step, repetitions)
+        print(f"{label:>9} {deep:>10.1f} {snap:>9.2f} {restore:>8.2f} {fork:>7.2f} "
+              f"{deep_step:>14.1f} {restore_step_us:>13.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do cache de mapas por semente (solucoes.py).
+
+Para cada configuração, grava uma tabela temporária e compara:
+- criar o mundo gerando o mapa (WumpusWorld(seed=...)) e lendo do cache
+  (SolutionTable.world), em µs por mundo;
+- o oráculo do caminho ótimo calculado na hora (a busca de
+  _is_path_valid) e lido do cache;
+- uma avaliação completa (simulacao.run_seed_range) com e sem o cache.
+
+Uso:
+    python -m benchmarks.bench_solucoes
+    python -m benchmarks.bench_solucoes --sementes 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from mundo import WumpusWorld
+from simulacao import run_seed_range
+from solucoes import SolutionTable, optimal_steps, table_path
+
+CONFIGS = [(4, 2, 1), (8, 6, 1), (16, 20, 1), (64, 300, 2)]
+
+
+def mean_us(action, seeds):
+    start = time.perf_counter()
+    for seed in seeds:
+        action(seed)
+    return (time.perf_counter() - start) / len(seeds) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara gerar os mapas com lê-los do cache de soluções.")
+    parser.add_argument("--sementes", type=int, default=2000, help="sementes por configuração")
+    parser.add_argument("--episodios", type=int, default=500, help="episódios da avaliação completa")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.sementes)
+    print(f"{'mundo':>12} {'bytes/reg.':>10} {'gerar (µs)':>11} {'cache (µs)':>11} {'oráculo (µs)':>13} "
+          f"{'cache (µs)':>11} {'avaliação (s)':>14} {'c/ cache (s)':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n, holes, wumpus in CONFIGS:
+            with SolutionTable(table_path(directory, n, holes, wumpus), n, holes, wumpus) as table:
+                table.fill(args.sementes)
+                options = {"grid_size": n, "num_holes": holes, "num_wumpus": wumpus}
+                generate = mean_us(lambda s: WumpusWorld(seed=s, **options), seeds)
+                cached = mean_us(table.world, seeds)
+                worlds = {s: WumpusWorld(seed=s, **options) for s in seeds[:200]}
+                oracle = mean_us(lambda s: optimal_steps(worlds[s]), list(worlds))
+                oracle_cached = mean_us(table.optimal_steps, seeds)
+
+                episodes = min(args.episodios, args.sementes)
+                options["probabilistic"] = True
+                start = time.perf_counter()
+                run_seed_range(0, episodes, world_options=options)
+                plain = time.perf_counter() - start
+                start = time.perf_counter()
+                run_seed_range(0, episodes, world_options=options, solutions=directory)
+                with_cache = time.perf_counter() - start
+                print(f"{f'{n}x{n}':>12} {table.record_size:>10} {generate:>11.1f} {cached:>11.1f} {oracle:>13.1f} "
+                      f"{oracle_cached:>11.2f} {plain:>14.2f} {with_cache:>13.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da câmera (interface.Renderer) em grades grandes.
+
+Usa o driver de vídeo "dummy" do SDL (não abre janela) e, em uma grade
+grande (512x512 por padrão) na janela normal do jogo, mede quadros por
+segundo:
+- no desenho antigo, que percorre todas as células a cada quadro e
+  procura cada uma nas listas de buracos (um quadro leva minutos na grade
+  padrão; --quadros-antigo 0 pula esse modo);
+- com a grade inteira na tela (um pixel por célula, ampliado);
+- com zoom, seguindo o agente (só as células alteradas, copiadas do atlas);
+- com zoom, movendo a câmera a cada quadro (a vista inteira, em lote).
+
+Uso:
+    python -m benchmarks.bench_viewport
+    python -m benchmarks.bench_viewport --grade 256 --quadros 300 --zoom 32
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import interface
+from agente import new_agent
+from benchmarks.bench_render import legacy_draw
+
+
+def fps(durations):
+    return len(durations) / sum(durations) if durations else float("nan")
+
+
+def frames(renderer, agent, count, before_frame):
+    """Tempos de draw() em count quadros; before_frame(renderer, agent) prepara cada um."""
+    durations = []
+    for _ in range(count):
+        if agent.game_over or agent.victory:
+            agent.reset()
+        before_frame(renderer, agent)
+        start = time.perf_counter()
+        renderer.draw(agent)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def follow(renderer, agent):
+    agent.step()
+    if not renderer.is_visible(agent.agent_pos, margin=2):
+        renderer.center_on(agent.agent_pos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede quadros por segundo da câmera em grades grandes.")
+    parser.add_argument("--grade", type=int, default=512, help="tamanho da grade (N x N)")
+    parser.add_argument("--densidade", type=float, default=0.05, help="fração das células com buraco")
+    parser.add_argument("--quadros", type=int, default=500, help="quadros por modo")
+    parser.add_argument("--quadros-antigo", type=int, default=1, help="quadros do desenho antigo")
+    parser.add_argument("--zoom", type=float, default=24, help="pixels por célula nos modos com zoom")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    interface.init_display()
+    pygame = interface.pygame
+    n = args.grade
+    agent = new_agent(verbose=False, seed=args.semente, grid_size=n,
+                      num_holes=int(n * n * args.densidade), probabilistic=True)
+    surface = pygame.Surface((interface.WIDTH, interface.HEIGHT))
+    renderer = interface.Renderer(surface)
+    print(f"Grade {n}x{n} em uma janela de {interface.WIDTH}x{interface.HEIGHT}")
+    print(f"{'modo':>28} {'quadros/s':>10} {'quadro médio (ms)':>18}")
+
+    def report(label, durations):
+        if not durations:
+            return
+        print(f"{label:>28} {fps(durations):>10.1f} {statistics.fmean(durations) * 1e3:>18.3f}", flush=True)
+
+    legacy = []
+    for _ in range(args.quadros_antigo):
+        agent.step()
+        start = time.perf_counter()
+        legacy_draw(surface, agent, max(1, round(interface.WIDTH / n)))
+        legacy.append(time.perf_counter() - start)
+    report("antigo (todas as células)", legacy)
+
+    renderer.fit(n)
+    report("grade inteira", frames(renderer, agent, args.quadros, lambda r, w: w.step()))
+
+    renderer.scale = float(args.zoom)
+    renderer.center_on(agent.agent_pos)
+    renderer.draw(agent)
+    report("zoom seguindo o agente", frames(renderer, agent, args.quadros, follow))
+
+    step = max(1, round(args.zoom / 2))
+    report("zoom movendo a câmera", frames(renderer, agent, args.quadros, lambda r, w: r.pan(step, step // 2)))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
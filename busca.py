@@ -0,0 +1,682 @@
+# -*- coding: utf-8 -*-
+"""
+Agente de planejamento por Monte Carlo com mundos sorteados.
+
+No modo probabilístico o agente, sem células seguras para explorar, arrisca
+a célula da fronteira com menor probabilidade de perigo. O planejador
+(MonteCarloPlanner, ligado com new_agent(planner=...)) decide essa aposta
+olhando mais longe:
+
+1. WorldSampler sorteia mapas escondidos compatíveis com a base de
+   conhecimento, todos igualmente prováveis (como os do gerador de mapas):
+   cada componente da fronteira tem suas atribuições enumeradas, os
+   componentes são combinados com as células restantes por análise
+   combinatória, e o ouro é sorteado por último (o mapa é descartado se o
+   ouro ficar inalcançável, como na geração).
+2. Para cada candidata (as células de menor risco), jogam-se simulações:
+   a partir de um retrato do agente (InferenceAgent.snapshot), troca-se o mapa
+   pelo sorteado, o agente entra na candidata e segue a política normal por
+   até rollout_steps jogadas. Vitória vale 1, morte 0, e um episódio
+   interrompido vale 1 com o ouro (a volta é segura) ou UNFINISHED_VALUE sem.
+3. As simulações são distribuídas entre as candidatas por UCB1 (uma árvore
+   de um nível), cada candidata usando os mesmos mapas na mesma ordem, e a
+   de maior média é escolhida.
+
+O orçamento de cada decisão é um tempo (time_budget, em segundos) e/ou um
+número de simulações (iterations). O prazo é conferido antes de cada
+simulação e de cada jogada dela (uma simulação que passaria do prazo é
+descartada e vale a melhor candidata até ali), e a distribuição dos mapas
+só é montada se o tempo que resta cobre o que ela levou da última vez.
+Assim a decisão termina no prazo, mais o tempo de uma jogada. Mapas sorteados que
+continuam compatíveis com as percepções novas são reaproveitados na decisão
+seguinte. Com workers > 1 as simulações são divididas entre processos, cada
+um com a sua própria árvore (paralelismo na raiz), e as contagens são somadas;
+os processos são criados no início do episódio, fora do tempo das decisões, e
+o retrato só é mandado a eles se o tempo que resta cobre o que serializá-lo
+levou da última vez.
+"""
+
+import collections
+import concurrent.futures
+import functools
+import math
+import os
+import pickle
+import random
+import time
+
+from grade import neighbor_ids
+
+# Componentes da fronteira até esse tamanho têm as atribuições enumeradas uma a uma
+MAX_EXPLICIT_CELLS = 14
+MAX_EXPLICIT_ASSIGNMENTS = 200000
+# Valor de uma simulação que terminou sem o ouro, sem vitória nem derrota
+UNFINISHED_VALUE = 0.5
+
+# Bits de HiddenMap.contents
+_HOLE, _WUMPUS, _GOLD = 1, 2, 4
+# Bits do mapa de percepções (os mesmos de mundo.WumpusWorld._percept_flags)
+_STENCH, _BREEZE, _GLITTER = 1, 2, 4
+
+# Um mapa escondido sorteado: listas de células, ouro, e um byte por célula de
+# conteúdo (bits _HOLE, _WUMPUS, _GOLD) e de percepções
+HiddenMap = collections.namedtuple("HiddenMap", ["wumpuses", "holes", "gold", "contents", "percepts"])
+
+
+class _TooMany(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=4096)
+def _component_assignments(signature, num_holes, num_wumpus):
+    """Atribuições de um componente, agrupadas por (buracos, wumpus).
+
+    signature = (domínios, restrições) no formato de probabilidade.py. Cada
+    atribuição é uma tupla com 0 (vazio), 1 (buraco) ou 2 (Wumpus) por célula.
+    Devolve None se houver mais de MAX_EXPLICIT_ASSIGNMENTS atribuições.
+    """
+    domains, constraints = signature
+    n = len(domains)
+    by_cell = [[] for _ in range(n)]
+    for ci, (_, cells) in enumerate(constraints):
+        for i in cells:
+            by_cell[i].append(ci)
+    remaining = [len(cells) for _, cells in constraints]
+    satisfied = [0] * len(constraints)
+    kinds = [kind for kind, _ in constraints]
+    values = [0] * n
+    table = collections.defaultdict(list)
+    found = 0
+
+    def assign(i, pits, wumpuses):
+        nonlocal found
+        if i == n:
+            found += 1
+            if found > MAX_EXPLICIT_ASSIGNMENTS:
+                raise _TooMany
+            table[(pits, wumpuses)].append(tuple(values))
+            return
+        can_pit, can_wumpus = domains[i]
+        options = [0]
+        if can_pit and pits < num_holes:
+            options.append(1)
+        if can_wumpus and wumpuses < num_wumpus:
+            options.append(2)
+        for value in options:
+            ok = True
+            for ci in by_cell[i]:
+                remaining[ci] -= 1
+                if value and kinds[ci] == value - 1:
+                    satisfied[ci] += 1
+                if remaining[ci] == 0 and satisfied[ci] == 0:
+                    ok = False
+            if ok:
+                values[i] = value
+                assign(i + 1, pits + (value == 1), wumpuses + (value == 2))
+                values[i] = 0
+            for ci in by_cell[i]:
+                remaining[ci] += 1
+                if value and kinds[ci] == value - 1:
+                    satisfied[ci] -= 1
+
+    try:
+        assign(0, 0, 0)
+    except _TooMany:
+        return None
+    return dict(table)
+
+
+def _random_assignment(domains, constraints, num_holes, num_wumpus, rng):
+    """Uma atribuição qualquer que satisfaz o componente (busca em profundidade em ordem aleatória).
+
+    Usada só em componentes grandes demais para enumerar; não é uniforme.
+    """
+    n = len(domains)
+    by_cell = [[] for _ in range(n)]
+    for ci, (_, cells) in enumerate(constraints):
+        for i in cells:
+            by_cell[i].append(ci)
+    remaining = [len(cells) for _, cells in constraints]
+    satisfied = [0] * len(constraints)
+    kinds = [kind for kind, _ in constraints]
+    values = [0] * n
+
+    def assign(i, pits, wumpuses):
+        if i == n:
+            return True
+        can_pit, can_wumpus = domains[i]
+        options = [0]
+        if can_pit and pits < num_holes:
+            options.append(1)
+        if can_wumpus and wumpuses < num_wumpus:
+            options.append(2)
+        rng.shuffle(options)
+        for value in options:
+            ok = True
+            for ci in by_cell[i]:
+                remaining[ci] -= 1
+                if value and kinds[ci] == value - 1:
+                    satisfied[ci] += 1
+                if remaining[ci] == 0 and satisfied[ci] == 0:
+                    ok = False
+            if ok:
+                values[i] = value
+                if assign(i + 1, pits + (value == 1), wumpuses + (value == 2)):
+                    return True
+                values[i] = 0
+            for ci in by_cell[i]:
+                remaining[ci] += 1
+                if value and kinds[ci] == value - 1:
+                    satisfied[ci] -= 1
+        return False
+
+    return tuple(values) if assign(0, 0, 0) else None
+
+
+def _add_counts(a, b):
+    """Convolução de duas tabelas {(buracos, wumpus): quantidade} (contagens exatas)."""
+    result = collections.Counter()
+    for (p1, w1), x in a.items():
+        for (p2, w2), y in b.items():
+            result[(p1 + p2, w1 + w2)] += x * y
+    return result
+
+
+class WorldSampler:
+    """Sorteia mapas escondidos compatíveis com o que o agente sabe.
+
+    Usa só as regras públicas do jogo (quantidades de perigos, área inicial
+    livre, ouro alcançável) e a base de conhecimento (as mesmas informações de
+    probabilidade.py).
+    """
+
+    def __init__(self, grid_size, num_holes, num_wumpus, start_pos, get_adjacent):
+        self.grid_size = grid_size
+        self.num_holes = num_holes
+        self.num_wumpus = num_wumpus
+        self.start_pos = start_pos
+        self.get_adjacent = get_adjacent
+        self._neighbor_ids = neighbor_ids(grid_size)
+        self._forbidden = {start_pos} | set(get_adjacent(*start_pos))
+
+    def posterior(self, agent):
+        """Distribuição dos mapas compatíveis com o estado atual do agente (ver _Posterior)."""
+        return _Posterior(self, agent)
+
+    def consistent(self, hidden, knowledge_base):
+        """Indica se o mapa sorteado explica todas as percepções da base de conhecimento."""
+        n = self.grid_size
+        contents, percepts = hidden.contents, hidden.percepts
+        for (x, y), (fedor, vento, brilho) in knowledge_base.items():
+            i = x * n + y
+            if contents[i] & (_HOLE | _WUMPUS):
+                return False
+            bits = percepts[i]
+            if bool(bits & _STENCH) != fedor or bool(bits & _BREEZE) != vento or bool(bits & _GLITTER) != brilho:
+                return False
+        return True
+
+    def _reachable(self, contents, target):
+        """Indica se target é alcançável a partir do início sem passar por perigos."""
+        n = self.grid_size
+        adjacency = self._neighbor_ids
+        seen = bytearray(n * n)
+        first = self.start_pos[0] * n + self.start_pos[1]
+        goal = target[0] * n + target[1]
+        seen[first] = 1
+        queue = [first]
+        for i in queue:
+            if i == goal:
+                return True
+            for j in adjacency[i]:
+                if not seen[j] and not contents[j] & (_HOLE | _WUMPUS):
+                    seen[j] = 1
+                    queue.append(j)
+        return False
+
+    def make_map(self, wumpuses, holes, gold):
+        """HiddenMap com os bytes de conteúdo e de percepções calculados."""
+        n = self.grid_size
+        contents = bytearray(n * n)
+        percepts = bytearray(n * n)
+        for bit, percept, cells in ((_WUMPUS, _STENCH, wumpuses), (_HOLE, _BREEZE, holes)):
+            for x, y in cells:
+                i = x * n + y
+                contents[i] |= bit
+                for j in self._neighbor_ids[i]:
+                    percepts[j] |= percept
+        gold_id = gold[0] * n + gold[1]
+        contents[gold_id] |= _GOLD
+        percepts[gold_id] |= _GLITTER
+        return HiddenMap(wumpuses, holes, gold, bytes(contents), percepts)
+
+
+class _Posterior:
+    """Mapas compatíveis com um estado do agente, todos igualmente prováveis; draw() sorteia um."""
+
+    def __init__(self, sampler, agent):
+        self.sampler = sampler
+        n = sampler.grid_size
+        kb = agent.knowledge_base
+        forbidden = sampler._forbidden
+
+        # Só o que as percepções garantem: as marcas de célula segura das regras
+        # escritas à mão podem errar, e condicionar nelas tornaria o sorteio inconsistente
+        def hazard_free(cell):
+            return cell in forbidden or cell in kb
+
+        # Domínios da fronteira (pode ter buraco, pode ter Wumpus) e percepções que a restringem
+        domains = {}
+        for cell, (fedor, vento, _) in kb.items():
+            for neighbor in sampler.get_adjacent(cell[0], cell[1]):
+                if neighbor in kb:
+                    continue
+                domain = domains.setdefault(neighbor, [not hazard_free(neighbor)] * 2)
+                domain[0] = domain[0] and vento
+                domain[1] = domain[1] and fedor
+        constraints = []
+        for cell, (fedor, vento, _) in kb.items():
+            for kind, sensed in ((0, vento), (1, fedor)):
+                if sensed:
+                    constraints.append((kind, tuple(c for c in sampler.get_adjacent(cell[0], cell[1])
+                                                    if c in domains and domains[c][kind])))
+        self.consistent = all(cells for _, cells in constraints)
+
+        # Componentes: células ligadas por uma mesma percepção
+        parent = {c: c for c, d in domains.items() if d[0] or d[1]}
+
+        def find(c):
+            while parent[c] != c:
+                parent[c] = parent[parent[c]]
+                c = parent[c]
+            return c
+
+        for _, cells in constraints:
+            for c in cells[1:]:
+                parent[find(c)] = find(cells[0])
+        groups = collections.defaultdict(list)
+        for c in parent:
+            groups[find(c)].append(c)
+        by_root = collections.defaultdict(set)
+        for kind, cells in constraints:
+            if cells:
+                by_root[find(cells[0])].add((kind, cells))
+
+        self.rest = [divmod(i, n) for i in range(n * n)
+                     if divmod(i, n) not in domains and not hazard_free(divmod(i, n))]
+        self.exact, self.approximate = [], []
+        for root, cells in groups.items():
+            cells.sort()
+            index = {c: i for i, c in enumerate(cells)}
+            signature = (tuple(tuple(domains[c]) for c in cells),
+                         tuple(sorted((kind, tuple(sorted(index[c] for c in cs))) for kind, cs in by_root[root])))
+            table = None
+            if len(cells) <= MAX_EXPLICIT_CELLS:
+                table = _component_assignments(signature, sampler.num_holes, sampler.num_wumpus)
+            if table is None:
+                self.approximate.append((cells, signature))
+            elif not table:
+                self.consistent = False
+            else:
+                self.exact.append((cells, table))
+
+        # Contagens acumuladas dos componentes seguintes, para sortear um componente de cada vez
+        self._suffix = [collections.Counter({(0, 0): 1})]
+        for _, table in reversed(self.exact):
+            self._suffix.append(_add_counts(self._suffix[-1], {k: len(v) for k, v in table.items()}))
+        self._suffix.reverse()
+
+        self.known_gold = next((c for c, (_, _, brilho) in kb.items() if brilho), None)
+        self.gold_cells = [divmod(i, n) for i in range(n * n)
+                           if divmod(i, n) not in forbidden and divmod(i, n) not in kb]
+
+    def _rest_weight(self, pits, wumpuses):
+        """Maneiras de pôr os perigos que faltam nas células restantes."""
+        holes_left = self.sampler.num_holes - pits
+        wumpus_left = self.sampler.num_wumpus - wumpuses
+        r = len(self.rest)
+        if holes_left < 0 or wumpus_left < 0 or holes_left + wumpus_left > r:
+            return 0
+        return math.comb(r, holes_left) * math.comb(r - holes_left, wumpus_left)
+
+    def draw(self, rng, attempts=100):
+        """Sorteia um mapa (HiddenMap), ou devolve None se não encontrar um em attempts tentativas."""
+        if not self.consistent:
+            return None
+        sampler = self.sampler
+        for _ in range(attempts):
+            holes, wumpuses = [], []
+            pits = wumps = 0
+            failed = False
+            for cells, signature in self.approximate:
+                values = _random_assignment(*signature, sampler.num_holes - pits, sampler.num_wumpus - wumps, rng)
+                if values is None:
+                    failed = True
+                    break
+                for c, v in zip(cells, values):
+                    if v == 1: holes.append(c)
+                    elif v == 2: wumpuses.append(c)
+                pits, wumps = len(holes), len(wumpuses)
+            if failed:
+                continue
+
+            for k, (cells, table) in enumerate(self.exact):
+                suffix = self._suffix[k + 1]
+                keys, weights = [], []
+                for (p, w), options in table.items():
+                    weight = len(options) * sum(count * self._rest_weight(pits + p + p2, wumps + w + w2)
+                                                for (p2, w2), count in suffix.items())
+                    if weight:
+                        keys.append((p, w))
+                        weights.append(weight)
+                if not keys:
+                    failed = True
+                    break
+                key = _choose_weighted(keys, weights, rng)
+                values = rng.choice(table[key])
+                for c, v in zip(cells, values):
+                    if v == 1: holes.append(c)
+                    elif v == 2: wumpuses.append(c)
+                pits, wumps = pits + key[0], wumps + key[1]
+            if failed:
+                continue
+
+            holes_left = sampler.num_holes - pits
+            wumpus_left = sampler.num_wumpus - wumps
+            if holes_left < 0 or wumpus_left < 0 or holes_left + wumpus_left > len(self.rest):
+                continue
+            extra = rng.sample(self.rest, holes_left + wumpus_left)
+            holes += extra[:holes_left]
+            wumpuses += extra[holes_left:]
+
+            if self.known_gold is not None:
+                gold = self.known_gold
+            else:
+                hazards = set(holes) | set(wumpuses)
+                choices = [c for c in self.gold_cells if c not in hazards]
+                if not choices:
+                    continue
+                gold = rng.choice(choices)
+            hidden = sampler.make_map(wumpuses, holes, gold)
+            if sampler._reachable(hidden.contents, gold):
+                return hidden
+        return None
+
+
+def _choose_weighted(keys, weights, rng):
+    """Escolhe uma chave com probabilidade proporcional ao peso (inteiros de qualquer tamanho)."""
+    total = sum(weights)
+    pick = rng.randrange(total)
+    for key, weight in zip(keys, weights):
+        if pick < weight:
+            return key
+        pick -= weight
+    return keys[-1]
+
+
+def _progress(agent):
+    return agent.agent_pos, len(agent.visited), len(agent.safe), len(agent.danger)
+
+
+def _rollout(scratch, root, hidden, target, max_steps, deadline, rng):
+    """Valor de uma simulação: entrar em target no mapa hidden e seguir a política normal.
+
+    Devolve None se o prazo (time.monotonic) acabar antes do fim da simulação.
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        return None
+    scratch.restore(root)
+    scratch.rng, scratch._rng_shared = rng, False
+    scratch.replace_map(hidden.wumpuses, hidden.holes, hidden.gold, hidden.percepts)
+    n = scratch.GRID_SIZE
+    if hidden.contents[target[0] * n + target[1]] & (_HOLE | _WUMPUS):
+        return 0.0
+    scratch.agent_pos = target
+    for _ in range(max_steps):
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        previous = _progress(scratch)
+        scratch.step()
+        if scratch.victory:
+            return 1.0
+        if scratch.game_over:
+            return 0.0
+        if _progress(scratch) == previous:
+            break
+    return 1.0 if scratch.has_gold else UNFINISHED_VALUE
+
+
+def _search(scratch, root, targets, samples, more_samples, max_rollouts, deadline, rollout_steps, exploration,
+            rng, offset=0):
+    """UCB1 sobre as candidatas. Devolve (visitas, soma dos valores) por candidata.
+
+    A k-ésima simulação de cada candidata usa o mapa samples[(offset + k) % len]
+    (more_samples(), se dado, acrescenta mapas à lista antes de repetir algum).
+    """
+    visits = [0] * len(targets)
+    totals = [0.0] * len(targets)
+    done = 0
+    while max_rollouts is None or done < max_rollouts:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if done < len(targets):
+            j = done
+        else:
+            log_done = math.log(done)
+            j = max(range(len(targets)),
+                    key=lambda t: totals[t] / visits[t] + exploration * math.sqrt(log_done / visits[t]))
+        k = offset + visits[j]
+        if k >= len(samples) and more_samples is not None:
+            more_samples()
+        value = _rollout(scratch, root, samples[k % len(samples)], targets[j], rollout_steps, deadline, rng)
+        if value is None:
+            break
+        visits[j] += 1
+        totals[j] += value
+        done += 1
+    return visits, totals
+
+
+def _search_worker(payload, deadline, max_rollouts, seed, offset):
+    """Tarefa de um processo do grupo: uma busca independente sobre o mesmo retrato."""
+    agent, targets, samples, rollout_steps, exploration = pickle.loads(payload)
+    root = agent.snapshot()
+    scratch = agent.fork()
+    return _search(scratch, root, targets, samples, None, max_rollouts, deadline, rollout_steps, exploration,
+                   random.Random(seed), offset)
+
+
+class MonteCarloPlanner:
+    """Escolhe as apostas do modo probabilístico simulando mapas sorteados.
+
+    time_budget: segundos por decisão (None = sem limite de tempo);
+    iterations: simulações por decisão (None = até acabar o tempo);
+    rollout_steps: jogadas por simulação; candidates: quantas células de
+    menor risco disputam a aposta; samples: mapas sorteados por decisão;
+    workers: processos que dividem as simulações (1 = no próprio processo).
+    """
+
+    def __init__(self, time_budget=0.05, iterations=None, rollout_steps=200, candidates=6, samples=64,
+                 workers=1, exploration=1.0, seed=None):
+        if time_budget is None and iterations is None:
+            raise ValueError("defina time_budget, iterations ou os dois")
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.rollout_steps = rollout_steps
+        self.candidates = candidates
+        self.samples = samples
+        self.workers = workers
+        self.exploration = exploration
+        self.seed = seed
+        self.rng = random.Random(seed)  # Trocado a cada episódio (ver _start_episode)
+        self.stats = {"decisions": 0, "rollouts": 0, "time": 0.0, "max_time": 0.0, "samples_reused": 0}
+        self._pool = None
+        self._episode = None
+        self._pool_samples = []   # Mapas sorteados ainda compatíveis com o episódio atual
+        self._checked = 0         # Entradas da base de conhecimento já conferidas nesses mapas
+        self._plan = None         # (entradas na base, alvo) da última aposta escolhida
+        self._posterior_time = 0.0  # Quanto levou a última WorldSampler.posterior (ver _best_target)
+        self._payload_time = 0.0    # Quanto levou serializar o último retrato para os processos (ver _search_pool)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def close(self):
+        """Encerra o grupo de processos (se houver)."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _start_pool(self):
+        """Cria o grupo de processos (com workers > 1) e espera todos estarem prontos."""
+        if self.workers > 1 and self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            concurrent.futures.wait([self._pool.submit(os.getpid) for _ in range(self.workers)])
+
+    def _start_episode(self, agent):
+        """Esquece o episódio anterior e sorteia um gerador só deste episódio.
+
+        O gerador sai da semente do planejador e do estado do gerador das
+        jogadas do agente: as decisões de um episódio não dependem dos
+        episódios jogados antes pelo mesmo planejador (nem de como as
+        sementes foram divididas entre os processos, ver simulacao.py).
+        Chamado por choose() antes de começar a contar o tempo da decisão,
+        junto com a criação dos processos.
+        """
+        self._episode = agent.world.wumpuses  # O mapa é usado só como identificador do episódio
+        self._pool_samples = []
+        self._checked = 0
+        self._plan = None
+        play = random.Random()
+        play.setstate(agent._play_rng_state)
+        self.rng = random.Random(f"{self.seed}:{play.getrandbits(64)}")
+        self._start_pool()
+
+    def _samples_for(self, agent, sampler):
+        """Mapas sorteados compatíveis com a base atual, reaproveitando os da decisão anterior."""
+        kb = agent.knowledge_base
+        if len(kb) < self._checked:  # back(): começa de novo
+            self._pool_samples = []
+            self._checked = 0
+        if self._checked < len(kb):
+            new = dict(list(kb.items())[self._checked:])
+            kept = [s for s in self._pool_samples if sampler.consistent(s, new)]
+            self.stats["samples_reused"] += len(kept)
+            self._pool_samples = kept
+            self._checked = len(kb)
+        return self._pool_samples
+
+    def choose(self, agent):
+        """Próxima posição do agente rumo à aposta escolhida (None se não houver aposta possível)."""
+        if self._episode is not agent.world.wumpuses:
+            self._start_episode(agent)
+        start = time.monotonic()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+        try:
+            return self._choose(agent, deadline)
+        finally:
+            elapsed = time.monotonic() - start
+            self.stats["decisions"] += 1
+            self.stats["time"] += elapsed
+            self.stats["max_time"] = max(self.stats["max_time"], elapsed)
+
+    def _choose(self, agent, deadline):
+        kb = agent.knowledge_base
+        # Continua a caminhada até a aposta anterior enquanto nada novo foi percebido
+        if self._plan is not None and self._plan[0] == len(kb):
+            path = self._path(agent, self._plan[1])
+            if path:
+                return path[1]
+
+        options = agent.risky_targets()
+        reachable = {}
+        for cell, risk in sorted(options.items(), key=lambda item: (item[1], item[0])):
+            path = self._path(agent, cell)
+            if path:
+                reachable[cell] = path
+            if len(reachable) == self.candidates:
+                break
+        if not reachable:
+            return None
+        targets = list(reachable)
+        choice = targets[0]  # A de menor risco, se não houver tempo para simular
+        if len(targets) > 1:
+            choice = self._best_target(agent, targets, deadline)
+        self._plan = (len(kb), choice)
+        return reachable[choice][1]
+
+    def _path(self, agent, target):
+        path = agent._find_path_to_target(agent.agent_pos, None, agent._walkable, target_is_set=True,
+                                          target_set={target})
+        return path if path and len(path) >= 2 else None
+
+    def _best_target(self, agent, targets, deadline):
+        sampler = WorldSampler(agent.GRID_SIZE, agent.num_holes, agent.num_wumpus, agent.start_pos,
+                               agent.get_adjacent)
+        samples = self._samples_for(agent, sampler)
+        posterior = None
+
+        def more_samples():
+            nonlocal posterior
+            if posterior is None:
+                start = time.monotonic()
+                if deadline is not None and deadline - start < self._posterior_time:
+                    return False  # Não daria tempo de montar a distribuição
+                posterior = sampler.posterior(agent)
+                self._posterior_time = time.monotonic() - start
+            hidden = posterior.draw(self.rng)
+            if hidden is not None:
+                samples.append(hidden)
+            return hidden is not None
+
+        while len(samples) < self.samples:
+            if (deadline is not None and time.monotonic() >= deadline) or not more_samples():
+                break
+        if not samples:
+            return targets[0]
+
+        scratch = agent.fork()
+        scratch.planner = None
+        scratch.verbose = False
+        scratch.instrumentation = None  # As simulações não entram nos contadores do agente real
+        scratch._checkpoint_interval = 0  # Nem guardam retratos para back()
+        if self.workers > 1:
+            visits, totals = self._search_pool(scratch, targets, samples, deadline)
+        else:
+            visits, totals = _search(scratch, agent.snapshot(), targets, samples,
+                                     more_samples if len(samples) >= self.samples else None,
+                                     self.iterations, deadline, self.rollout_steps, self.exploration, self.rng)
+        self.stats["rollouts"] += sum(visits)
+        best = max(range(len(targets)), key=lambda j: (totals[j] / visits[j] if visits[j] else -1.0, -j))
+        return targets[best]
+
+    def _search_pool(self, scratch, targets, samples, deadline):
+        """Divide as simulações entre os processos e soma as contagens que chegarem até o prazo."""
+        self._start_pool()  # Só se foi fechado (close()) no meio do episódio
+        start = time.monotonic()
+        if deadline is not None and deadline - start < self._payload_time:
+            # Não daria tempo de mandar o retrato: simula aqui mesmo com o que resta
+            return _search(scratch, scratch.snapshot(), targets, samples, None, self.iterations, deadline,
+                           self.rollout_steps, self.exploration, self.rng)
+        payload = pickle.dumps((scratch, targets, samples, self.rollout_steps, self.exploration))
+        self._payload_time = time.monotonic() - start
+        per_worker = None
+        if self.iterations is not None:
+            per_worker = -(-self.iterations // self.workers)
+        step = max(1, len(samples) // self.workers)
+        futures = [self._pool.submit(_search_worker, payload, deadline, per_worker, self.rng.getrandbits(64), w * step)
+                   for w in range(self.workers)]
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, _ = concurrent.futures.wait(futures, timeout=timeout)
+        visits = [0] * len(targets)
+        totals = [0.0] * len(targets)
+        for future in done:
+            v, t = future.result()
+            for j in range(len(targets)):
+                visits[j] += v[j]
+                totals[j] += t[j]
+        for future in futures:
+            future.cancel()
+        return visits, totals
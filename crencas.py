@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Crenças do agente com sensores ruidosos: probabilidade de perigo por célula.
+
+As regras de _apply_rules, o motor SatInference e o risco exato de
+FrontierRisk supõem percepções sem erro. Com mundo.PerceptNoise, o fedor e
+o vento podem aparecer sem perigo por perto (falso positivo) ou sumir
+perto de um perigo (falso negativo), e essas deduções deixam de valer.
+HazardBelief (inference="belief") guarda, para cada célula, a
+probabilidade de ter um buraco e a de ter o Wumpus:
+
+- a priori, a densidade de perigos fora da área inicial (onde o gerador
+  nunca põe perigos), com as células independentes entre si;
+- cada célula visitada não tem perigo (o agente está vivo nela);
+- cada leitura em uma célula o é um fator sobre os vizinhos de o: a
+  probabilidade de ler vento, dado que um vizinho c tem (ou não) buraco,
+  usa as probabilidades atuais dos outros vizinhos de o (campo médio,
+  como uma propagação de crenças em que cada célula resume os vizinhos).
+
+A atualização é local: uma observação nova em o recalcula só os vizinhos
+de o e as células que dividem uma leitura com eles, e segue adiante apenas
+enquanto alguma probabilidade muda mais que tolerance. O custo por jogada
+não depende do tamanho da grade; recompute() refaz o tabuleiro inteiro
+(para comparação, ver benchmarks/bench_crencas.py).
+
+Sem ruído o modelo dá probabilidade 0 ou 1 onde as regras deduzem
+segurança ou perigo pelos vizinhos. As quantidades totais de perigos só
+entram pela densidade a priori, com uma exceção: quando há tantas células
+com buraco (ou Wumpus) acima de danger_threshold quanto buracos (ou
+Wumpus) no mapa, as demais passam a ter probabilidade 0 desse perigo. Esse
+passo percorre o tabuleiro, mas acontece no máximo uma vez por perigo em
+cada jogo.
+"""
+
+import collections
+import time
+
+from grade import neighbor_ids
+
+# Bits da leitura guardada por célula visitada
+_OBSERVED, _STENCH, _BREEZE = 1, 2, 4
+
+
+class HazardBelief:
+    """Probabilidades de buraco e de Wumpus por célula, atualizadas localmente a cada percepção.
+
+    Segue a interface dos outros motores: observe() devolve as células que
+    passaram a ser seguras (probabilidade de perigo até safe_threshold) e
+    perigosas (a partir de danger_threshold), e probabilities() dá o risco
+    da fronteira para o modo probabilístico.
+    """
+
+    def __init__(self, grid_size, num_holes, num_wumpus, get_adjacent, noise=None, safe_threshold=0.01,
+                 danger_threshold=0.99, tolerance=1e-6, max_updates=16):
+        n = grid_size
+        self.grid_size = grid_size
+        self.num_holes = num_holes
+        self.num_wumpus = num_wumpus
+        self.get_adjacent = get_adjacent
+        self.safe_threshold = safe_threshold
+        self.danger_threshold = danger_threshold
+        self.tolerance = tolerance
+        self.max_updates = max_updates  # Recálculos de uma célula por observação (o grafo tem ciclos)
+        # (falso positivo, falso negativo) de cada percepção
+        self.stench_noise = (noise.stench_fp, noise.stench_fn) if noise is not None else (0.0, 0.0)
+        self.breeze_noise = (noise.breeze_fp, noise.breeze_fn) if noise is not None else (0.0, 0.0)
+        self._neighbors = neighbor_ids(n)
+
+        # Área inicial (início e vizinhos): o gerador nunca põe perigos nela
+        start = n - 1
+        self._fixed = bytearray(n * n)  # Células com probabilidade já conhecida (0): área inicial e visitadas
+        for i in (start, *self._neighbors[start]):
+            self._fixed[i] = 1
+        free = n * n - sum(self._fixed)
+        self.prior_pit = min(1.0, num_holes / free) if free else 0.0
+        self.prior_wumpus = min(1.0, num_wumpus / free) if free else 0.0
+        self.pit = [0.0 if f else self.prior_pit for f in self._fixed]
+        self.wumpus = [0.0 if f else self.prior_wumpus for f in self._fixed]
+        self._readings = bytearray(n * n)  # Bits _OBSERVED/_STENCH/_BREEZE das células visitadas
+        self.frontier = set()              # Não visitadas vizinhas de visitadas (identificadores)
+        self.safe = set()
+        self.danger = set()
+        self._located = ([], [])           # Buracos e Wumpus localizados (identificadores), por perigo
+        self.stats = {"observations": 0, "updates": 0, "time": 0.0, "max_time": 0.0}
+
+    def __deepcopy__(self, memo):
+        # Retratos do agente (ver InferenceAgent._own_state): copia só o estado, não a vizinhança
+        clone = object.__new__(HazardBelief)
+        clone.__dict__.update(self.__dict__)
+        clone._fixed = bytearray(self._fixed)
+        clone.pit = list(self.pit)
+        clone.wumpus = list(self.wumpus)
+        clone._readings = bytearray(self._readings)
+        clone.frontier = set(self.frontier)
+        clone.safe = set(self.safe)
+        clone.danger = set(self.danger)
+        clone._located = (list(self._located[0]), list(self._located[1]))
+        clone.stats = dict(self.stats)
+        return clone
+
+    def hazard(self, cell):
+        """Probabilidade de a célula ter um buraco ou o Wumpus."""
+        i = cell[0] * self.grid_size + cell[1]
+        return 1.0 - (1.0 - self.pit[i]) * (1.0 - self.wumpus[i])
+
+    def _update_cell(self, c):
+        """Recalcula as probabilidades da célula c a partir das leituras vizinhas. Devolve a maior mudança."""
+        pit, wumpus, readings, neighbors = self.pit, self.wumpus, self._readings, self._neighbors
+        stench_fp, stench_fn = self.stench_noise
+        breeze_fp, breeze_fn = self.breeze_noise
+        # Verossimilhança das leituras com e sem perigo em c
+        pit_yes = pit_no = wumpus_yes = wumpus_no = 1.0
+        for o in neighbors[c]:
+            bits = readings[o]
+            if not bits:
+                continue
+            # Probabilidade de nenhum outro vizinho de o ter o perigo
+            no_pit = no_wumpus = 1.0
+            for j in neighbors[o]:
+                if j != c:
+                    no_pit *= 1.0 - pit[j]
+                    no_wumpus *= 1.0 - wumpus[j]
+            breeze = (1.0 - no_pit) * (1.0 - breeze_fn) + no_pit * breeze_fp  # P(vento | c sem buraco)
+            if bits & _BREEZE:
+                pit_yes *= 1.0 - breeze_fn
+                pit_no *= breeze
+            else:
+                pit_yes *= breeze_fn
+                pit_no *= 1.0 - breeze
+            stench = (1.0 - no_wumpus) * (1.0 - stench_fn) + no_wumpus * stench_fp
+            if bits & _STENCH:
+                wumpus_yes *= 1.0 - stench_fn
+                wumpus_no *= stench
+            else:
+                wumpus_yes *= stench_fn
+                wumpus_no *= 1.0 - stench
+
+        change = 0.0
+        for values, prior, yes, no in ((pit, self.prior_pit, pit_yes, pit_no),
+                                       (wumpus, self.prior_wumpus, wumpus_yes, wumpus_no)):
+            total = prior * yes + (1.0 - prior) * no
+            if total > 0.0:  # Leituras impossíveis no modelo (só sem ruído): mantém o valor
+                value = prior * yes / total
+                change = max(change, abs(value - values[c]))
+                values[c] = value
+        return change
+
+    def _propagate(self, queue):
+        """Recalcula as células da fila e, quando mudam, as que dividem uma leitura com elas. Devolve as tocadas."""
+        neighbors, readings, fixed = self._neighbors, self._readings, self._fixed
+        queued = set(queue)
+        updates = collections.Counter()
+        queue = collections.deque(queue)
+        while queue:
+            c = queue.popleft()
+            queued.discard(c)
+            updates[c] += 1
+            if self._update_cell(c) <= self.tolerance:
+                continue
+            for o in neighbors[c]:
+                if readings[o]:
+                    for j in neighbors[o]:
+                        if j != c and not fixed[j] and j not in queued and updates[j] < self.max_updates:
+                            queued.add(j)
+                            queue.append(j)
+        self.stats["updates"] += sum(updates.values())
+        return updates
+
+    def observe(self, cell, percept):
+        """Registra a leitura de uma célula visitada e devolve (novas seguras, novas perigosas)."""
+        start = time.perf_counter()
+        n = self.grid_size
+        fedor, vento, _ = percept
+        i = cell[0] * n + cell[1]
+        neighbors, fixed = self._neighbors, self._fixed
+        self._readings[i] = _OBSERVED | (_STENCH if fedor else 0) | (_BREEZE if vento else 0)
+        fixed[i] = 1
+        self.pit[i] = self.wumpus[i] = 0.0
+        self.frontier.discard(i)
+        self.safe.add(cell)
+
+        # A leitura nova afeta os vizinhos de i; a certeza sobre i afeta as leituras vizinhas de i
+        queue = [j for j in neighbors[i] if not fixed[j]]
+        for o in neighbors[i]:
+            if self._readings[o]:
+                queue.extend(j for j in neighbors[o] if not fixed[j] and j not in queue)
+            else:
+                self.frontier.add(o)
+        touched = set(self._propagate(queue))
+        touched.update(j for j in neighbors[i] if not self._readings[j])  # Inclui a área inicial, sem perigo
+        touched.update(self._locate(touched))
+
+        new_safe, new_danger = [], []
+        for j in sorted(touched):
+            c = divmod(j, n)
+            if c in self.safe or c in self.danger:
+                continue
+            risk = 1.0 - (1.0 - self.pit[j]) * (1.0 - self.wumpus[j])
+            if risk <= self.safe_threshold:
+                self.safe.add(c)
+                new_safe.append(c)
+            elif risk >= self.danger_threshold:
+                self.danger.add(c)
+                new_danger.append(c)
+        elapsed = time.perf_counter() - start
+        self.stats["observations"] += 1
+        self.stats["time"] += elapsed
+        self.stats["max_time"] = max(self.stats["max_time"], elapsed)
+        return new_safe, new_danger
+
+    def _locate(self, touched):
+        """Registra os perigos localizados entre as células tocadas. Devolve as células a reclassificar.
+
+        Quando um perigo se esgota (tantos localizados quanto há no mapa), fixa os
+        localizados e zera esse perigo no resto do tabuleiro.
+        """
+        fixed, hazards = self._fixed, (self.pit, self.wumpus)
+        exhausted = []
+        for k, total in enumerate((self.num_holes, self.num_wumpus)):
+            values, located = hazards[k], self._located[k]
+            if len(located) >= total:
+                continue
+            located.extend(j for j in touched if not fixed[j] and values[j] >= self.danger_threshold
+                           and j not in located)
+            if len(located) >= total:
+                exhausted.append(k)
+        if not exhausted:
+            return ()
+        for located in self._located:
+            for j in located:
+                fixed[j] = 1
+        for k in exhausted:
+            if k == 0:
+                self.prior_pit = 0.0
+            else:
+                self.prior_wumpus = 0.0
+            values = hazards[k]
+            for j, f in enumerate(fixed):
+                if not f:
+                    values[j] = 0.0
+        return self.frontier
+
+    def recompute(self, max_sweeps=100):
+        """Recalcula o tabuleiro inteiro até estabilizar (sem a atualização local). Devolve as varreduras feitas."""
+        cells = [c for c in range(self.grid_size * self.grid_size) if not self._fixed[c]]
+        for sweep in range(1, max_sweeps + 1):
+            if max((self._update_cell(c) for c in cells), default=0.0) <= self.tolerance:
+                return sweep
+        return max_sweeps
+
+    def probabilities(self, knowledge_base=None):
+        """Como FrontierRisk.probabilities: ({célula da fronteira: probabilidade de perigo}, a priori das demais)."""
+        n, pit, wumpus = self.grid_size, self.pit, self.wumpus
+        frontier = {divmod(i, n): 1.0 - (1.0 - pit[i]) * (1.0 - wumpus[i]) for i in self.frontier}
+        return frontier, 1.0 - (1.0 - self.prior_pit) * (1.0 - self.prior_wumpus)
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Enumeração exaustiva dos mapas e avaliação exata do agente.
+
+Em grades pequenas (4x4 com 1 Wumpus e 2 buracos tem pouco mais de 8 mil
+mapas solucionáveis) dá para jogar todos os mapas em vez de sortear
+sementes, e em cada mapa todas as escolhas aleatórias do agente, com a
+probabilidade exata de cada uma. O resultado é a taxa de vitórias exata
+(uma fração), sem o ruído da amostragem.
+
+- enumerate_maps gera os mapas válidos sob demanda (um gerador), na mesma
+  distribuição de mundo.WumpusWorld._generate_solvable_map (todos os mapas
+  solucionáveis igualmente prováveis). Com dedup=True, só gera um mapa de
+  cada classe de mapas equivalentes pelas simetrias da grade que fixam o
+  início (symmetries), com a quantidade de mapas da classe; as
+  configurações de perigos que não são canônicas são descartadas antes do
+  flood fill do ouro.
+- evaluate_map joga um mapa em todas as ramificações das escolhas do
+  agente (rng.choice é uniforme): em cada sorteio guarda um retrato
+  (snapshot) e, para cada opção, restaura o retrato e termina a jogada com
+  ela. Devolve as probabilidades de vitória, derrota e travamento e os
+  passos esperados, com os mesmos critérios de simulacao.run_episode.
+- evaluate_exact junta tudo; com dedup=True, joga só os mapas canônicos,
+  pesando cada um pela multiplicidade.
+
+A deduplicação só seria exata se o agente fosse simétrico. As escolhas
+aleatórias são (a ordem dos vizinhos não importa para um sorteio
+uniforme), mas os desempates determinísticos (próximo passo da busca em
+largura, ordem de varredura das regras) dependem da orientação da grade,
+então os mapas de uma classe podem ter resultados um pouco diferentes
+(no 4x4 com 2 buracos: 71,9367% contra os 71,9302% exatos). Por isso
+evaluate_exact joga todos os mapas por padrão; dedup=True (--simetria) é
+uma aproximação com cerca de metade do custo.
+
+Uso:
+    python enumeracao.py --grade 4 --buracos 2 --wumpus 1
+    python enumeracao.py --probabilistico --simetria
+    python -m benchmarks.bench_enumeracao   # comparação com a amostragem
+"""
+
+import argparse
+import collections
+import itertools
+import time
+from fractions import Fraction
+
+from agente import INFERENCE_MODES, InferenceAgent
+from grade import neighbor_ids
+from mundo import MapPreset, WumpusWorld
+from simulacao import progress_key
+
+# Um mapa enumerado: perigos e ouro em (x, y), e quantos mapas equivalentes ele representa
+EnumeratedMap = collections.namedtuple("EnumeratedMap", ["wumpuses", "holes", "gold", "multiplicity"])
+# Resultado exato de um mapa: probabilidades de cada fim e passos esperados (frações)
+MapOutcome = collections.namedtuple("MapOutcome", ["victory", "game_over", "stuck", "steps"])
+
+
+def symmetries(grid_size, start_pos):
+    """Simetrias da grade (rotações e reflexões) que deixam start_pos no lugar.
+
+    Cada uma é uma tupla que leva o identificador de uma célula (x * n + y)
+    ao da sua imagem; a identidade vem primeiro.
+    """
+    last = grid_size - 1
+    transforms = [
+        lambda x, y: (x, y), lambda x, y: (last - y, x), lambda x, y: (last - x, last - y),
+        lambda x, y: (y, last - x), lambda x, y: (last - x, y), lambda x, y: (x, last - y),
+        lambda x, y: (y, x), lambda x, y: (last - y, last - x),
+    ]
+    result = []
+    for transform in transforms:
+        if transform(*start_pos) != tuple(start_pos):
+            continue
+        table = tuple(a * grid_size + b for a, b in
+                      (transform(x, y) for x in range(grid_size) for y in range(grid_size)))
+        if table not in result:
+            result.append(table)
+    return result
+
+
+def _reachable(start, blocked, neighbors):
+    """Células alcançáveis a partir de start sem passar pelas bloqueadas (flood fill)."""
+    seen = set(blocked)
+    seen.add(start)
+    reached = [start]
+    for i in reached:
+        for j in neighbors[i]:
+            if j not in seen:
+                seen.add(j)
+                reached.append(j)
+    return reached
+
+
+def count_maps(grid_size, num_holes=2, num_wumpus=1):
+    """Quantidade de mapas válidos (sem deduplicar)."""
+    return sum(m.multiplicity for m in enumerate_maps(grid_size, num_holes, num_wumpus, dedup=False))
+
+
+def enumerate_maps(grid_size, num_holes=2, num_wumpus=1, dedup=True):
+    """Gera os mapas válidos (EnumeratedMap), um por vez.
+
+    Válidos como em _generate_solvable_map: nenhum perigo nem o ouro no
+    início ou nos vizinhos dele, e o ouro alcançável sem passar por perigos.
+    Com dedup=True, gera só o menor mapa de cada classe de equivalência
+    pelas simetrias e multiplicity diz quantos mapas a classe tem; com
+    dedup=False, gera todos com multiplicity 1.
+    """
+    n = grid_size
+    start_pos = (0, n - 1)
+    start = start_pos[0] * n + start_pos[1]
+    neighbors = neighbor_ids(n)
+    forbidden = {start, *neighbors[start]}
+    cells = [i for i in range(n * n) if i not in forbidden]
+    if len(cells) < num_wumpus + num_holes + 1:
+        raise ValueError(f"Grade {n}x{n} não comporta {num_wumpus} Wumpus, "
+                         f"{num_holes} buracos e o ouro fora da área inicial.")
+    group = symmetries(n, start_pos) if dedup else symmetries(n, start_pos)[:1]
+
+    for wumpuses in itertools.combinations(cells, num_wumpus):
+        rest = [i for i in cells if i not in wumpuses]
+        for holes in itertools.combinations(rest, num_holes):
+            # Perigos canônicos: os menores entre as suas imagens; os outros já foram gerados por elas
+            stabilizer = []
+            for table in group:
+                image = (tuple(sorted(table[i] for i in wumpuses)), tuple(sorted(table[i] for i in holes)))
+                if image < (wumpuses, holes):
+                    break
+                if image == (wumpuses, holes):
+                    stabilizer.append(table)
+            else:
+                hazards = wumpuses + holes
+                for gold in _reachable(start, hazards, neighbors):
+                    if gold in forbidden:
+                        continue
+                    images = {table[gold] for table in stabilizer}
+                    if min(images) != gold:
+                        continue
+                    # Órbita do mapa: uma imagem dos perigos por classe lateral, vezes as imagens do ouro
+                    multiplicity = len(group) // len(stabilizer) * len(images)
+                    yield EnumeratedMap([divmod(i, n) for i in wumpuses], [divmod(i, n) for i in holes],
+                                        divmod(gold, n), multiplicity)
+
+
+class _Branch(Exception):
+    """A jogada atual sorteia entre count opções: cada uma vira uma ramificação a partir de state."""
+
+    def __init__(self, count, state):
+        self.count = count
+        self.state = state
+
+
+class _Stuck(Exception):
+    """O agente sorteou entre células já visitadas: vai vagar por elas até o limite de passos."""
+
+
+class _Chooser:
+    """Substitui o gerador do agente: em vez de sortear, devolve a opção imposta ou pede uma ramificação."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.forced = None
+
+    def choice(self, options):
+        if self.forced is not None:
+            option, self.forced = options[self.forced], None
+            return option
+        agent = self.agent
+        if len(options) == 1 or agent.game_over:
+            return options[0]  # Depois do fim do jogo, todas as opções dão o mesmo resultado
+        # Sem células novas entre as opções, nada mais muda (a inferência ignora células visitadas)
+        visited = agent.visited
+        if all(c in visited for c in options):
+            raise _Stuck
+        raise _Branch(len(options), _snapshot(agent))
+
+    def getstate(self):
+        return None
+
+    def setstate(self, state):
+        pass
+
+
+def _snapshot(agent):
+    snapshot = agent.snapshot()
+    agent._rng_shared = False  # O gerador é o _Chooser, que não deve ser copiado
+    return snapshot
+
+
+def _restore(agent, snapshot):
+    agent.restore(snapshot)
+    agent._rng_shared = False
+
+
+def evaluate_map(wumpuses, holes, gold, grid_size=4, num_holes=2, num_wumpus=1, max_steps=1000, **options):
+    """Resultado exato (MapOutcome) do agente em um mapa, sobre todas as suas escolhas aleatórias.
+
+    Os fins e os passos seguem simulacao.run_episode: um passo sem mudança
+    em progress_key é travamento, e um agente que passa a vagar por células
+    visitadas fica travado com max_steps passos. options são repassadas ao
+    InferenceAgent (inference, probabilistic); o planejador não é aceito, pois
+    sorteia mapas por conta própria.
+    """
+    if options.get("planner") is not None:
+        raise ValueError("a avaliação exata não aceita o planejador (busca.py)")
+    chooser = _Chooser(None)
+    world = WumpusWorld(grid_size=grid_size, num_holes=num_holes, num_wumpus=num_wumpus,
+                        preset=MapPreset(wumpuses, holes, gold, None, None))
+    agent = InferenceAgent(world, verbose=False, rng=chooser, **options)
+    chooser.agent = agent
+    totals = dict.fromkeys(MapOutcome._fields, Fraction(0))
+    # Ramificações a jogar: (retrato no meio da jogada, probabilidade, passos, opção, progress_key antes da jogada)
+    pending = [(None, Fraction(1), 0, None, None)]
+    while pending:
+        state, probability, steps, chooser.forced, previous = pending.pop()
+        try:
+            while state is not None or not agent.game_over and not agent.victory and steps < max_steps:
+                if state is not None:
+                    # Termina a jogada interrompida, agora com a opção imposta
+                    _restore(agent, state)
+                    state = None
+                    agent._own_state()
+                    agent._move()
+                else:
+                    previous = progress_key(agent)
+                    agent.step()
+                if progress_key(agent) == previous:
+                    break
+                steps += agent.agent_pos != previous[0]
+        except _Branch as branch:
+            share = probability / branch.count
+            pending.extend((branch.state, share, steps, i, previous) for i in range(branch.count))
+            continue
+        except _Stuck:
+            steps = max_steps
+        outcome = "victory" if agent.victory else "game_over" if agent.game_over else "stuck"
+        totals[outcome] += probability
+        totals["steps"] += probability * steps
+    return MapOutcome(**totals)
+
+
+def evaluate_exact(grid_size=4, num_holes=2, num_wumpus=1, max_steps=1000, dedup=False, world_options=None):
+    """Avalia o agente em todos os mapas. Devolve um resumo como o de simulacao.summarize, com frações.
+
+    "maps" é a quantidade de mapas válidos e "evaluated" a de mapas jogados
+    (os canônicos, com dedup=True: aí o resultado é aproximado e "dedup" vem True).
+    """
+    options = dict(world_options or {})
+    start = time.perf_counter()
+    totals = dict.fromkeys(MapOutcome._fields, Fraction(0))
+    maps = evaluated = 0
+    for m in enumerate_maps(grid_size, num_holes, num_wumpus, dedup):
+        outcome = evaluate_map(m.wumpuses, m.holes, m.gold, grid_size, num_holes, num_wumpus, max_steps, **options)
+        for name in MapOutcome._fields:
+            totals[name] += m.multiplicity * getattr(outcome, name)
+        maps += m.multiplicity
+        evaluated += 1
+    return {
+        "maps": maps,
+        "evaluated": evaluated,
+        "dedup": dedup,
+        "win_rate": totals["victory"] / maps,
+        "game_over_rate": totals["game_over"] / maps,
+        "stuck_rate": totals["stuck"] / maps,
+        "mean_steps": totals["steps"] / maps,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def print_exact(summary):
+    """Mostra o resumo de evaluate_exact."""
+    print(f"Mapas:               {summary['maps']} ({summary['evaluated']} jogados)")
+    if summary["dedup"]:
+        print(f"Vitórias:            {float(summary['win_rate']):.6%} (aproximado: um mapa por classe de simetria)")
+    else:
+        print(f"Vitórias:            {float(summary['win_rate']):.6%} (exato: {summary['win_rate']})")
+    print(f"Game over:           {float(summary['game_over_rate']):.6%}")
+    print(f"Travados:            {float(summary['stuck_rate']):.6%}")
+    print(f"Passos por episódio: {float(summary['mean_steps']):.4f}")
+    print(f"Tempo total:         {summary['elapsed']:.2f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avalia o agente de forma exata em todos os mapas da configuração.")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--inferencia", choices=INFERENCE_MODES, default="rules", help="motor de inferência do agente")
+    parser.add_argument("--probabilistico", action="store_true",
+                        help="sem células seguras, arrisca a de menor probabilidade de perigo")
+    parser.add_argument("--simetria", action="store_true",
+                        help="joga um mapa por classe de simetria (cerca de metade do tempo, resultado aproximado)")
+    args = parser.parse_args(argv)
+
+    options = {"inference": args.inferencia, "probabilistic": args.probabilistico}
+    print_exact(evaluate_exact(args.grade, args.buracos, args.wumpus, args.max_passos, args.simetria,
+                               options))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Representação compacta da grade do Mundo do Wumpus.
+
+Cada célula (x, y) de uma grade N x N tem um identificador inteiro
+x * N + y. As vizinhanças são calculadas uma única vez por tamanho de
+grade (e compartilhadas por todos os mundos desse tamanho), e o estado
+das células fica em um único bytearray de flags, um byte por célula.
+
+CellSet é uma visão desse bytearray com a interface de um set de tuplas
+(x, y): o código que usa world.visited, world.safe etc. como conjuntos
+continua funcionando sem manter quatro sets sincronizados à mão.
+"""
+
+import collections.abc
+import functools
+
+# Flags de estado por célula (bits do bytearray CellStates.flags)
+VISITED = 1
+SAFE = 2
+DANGER = 4
+UNKNOWN = 8
+
+
+@functools.lru_cache(maxsize=None)
+def neighbor_ids(grid_size):
+    """Tabela de vizinhos por identificador: neighbor_ids(N)[i] é uma tupla de identificadores.
+
+    A ordem é a de WumpusWorld.get_adjacent: x - 1, x + 1, y - 1, y + 1.
+    """
+    table = []
+    for x in range(grid_size):
+        for y in range(grid_size):
+            i = x * grid_size + y
+            adj = []
+            if x > 0: adj.append(i - grid_size)
+            if x < grid_size - 1: adj.append(i + grid_size)
+            if y > 0: adj.append(i - 1)
+            if y < grid_size - 1: adj.append(i + 1)
+            table.append(tuple(adj))
+    return tuple(table)
+
+
+@functools.lru_cache(maxsize=None)
+def neighbor_cells(grid_size):
+    """A mesma tabela de neighbor_ids, com tuplas (x, y) no lugar dos identificadores."""
+    cells = [divmod(i, grid_size) for i in range(grid_size * grid_size)]
+    return tuple(tuple(cells[j] for j in adj) for adj in neighbor_ids(grid_size))
+
+
+def changed_ids(before, after, grid_size):
+    """Identificadores das células cujo byte difere entre dois retratos das flags (mesmo tamanho).
+
+    Compara uma coluna x inteira de cada vez, então grades com poucas mudanças
+    custam pouco mais que a comparação dos bytes.
+    """
+    changed = []
+    for start in range(0, grid_size * grid_size, grid_size):
+        end = start + grid_size
+        if before[start:end] != after[start:end]:
+            changed.extend(i for i in range(start, end) if before[i] != after[i])
+    return changed
+
+
+class CellStates:
+    """Flags de todas as células em um bytearray, com a contagem de células por flag."""
+
+    __slots__ = ("grid_size", "flags", "counts")
+
+    def __init__(self, grid_size, initial=0):
+        self.grid_size = grid_size
+        self.flags = bytearray([initial]) * (grid_size * grid_size)
+        self.counts = {bit: (grid_size * grid_size if initial & bit else 0)
+                       for bit in (VISITED, SAFE, DANGER, UNKNOWN)}
+
+    def set(self, i, bit):
+        """Liga a flag na célula i. Devolve False se ela já estava ligada."""
+        if self.flags[i] & bit:
+            return False
+        self.flags[i] |= bit
+        self.counts[bit] += 1
+        return True
+
+    def clear(self, i, bit):
+        """Desliga a flag na célula i. Devolve False se ela já estava desligada."""
+        if not self.flags[i] & bit:
+            return False
+        self.flags[i] &= ~bit
+        self.counts[bit] -= 1
+        return True
+
+    def copy(self):
+        """Cópia independente das flags e das contagens."""
+        clone = CellStates.__new__(CellStates)
+        clone.grid_size = self.grid_size
+        clone.flags = self.flags[:]
+        clone.counts = self.counts.copy()
+        return clone
+
+    def view(self, bit):
+        """Visão de conjunto (mutável) das células com a flag ligada."""
+        return CellSet(self, bit)
+
+
+class CellSet(collections.abc.MutableSet):
+    """Visão de CellStates como um set de tuplas (x, y).
+
+    Com mask = value = uma única flag, representa as células com essa flag e
+    aceita add/discard. Com outros valores (por exemplo mask = SAFE | DANGER e
+    value = SAFE, "seguras e não perigosas") a visão é só de leitura.
+    Operações entre conjuntos (-, |, &) devolvem sets comuns.
+    """
+
+    __slots__ = ("_states", "_mask", "_value")
+
+    def __init__(self, states, mask, value=None):
+        self._states = states
+        self._mask = mask
+        self._value = mask if value is None else value
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def _index(self, cell):
+        n = self._states.grid_size
+        x, y = cell
+        if 0 <= x < n and 0 <= y < n:
+            return x * n + y
+        return None
+
+    def __contains__(self, cell):
+        states = self._states
+        n = states.grid_size
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return False
+        return 0 <= x < n and 0 <= y < n and states.flags[x * n + y] & self._mask == self._value
+
+    def __iter__(self):
+        n = self._states.grid_size
+        mask, value = self._mask, self._value
+        for i, flags in enumerate(self._states.flags):
+            if flags & mask == value:
+                yield divmod(i, n)
+
+    def __len__(self):
+        if self._mask == self._value and self._mask in self._states.counts:
+            return self._states.counts[self._mask]
+        return sum(1 for _ in self)
+
+    def _writable_bit(self):
+        if self._mask != self._value or self._mask not in self._states.counts:
+            raise TypeError("esta visão de células é somente leitura")
+        return self._mask
+
+    def add(self, cell):
+        bit = self._writable_bit()
+        i = self._index(cell)
+        if i is None:
+            raise ValueError(f"célula {cell} fora da grade")
+        self._states.set(i, bit)
+
+    def discard(self, cell):
+        bit = self._writable_bit()
+        i = self._index(cell)
+        if i is not None:
+            self._states.clear(i, bit)
+
+    def update(self, cells):
+        for cell in cells:
+            self.add(cell)
+
+    def copy(self):
+        return set(self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({set(self)!r})"
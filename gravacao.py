@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""
+Gravação compacta de episódios do Mundo do Wumpus, com reprodução e busca.
+
+Cada episódio vira uma sequência de registros binários em um arquivo só de
+acréscimo (vários episódios por arquivo):
+- um cabeçalho com o mapa (tamanho da grade, Wumpus, buracos e ouro);
+- um registro por jogada com a posição do agente, o status (ouro, derrota,
+  vitória) e só as células cujo estado mudou, como pares de largura fixa
+  (identificador da célula, novo estado);
+- a cada KEYFRAME_INTERVAL jogadas (ou quando as mudanças ocupariam mais
+  que a grade inteira), um quadro-chave com o estado de todas as células.
+
+O estado de uma célula é um byte: as flags de grade.py nos 4 bits baixos
+e, se a célula está na base de conhecimento, a percepção sentida nela
+(fedor, vento, brilho) nos bits 4 a 6.
+
+Ao fechar, o gravador acrescenta um índice (início de cada episódio e
+jogada/posição de cada quadro-chave). Com ele, EpisodeReplay.seek() acha
+o quadro-chave anterior por busca binária e aplica no máximo
+KEYFRAME_INTERVAL registros de mudanças, em vez de refazer o episódio.
+Se o arquivo não terminar com um índice (gravação interrompida), o
+leitor percorre os registros e o reconstrói.
+
+Uso:
+    python gravacao.py episodios.wump                       # resumo do arquivo
+    python gravacao.py episodios.wump --episodio 3 --passo 10
+"""
+
+import argparse
+import array
+import bisect
+import collections
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+from grade import DANGER, SAFE, UNKNOWN, VISITED, changed_ids
+
+MAGIC = b"WUMPREC1"
+KEYFRAME_INTERVAL = 64
+
+# Bits do byte de status de cada jogada
+HAS_GOLD, GAME_OVER, VICTORY = 1, 2, 4
+# A percepção de uma célula visitada fica nos bits acima das flags
+PERCEPT_SHIFT = 4
+
+# Registros (todos little-endian). Cada um começa com uma etiqueta de 1 byte.
+_FILE_HEADER = struct.Struct("<8sI")       # MAGIC, intervalo entre quadros-chave
+_EPISODE = struct.Struct("<cHqIII")        # b"E", tamanho da grade, semente (-1 = nenhuma), ouro, nº Wumpus, nº buracos
+_KEYFRAME = struct.Struct("<cIB")          # b"K", posição do agente, status; seguem N * N bytes de estado
+_STEP = struct.Struct("<cIBI")             # b"S", posição do agente, status, nº de células; seguem ids (uint32) e estados
+_INDEX = struct.Struct("<cQQ")             # b"X", nº de episódios, nº de quadros-chave; seguem os arrays do índice
+_FOOTER = struct.Struct("<Q8s")            # posição do registro de índice, MAGIC
+
+
+def _to_bytes(values):
+    """Bytes little-endian de um array (o formato do arquivo não depende da máquina)."""
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode, data):
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class _Index:
+    """Posição de cada episódio e de cada quadro-chave no arquivo."""
+
+    def __init__(self):
+        self.episode_offsets = array.array("Q")   # Posição do cabeçalho de cada episódio
+        self.episode_steps = array.array("Q")     # Jogadas gravadas (sem contar o quadro inicial)
+        self.first_keyframe = array.array("Q")    # Índice do primeiro quadro-chave de cada episódio
+        self.keyframe_steps = array.array("Q")    # Jogada de cada quadro-chave
+        self.keyframe_offsets = array.array("Q")  # Posição de cada quadro-chave
+
+    def add_episode(self, offset):
+        self.episode_offsets.append(offset)
+        self.episode_steps.append(0)
+        self.first_keyframe.append(len(self.keyframe_steps))
+
+    def add_keyframe(self, step, offset):
+        self.keyframe_steps.append(step)
+        self.keyframe_offsets.append(offset)
+
+    def keyframe_range(self, episode):
+        """Intervalo [início, fim) dos quadros-chave do episódio nos arrays de quadros-chave."""
+        start = self.first_keyframe[episode]
+        end = (self.first_keyframe[episode + 1] if episode + 1 < len(self.first_keyframe)
+               else len(self.keyframe_steps))
+        return start, end
+
+    def encode(self):
+        return (_INDEX.pack(b"X", len(self.episode_offsets), len(self.keyframe_steps))
+                + b"".join(_to_bytes(a) for a in (self.episode_offsets, self.episode_steps, self.first_keyframe,
+                                                   self.keyframe_steps, self.keyframe_offsets)))
+
+    @classmethod
+    def decode(cls, data, offset):
+        """Lê o registro de índice em offset. Devolve (índice, posição logo depois dele)."""
+        _, episodes, keyframes = _INDEX.unpack_from(data, offset)
+        index = cls()
+        offset += _INDEX.size
+        for name, count in (("episode_offsets", episodes), ("episode_steps", episodes),
+                            ("first_keyframe", episodes), ("keyframe_steps", keyframes),
+                            ("keyframe_offsets", keyframes)):
+            setattr(index, name, _from_bytes("Q", data[offset:offset + 8 * count]))
+            offset += 8 * count
+        return index, offset + _FOOTER.size
+
+
+def _read_index(data):
+    """Índice do arquivo: o do fim, se houver, ou reconstruído percorrendo os registros.
+
+    Devolve (índice, fim do último registro completo).
+    """
+    if len(data) >= _FILE_HEADER.size + _FOOTER.size:
+        offset, magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if magic == MAGIC and offset < len(data) and data[offset:offset + 1] == b"X":
+            return _Index.decode(data, offset)[0], len(data)
+
+    index = _Index()
+    offset = _FILE_HEADER.size
+    cells = step = 0
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        header = {b"E": _EPISODE, b"X": _INDEX, b"K": _KEYFRAME, b"S": _STEP}.get(tag)
+        if header is None:
+            raise ValueError(f"registro desconhecido na posição {offset} do arquivo de episódios")
+        if offset + header.size > len(data):
+            break  # Último registro incompleto (gravação interrompida)
+        if tag == b"E":
+            _, grid_size, _, _, num_wumpus, num_holes = _EPISODE.unpack_from(data, offset)
+            size = _EPISODE.size + 4 * (num_wumpus + num_holes)
+            if offset + size > len(data):
+                break
+            index.add_episode(offset)
+            cells = grid_size * grid_size
+            step = -1  # O primeiro registro depois do cabeçalho é o quadro inicial (jogada 0)
+            offset += size
+            continue
+        if tag == b"X":
+            # Índice de uma gravação anterior (o arquivo recebeu episódios depois dela)
+            _, episodes, keyframes = _INDEX.unpack_from(data, offset)
+            size = _INDEX.size + 8 * (3 * episodes + 2 * keyframes) + _FOOTER.size
+            if offset + size > len(data):
+                break
+            offset += size
+            continue
+        if tag == b"K":
+            size = _KEYFRAME.size + cells
+        else:
+            size = _STEP.size + 5 * _STEP.unpack_from(data, offset)[3]
+        if offset + size > len(data):
+            break
+        step += 1
+        if tag == b"K":
+            index.add_keyframe(step, offset)
+        index.episode_steps[-1] = step
+        offset += size
+    return index, offset
+
+
+def _status(agent):
+    return (HAS_GOLD if agent.has_gold else 0) | (GAME_OVER if agent.game_over else 0) | \
+           (VICTORY if agent.victory else 0)
+
+
+def _percept_state(percepts):
+    fedor, vento, brilho = percepts
+    return (fedor | vento << 1 | brilho << 2) << PERCEPT_SHIFT
+
+
+class EpisodeRecorder:
+    """Grava episódios do agente (agente.InferenceAgent) em um arquivo binário só de acréscimo.
+
+    Uso: begin(agent) depois de criar (ou reiniciar) o agente, record(agent)
+    depois de cada step() e close() no fim (ou um bloco with). Um arquivo
+    existente recebe os episódios novos depois dos que já tinha.
+    """
+
+    def __init__(self, path, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self._index = _Index()
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, keyframe_interval = _FILE_HEADER.unpack_from(data, 0)
+                if magic != MAGIC:
+                    raise ValueError(f"{path} não é um arquivo de episódios")
+                self._index, end = _read_index(data)
+            # Continua depois do último registro completo (descarta o resto de uma gravação interrompida)
+            self._file = open(path, "r+b")
+            self._file.truncate(end)
+            self._file.seek(end)
+            self._offset = end
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_FILE_HEADER.pack(MAGIC, keyframe_interval))
+            self._offset = _FILE_HEADER.size
+        self.keyframe_interval = keyframe_interval
+        self._agent = None
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def begin(self, agent, seed=None):
+        """Começa um episódio novo com o mapa do mundo e o estado atual do agente."""
+        n = agent.GRID_SIZE
+        world = agent.world
+        hazards = array.array("I", (x * n + y for x, y in itertools.chain(world.wumpuses, world.holes)))
+        self._index.add_episode(self._offset)
+        self._write(_EPISODE.pack(b"E", n, -1 if seed is None else seed, world.gold[0] * n + world.gold[1],
+                                  len(world.wumpuses), len(world.holes)) + _to_bytes(hazards))
+        self._agent = agent
+        self._step = 0
+        self._write_keyframe(agent)
+
+    def _write_keyframe(self, agent):
+        n = agent.GRID_SIZE
+        states = bytearray(agent._cells.flags)
+        for (x, y), percepts in agent.knowledge_base.items():
+            states[x * n + y] |= _percept_state(percepts)
+        self._index.add_keyframe(self._step, self._offset)
+        self._write(_KEYFRAME.pack(b"K", agent.agent_pos[0] * n + agent.agent_pos[1], _status(agent)) + states)
+        self._states = states
+        self._flags = bytes(agent._cells.flags)
+        self._timeline = agent._timeline
+        self._known = len(agent.knowledge_base)
+        self._since_keyframe = 0
+
+    def record(self, agent):
+        """Grava a jogada que o agente passado a begin() acabou de fazer."""
+        if agent is not self._agent:
+            raise ValueError("record() recebeu um agente diferente do passado a begin()")
+        n = agent.GRID_SIZE
+        self._step += 1
+        self._index.episode_steps[-1] = self._step
+        knowledge = agent.knowledge_base
+        self._since_keyframe += 1
+        if (agent._timeline != self._timeline or len(knowledge) < self._known
+                or self._since_keyframe >= self.keyframe_interval):
+            # Intervalo completo, ou o conhecimento foi refeito (reset(), back()): quadro-chave
+            self._write_keyframe(agent)
+            return
+
+        flags = agent._cells.flags
+        states = self._states
+        changed = []
+        if flags != self._flags:
+            changed = changed_ids(self._flags, flags, n)
+            for i in changed:
+                states[i] = states[i] & 0xF0 | flags[i]
+            self._flags = bytes(flags)
+        # As células que entraram na base de conhecimento são as últimas inseridas no dicionário
+        # (e já estão em changed, porque acabaram de ser visitadas)
+        for (x, y) in itertools.islice(reversed(knowledge), len(knowledge) - self._known):
+            i = x * n + y
+            states[i] = states[i] & 0x0F | _percept_state(knowledge[(x, y)])
+            if i not in changed:
+                changed.append(i)
+        self._known = len(knowledge)
+
+        if 5 * len(changed) >= n * n:
+            self._write_keyframe(agent)
+            return
+        ids = array.array("I", changed)
+        self._write(_STEP.pack(b"S", agent.agent_pos[0] * n + agent.agent_pos[1], _status(agent), len(ids))
+                    + _to_bytes(ids) + bytes(map(states.__getitem__, ids)))
+
+    def close(self):
+        """Acrescenta o índice ao arquivo e o fecha."""
+        if self._file.closed:
+            return
+        offset = self._offset
+        self._write(self._index.encode())
+        self._write(_FOOTER.pack(offset, MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Frame(collections.namedtuple("Frame", ["step", "grid_size", "agent_pos", "status", "states"])):
+    """Estado gravado de um episódio em uma jogada (states: um byte de estado por célula)."""
+
+    __slots__ = ()
+
+    @property
+    def has_gold(self):
+        return bool(self.status & HAS_GOLD)
+
+    @property
+    def game_over(self):
+        return bool(self.status & GAME_OVER)
+
+    @property
+    def victory(self):
+        return bool(self.status & VICTORY)
+
+    def cells(self, bit):
+        """Células (x, y) com a flag bit (VISITED, SAFE, DANGER ou UNKNOWN de grade.py)."""
+        return {divmod(i, self.grid_size) for i, state in enumerate(self.states) if state & bit}
+
+    @property
+    def knowledge_base(self):
+        """Percepções (fedor, vento, brilho) das células visitadas."""
+        kb = {}
+        for i, state in enumerate(self.states):
+            if state & VISITED:
+                bits = state >> PERCEPT_SHIFT
+                kb[divmod(i, self.grid_size)] = (bool(bits & 1), bool(bits & 2), bool(bits & 4))
+        return kb
+
+
+class EpisodeReplay:
+    """Reprodução de um episódio gravado: seek(jogada), avanço e volta.
+
+    Mantém o estado da última jogada buscada; avançar a partir dela só
+    aplica os registros seguintes, e voltar (back) é uma busca a partir do
+    quadro-chave anterior, sem refazer o episódio desde o início.
+    """
+
+    def __init__(self, log, episode):
+        self._data = log._data
+        self._index = log._index
+        offset = self._index.episode_offsets[episode]
+        _, self.grid_size, seed, gold, num_wumpus, num_holes = _EPISODE.unpack_from(self._data, offset)
+        self.seed = None if seed < 0 else seed
+        start = offset + _EPISODE.size
+        hazards = [divmod(i, self.grid_size)
+                   for i in _from_bytes("I", self._data[start:start + 4 * (num_wumpus + num_holes)])]
+        self.wumpuses, self.holes = hazards[:num_wumpus], hazards[num_wumpus:]
+        self.gold = divmod(gold, self.grid_size)
+        self.num_steps = self._index.episode_steps[episode]
+        self._keyframes = self._index.keyframe_range(episode)
+        self._step = None
+
+    def __len__(self):
+        """Quantidade de quadros: o inicial mais um por jogada."""
+        return self.num_steps + 1
+
+    def _load_keyframe(self, k):
+        offset = self._index.keyframe_offsets[k]
+        _, agent, self._status = _KEYFRAME.unpack_from(self._data, offset)
+        start = offset + _KEYFRAME.size
+        cells = self.grid_size * self.grid_size
+        self._states = bytearray(self._data[start:start + cells])
+        self._agent = agent
+        self._step = self._index.keyframe_steps[k]
+        self._offset = start + cells
+
+    def _advance(self):
+        """Aplica o próximo registro (mudanças ou quadro-chave)."""
+        data, offset = self._data, self._offset
+        if data[offset:offset + 1] == b"K":
+            _, self._agent, self._status = _KEYFRAME.unpack_from(data, offset)
+            start = offset + _KEYFRAME.size
+            cells = self.grid_size * self.grid_size
+            self._states[:] = data[start:start + cells]
+            self._offset = start + cells
+        else:
+            _, self._agent, self._status, count = _STEP.unpack_from(data, offset)
+            start = offset + _STEP.size
+            ids = _from_bytes("I", data[start:start + 4 * count])
+            new_states = data[start + 4 * count:start + 5 * count]
+            states = self._states
+            for i, state in zip(ids, new_states):
+                states[i] = state
+            self._offset = start + 5 * count
+        self._step += 1
+
+    def seek(self, step):
+        """Quadro da jogada step (0 = antes da primeira jogada; negativos contam do fim)."""
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError(f"jogada {step} fora do episódio (0 a {self.num_steps})")
+        first, end = self._keyframes
+        k = bisect.bisect_right(self._index.keyframe_steps, step, first, end) - 1
+        if self._step is None or not self._index.keyframe_steps[k] <= self._step <= step:
+            self._load_keyframe(k)
+        while self._step < step:
+            self._advance()
+        return self.frame()
+
+    def frame(self):
+        """Quadro da jogada atual."""
+        if self._step is None:
+            return self.seek(0)
+        return Frame(self._step, self.grid_size, divmod(self._agent, self.grid_size), self._status,
+                     bytes(self._states))
+
+    def forward(self):
+        """Avança uma jogada (fica na última se já estiver nela)."""
+        return self.seek(min(self.num_steps, 0 if self._step is None else self._step + 1))
+
+    def back(self):
+        """Volta uma jogada (fica na inicial se já estiver nela)."""
+        return self.seek(max(0, 0 if self._step is None else self._step - 1))
+
+    def __iter__(self):
+        for step in range(len(self)):
+            yield self.seek(step)
+
+
+class EpisodeLog:
+    """Arquivo de episódios aberto para leitura (mapeado em memória)."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} está vazio") from None
+        magic, self.keyframe_interval = _FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} não é um arquivo de episódios")
+        self._index, _ = _read_index(self._data)
+
+    def __len__(self):
+        return len(self._index.episode_offsets)
+
+    def episode(self, k):
+        """Reprodução do episódio k (na ordem de gravação)."""
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(f"episódio {k} fora do arquivo (0 a {len(self) - 1})")
+        return EpisodeReplay(self, k)
+
+    def total_steps(self):
+        return sum(self._index.episode_steps)
+
+    def close(self):
+        if not self._file.closed:
+            self._data.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def format_frame(replay, frame):
+    """Desenho em texto da grade no quadro (linhas de y, colunas de x, como na janela)."""
+    n = replay.grid_size
+    hazards = dict.fromkeys(replay.holes, "B")
+    hazards.update(dict.fromkeys(replay.wumpuses, "W"))
+    lines = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            state = frame.states[x * n + y]
+            if (x, y) == frame.agent_pos: mark = "A"
+            elif (x, y) in hazards: mark = hazards[(x, y)]
+            elif (x, y) == replay.gold and not frame.has_gold: mark = "G"
+            elif state & VISITED: mark = "."
+            elif state & DANGER: mark = "!"
+            elif state & SAFE: mark = "+"
+            elif state & UNKNOWN: mark = "?"
+            else: mark = " "
+            row.append(mark)
+        lines.append(" ".join(row))
+    status = "vitória" if frame.victory else "game over" if frame.game_over else \
+             "com o ouro" if frame.has_gold else "procurando o ouro"
+    lines.append(f"jogada {frame.step}/{replay.num_steps}: agente em {frame.agent_pos}, {status}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra episódios gravados por EpisodeRecorder.")
+    parser.add_argument("arquivo")
+    parser.add_argument("--episodio", type=int, default=None, help="episódio a mostrar")
+    parser.add_argument("--passo", type=int, default=-1, help="jogada a mostrar (padrão: a última)")
+    args = parser.parse_args(argv)
+
+    with EpisodeLog(args.arquivo) as log:
+        if args.episodio is None:
+            steps = log.total_steps()
+            size = os.path.getsize(args.arquivo)
+            print(f"Episódios:        {len(log)}")
+            print(f"Jogadas:          {steps}")
+            print(f"Tamanho:          {size} bytes ({size / max(1, steps):.1f} por jogada)")
+            print(f"Quadros-chave:    a cada {log.keyframe_interval} jogadas")
+            return
+        replay = log.episode(args.episodio)
+        print(format_frame(replay, replay.seek(args.passo)))
+
+
+if __name__ == "__main__":
+    main()
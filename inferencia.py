@@ -0,0 +1,603 @@
+# -*- coding: utf-8 -*-
+"""
+Inferência completa por SAT para o agente do Mundo do Wumpus.
+
+As regras escritas à mão em InferenceAgent.logical_update são incompletas e
+consultam o mapa real (world.holes, world.wumpuses). Este módulo oferece um
+motor alternativo que usa apenas as percepções:
+
+- cada célula com variáveis tem P (buraco) e W (Wumpus), nunca os dois;
+- célula visitada: ¬P e ¬W;
+- vento em c  <=>  algum vizinho de c tem P   (idem fedor/W);
+- a quantidade total de buracos e de Wumpus é conhecida. As células que
+  ainda não têm variáveis (longe de tudo que foi visitado) são agregadas,
+  o que reduz a cardinalidade global a limites sobre a fronteira.
+
+Uma célula é segura se a base implica ¬P ∧ ¬W e perigosa se implica P ∨ W.
+As consultas são feitas por um resolvedor CDCL incremental (SatSolver) que
+mantém as cláusulas aprendidas entre os passos; as restrições de
+cardinalidade de cada passo são ativadas por um literal de guarda, então
+as cláusulas aprendidas a partir delas continuam válidas depois.
+"""
+
+import heapq
+import time
+
+TRUE, FALSE, UNASSIGNED = 1, -1, 0
+
+
+def _idx(lit):
+    """Índice de um literal (inteiro no estilo DIMACS) nas listas por literal."""
+    return 2 * lit if lit > 0 else -2 * lit + 1
+
+
+class _AtMost:
+    """Restrição "se guard, no máximo k de lits são verdadeiros"."""
+
+    __slots__ = ("lits", "k", "guard", "count")
+
+    def __init__(self, lits, k, guard):
+        self.lits = lits
+        self.k = k
+        self.guard = guard
+        self.count = 0 # literais de lits atualmente verdadeiros
+
+
+class SatSolver:
+    """Resolvedor CDCL com literais observados, aprendizado 1-UIP e suposições.
+
+    Além de cláusulas, aceita restrições de cardinalidade "no máximo k"
+    com propagação nativa (as explicações são geradas como cláusulas na hora).
+    """
+
+    def __init__(self):
+        self.num_vars = 0
+        self.ok = True
+        self.model = None
+        self._lval = [UNASSIGNED, UNASSIGNED]   # valor por literal
+        self._level = [0]
+        self._reason = [None]
+        self._activity = [0.0]
+        self._phase = [FALSE]
+        self._seen = [False]
+        self._watches = [[], []]                # cláusulas observando cada literal
+        self._card_lits = [[], []]              # restrições que contam cada literal
+        self._card_guards = [[], []]            # restrições guardadas por cada literal
+        self._trail = []
+        self._trail_lim = []
+        self._qhead = 0
+        self._clauses = []
+        self._learnts = []
+        self._order = []
+        self._var_inc = 1.0
+        self._retired = 0
+        self.max_learnts = 20000
+        self.stats = {"solves": 0, "conflicts": 0, "decisions": 0, "propagations": 0,
+                      "learnts": 0, "solve_time": 0.0}
+
+    # --- Variáveis e valores ---
+    def new_var(self):
+        """Cria uma variável nova e devolve seu número (>= 1)."""
+        self.num_vars += 1
+        v = self.num_vars
+        self._lval += [UNASSIGNED, UNASSIGNED]
+        self._level.append(0)
+        self._reason.append(None)
+        self._activity.append(0.0)
+        self._phase.append(FALSE)
+        self._seen.append(False)
+        self._watches += [[], []]
+        self._card_lits += [[], []]
+        self._card_guards += [[], []]
+        heapq.heappush(self._order, (0.0, v))
+        return v
+
+    def value(self, lit):
+        """Valor atual do literal (TRUE, FALSE ou UNASSIGNED)."""
+        return self._lval[_idx(lit)]
+
+    def set_phase(self, lit):
+        """Prefere o valor que torna lit verdadeiro na próxima decisão sobre sua variável."""
+        self._phase[abs(lit)] = TRUE if lit > 0 else FALSE
+
+    def model_value(self, lit):
+        """Valor do literal no último modelo encontrado por solve()."""
+        return self.model[_idx(lit)] == TRUE
+
+    def _decision_level(self):
+        return len(self._trail_lim)
+
+    def _assign(self, lit, reason):
+        v = abs(lit)
+        self._lval[_idx(lit)] = TRUE
+        self._lval[_idx(-lit)] = FALSE
+        self._level[v] = len(self._trail_lim)
+        self._reason[v] = reason
+        self._trail.append(lit)
+        for c in self._card_lits[_idx(lit)]:
+            c.count += 1
+
+    def _cancel_until(self, level):
+        if len(self._trail_lim) <= level:
+            return
+        lval = self._lval
+        start = self._trail_lim[level]
+        for lit in reversed(self._trail[start:]):
+            v = abs(lit)
+            lval[_idx(lit)] = UNASSIGNED
+            lval[_idx(-lit)] = UNASSIGNED
+            self._reason[v] = None
+            self._phase[v] = TRUE if lit > 0 else FALSE
+            for c in self._card_lits[_idx(lit)]:
+                c.count -= 1
+            heapq.heappush(self._order, (-self._activity[v], v))
+        del self._trail[start:]
+        del self._trail_lim[level:]
+        self._qhead = len(self._trail)
+
+    # --- Restrições ---
+    def add_clause(self, lits):
+        """Adiciona uma cláusula permanente. Devolve False se a base ficou insatisfatível."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        clause = []
+        for lit in lits:
+            val = self.value(lit)
+            if val == TRUE or -lit in clause:
+                return True
+            if val == UNASSIGNED and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(clause)
+            self._clauses.append(clause)
+        return self.ok
+
+    def _attach(self, clause):
+        self._watches[_idx(clause[0])].append(clause)
+        self._watches[_idx(clause[1])].append(clause)
+
+    def add_at_most(self, lits, k, guard=None):
+        """Adiciona "no máximo k de lits são verdadeiros" (só vale se guard for verdadeiro)."""
+        self._cancel_until(0)
+        constraint = _AtMost(list(lits), k, guard)
+        for lit in constraint.lits:
+            self._card_lits[_idx(lit)].append(constraint)
+            if self.value(lit) == TRUE:
+                constraint.count += 1
+        if guard is not None:
+            self._card_guards[_idx(guard)].append(constraint)
+        if (guard is None or self.value(guard) == TRUE) and constraint.count >= constraint.k:
+            self.ok = self.ok and self._check_at_most(constraint) is None and self._propagate() is None
+        return constraint
+
+    def add_at_least(self, lits, k, guard=None):
+        """Adiciona "pelo menos k de lits são verdadeiros" (só vale se guard for verdadeiro)."""
+        return self.add_at_most([-lit for lit in lits], len(lits) - k, guard)
+
+    def retire_guard(self, guard):
+        """Desliga para sempre as restrições guardadas por guard e descarta o que ficou satisfeito."""
+        self._cancel_until(0)
+        for constraint in self._card_guards[_idx(guard)]:
+            for lit in constraint.lits:
+                self._card_lits[_idx(lit)].remove(constraint)
+        self._card_guards[_idx(guard)] = []
+        self.add_clause([-guard])
+        # As cláusulas aprendidas com ¬guard ficaram satisfeitas; limpa de tempos em tempos
+        self._retired += 1
+        if self._retired % 64 == 0:
+            self._simplify()
+
+    def _check_at_most(self, c):
+        """Propaga uma restrição ativa com c.count >= c.k; devolve a cláusula de conflito, se houver."""
+        lval = self._lval
+        true_lits = [lit for lit in c.lits if lval[_idx(lit)] == TRUE]
+        # Os mais recentes primeiro: o conflito precisa envolver o nível de decisão atual
+        true_lits.sort(key=lambda lit: self._level[abs(lit)], reverse=True)
+        explanation = [-lit for lit in true_lits[:c.k + 1]]
+        if c.guard is not None:
+            explanation.append(-c.guard)
+        if c.count > c.k:
+            return explanation
+        for lit in c.lits:
+            if lval[_idx(lit)] == UNASSIGNED:
+                self._assign(-lit, [-lit] + explanation)
+                self.stats["propagations"] += 1
+        return None
+
+    # --- Propagação e análise de conflitos ---
+    def _propagate(self):
+        """Propagação unitária; devolve a cláusula em conflito ou None."""
+        lval = self._lval
+        trail = self._trail
+        while self._qhead < len(trail):
+            p = trail[self._qhead]
+            self._qhead += 1
+            false_lit = -p
+            fi = _idx(false_lit)
+            ws = self._watches[fi]
+            self._watches[fi] = kept = []
+            for n, c in enumerate(ws):
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                first = c[0]
+                if lval[_idx(first)] == TRUE:
+                    kept.append(c)
+                    continue
+                for k in range(2, len(c)):
+                    if lval[_idx(c[k])] != FALSE:
+                        c[1], c[k] = c[k], c[1]
+                        self._watches[_idx(c[1])].append(c)
+                        break
+                else:
+                    kept.append(c)
+                    if lval[_idx(first)] == FALSE:
+                        kept.extend(ws[n + 1:])
+                        self._qhead = len(trail)
+                        return c
+                    self._assign(first, c)
+                    self.stats["propagations"] += 1
+
+            pi = _idx(p)
+            for c in self._card_lits[pi]:
+                if c.count >= c.k and (c.guard is None or lval[_idx(c.guard)] == TRUE):
+                    conflict = self._check_at_most(c)
+                    if conflict is not None:
+                        self._qhead = len(trail)
+                        return conflict
+            for c in self._card_guards[pi]:
+                if c.count >= c.k:
+                    conflict = self._check_at_most(c)
+                    if conflict is not None:
+                        self._qhead = len(trail)
+                        return conflict
+        return None
+
+    def _bump(self, v):
+        self._activity[v] += self._var_inc
+        if self._activity[v] > 1e100:
+            self._activity = [a * 1e-100 for a in self._activity]
+            self._var_inc *= 1e-100
+        heapq.heappush(self._order, (-self._activity[v], v))
+
+    def _analyze(self, conflict):
+        """Aprendizado 1-UIP: devolve (cláusula aprendida, nível para retroceder)."""
+        seen = self._seen
+        level = self._level
+        current = self._decision_level()
+        learnt = [0]
+        counter = 0
+        p = 0
+        i = len(self._trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                v = abs(q)
+                if v == abs(p) or seen[v] or level[v] == 0:
+                    continue
+                seen[v] = True
+                self._bump(v)
+                if level[v] >= current:
+                    counter += 1
+                else:
+                    learnt.append(q)
+            while not seen[abs(self._trail[i])]:
+                i -= 1
+            p = self._trail[i]
+            i -= 1
+            seen[abs(p)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self._reason[abs(p)]
+        learnt[0] = -p
+        for q in learnt[1:]:
+            seen[abs(q)] = False
+
+        if len(learnt) == 1:
+            return learnt, 0
+        best = max(range(1, len(learnt)), key=lambda j: level[abs(learnt[j])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    def _pick_branch(self):
+        order = self._order
+        lval = self._lval
+        while order:
+            _, v = heapq.heappop(order)
+            if lval[2 * v] == UNASSIGNED:
+                return v
+        for v in range(1, self.num_vars + 1): # fila vazia por descarte de entradas antigas
+            if lval[2 * v] == UNASSIGNED:
+                return v
+        return None
+
+    def _simplify(self):
+        """Remove (no nível 0) as cláusulas já satisfeitas e reconstrói os literais observados."""
+        lval = self._lval
+        self._clauses = [c for c in self._clauses if not any(lval[_idx(lit)] == TRUE for lit in c)]
+        self._learnts = [c for c in self._learnts if not any(lval[_idx(lit)] == TRUE for lit in c)]
+        self._rebuild_watches()
+
+    def _reduce_learnts(self):
+        """Descarta a metade mais antiga das cláusulas aprendidas (sempre no nível 0)."""
+        self._learnts = self._learnts[len(self._learnts) // 2:]
+        self._rebuild_watches()
+
+    def _rebuild_watches(self):
+        lval = self._lval
+        self._watches = [[] for _ in self._watches]
+        for c in self._clauses + self._learnts:
+            # Observa dois literais não falsos (no nível 0 nenhuma cláusula guardada está falsa)
+            c.sort(key=lambda lit: lval[_idx(lit)] == FALSE)
+            self._attach(c)
+
+    # --- Busca ---
+    def solve(self, assumptions=()):
+        """Procura um modelo que satisfaça a base e as suposições. Devolve True/False."""
+        start = time.perf_counter()
+        self.stats["solves"] += 1
+        try:
+            return self._search(list(assumptions))
+        finally:
+            self._cancel_until(0)
+            self.stats["solve_time"] += time.perf_counter() - start
+
+    def _search(self, assumptions):
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        if len(self._learnts) > self.max_learnts:
+            self._reduce_learnts()
+        if len(self._order) > 4 * self.num_vars + 64:
+            # Descarta entradas repetidas acumuladas na fila de decisão
+            self._order = [(-self._activity[v], v) for v in range(1, self.num_vars + 1)]
+            heapq.heapify(self._order)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.stats["conflicts"] += 1
+                if self._decision_level() == 0:
+                    self.ok = False
+                    return False
+                learnt, back_level = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self._learnts.append(learnt)
+                    self.stats["learnts"] += 1
+                    self._assign(learnt[0], learnt)
+                self._var_inc *= 1.05
+                continue
+
+            level = self._decision_level()
+            if level < len(assumptions):
+                lit = assumptions[level]
+                val = self.value(lit)
+                self._trail_lim.append(len(self._trail))
+                if val == FALSE:
+                    return False
+                if val == UNASSIGNED:
+                    self._assign(lit, None)
+                continue
+
+            v = self._pick_branch()
+            if v is None:
+                self.model = list(self._lval)
+                return True
+            self.stats["decisions"] += 1
+            self._trail_lim.append(len(self._trail))
+            self._assign(v if self._phase[v] == TRUE else -v, None)
+
+
+class SatInference:
+    """Motor de inferência por SAT: classifica células só a partir das percepções.
+
+    Recebe apenas a geometria da grade e as quantidades de buracos e Wumpus
+    (parâmetros públicos do jogo), nunca as posições reais dos perigos.
+
+    Os modelos encontrados são guardados (só as variáveis de perigo verdadeiras)
+    e reaproveitados nos passos seguintes enquanto continuarem satisfazendo as
+    cláusulas novas: eles já servem de testemunha de que uma célula pode ter ou
+    não ter perigo, e o resolvedor só é chamado para as células sem testemunha,
+    em geral as vizinhas da última observação. Só ficam guardados os modelos
+    que ainda são a testemunha de alguma célula não classificada.
+    """
+
+    def __init__(self, grid_size, num_holes, num_wumpus, get_adjacent):
+        self.grid_size = grid_size
+        self.num_holes = num_holes
+        self.num_wumpus = num_wumpus
+        self.get_adjacent = get_adjacent
+        self.solver = SatSolver()
+        self.pit_var = {}
+        self.wumpus_var = {}
+        self.visited = set()
+        self.safe = set()
+        self.danger = set()
+        self._guard = None
+        self._models = []
+        self.step_times = []
+
+    @property
+    def stats(self):
+        """Estatísticas do resolvedor e tempos de inferência por passo."""
+        stats = dict(self.solver.stats)
+        stats["steps"] = len(self.step_times)
+        stats["step_time"] = sum(self.step_times)
+        stats["max_step_time"] = max(self.step_times, default=0.0)
+        return stats
+
+    def _cell_vars(self, cell):
+        """Cria (se preciso) as variáveis P e W da célula."""
+        if cell not in self.pit_var:
+            p, w = self.solver.new_var(), self.solver.new_var()
+            self.pit_var[cell], self.wumpus_var[cell] = p, w
+            self.solver.add_clause([-p, -w]) # Buraco e Wumpus nunca na mesma célula
+        return self.pit_var[cell], self.wumpus_var[cell]
+
+    def observe(self, cell, percept):
+        """Registra a percepção de uma célula visitada e devolve (novas seguras, novas perigosas)."""
+        start = time.perf_counter()
+        fedor, vento, _ = percept
+        self.visited.add(cell)
+        self.safe.add(cell)
+
+        p, w = self._cell_vars(cell)
+        clauses = [[-p], [-w]]
+        neighbors = self.get_adjacent(cell[0], cell[1])
+        pits = [self._cell_vars(n)[0] for n in neighbors]
+        wumpuses = [self._cell_vars(n)[1] for n in neighbors]
+        clauses += [pits] if vento else [[-lit] for lit in pits]
+        clauses += [wumpuses] if fedor else [[-lit] for lit in wumpuses]
+        for clause in clauses:
+            self.solver.add_clause(clause)
+
+        new_safe, new_danger = self._classify(clauses)
+        self.step_times.append(time.perf_counter() - start)
+        return new_safe, new_danger
+
+    def _cardinality(self):
+        """Ativa as restrições de quantidade deste passo sob um novo literal de guarda."""
+        solver = self.solver
+        if self._guard is not None:
+            solver.retire_guard(self._guard)
+        guard = self._guard = solver.new_var()
+        # Células seguras já têm ¬P e ¬W fixos e não contam para os limites
+        live = [c for c in self.pit_var if c not in self.safe]
+        pits = [self.pit_var[c] for c in live]
+        wumpuses = [self.wumpus_var[c] for c in live]
+        # Células sem variáveis: comportam qualquer número de perigos até o seu tamanho
+        rest = self.grid_size * self.grid_size - len(self.pit_var)
+        if len(pits) > self.num_holes:
+            solver.add_at_most(pits, self.num_holes, guard)
+        if len(wumpuses) > self.num_wumpus:
+            solver.add_at_most(wumpuses, self.num_wumpus, guard)
+        if self.num_holes + self.num_wumpus - rest > 0:
+            solver.add_at_least(pits + wumpuses, self.num_holes + self.num_wumpus - rest, guard)
+        return guard, live, pits + wumpuses, rest
+
+    def _solve_with(self, guard, add_constraint, lits, k):
+        """Resolve com uma restrição de cardinalidade temporária; devolve True se satisfatível."""
+        probe = self.solver.new_var()
+        add_constraint(lits, k, probe)
+        satisfiable = self.solver.solve([guard, probe])
+        self.solver.retire_guard(probe)
+        return satisfiable
+
+    def _still_valid(self, model, clauses, min_hazards):
+        """Indica se um modelo guardado (variáveis de perigo verdadeiras) satisfaz as cláusulas novas."""
+        if len(model) < min_hazards:
+            return False
+        for clause in clauses:
+            if not any((lit in model) if lit > 0 else (-lit not in model) for lit in clause):
+                return False
+        return True
+
+    def _keep_witnesses(self, cells, hazard_cell):
+        """Descarta os modelos que não são a primeira testemunha (com e sem perigo) de nenhuma célula."""
+        model_cells = [{hazard_cell[v] for v in m if v in hazard_cell} for m in self._models]
+        keep = set()
+        first_hazard = {}
+        for i, hazards in enumerate(model_cells):
+            for c in hazards:
+                first_hazard.setdefault(c, i)
+        for c in cells:
+            if c in first_hazard:
+                keep.add(first_hazard[c])
+            keep.add(next(i for i, hazards in enumerate(model_cells) if c not in hazards))
+        self._models = [m for i, m in enumerate(self._models) if i in keep]
+
+    def _classify(self, new_clauses):
+        """Decide, para cada célula da fronteira ainda não classificada, se ela é segura ou perigosa."""
+        solver = self.solver
+        guard, live, hazard_lits, rest = self._cardinality()
+        total = self.num_holes + self.num_wumpus
+        self._models = [m for m in self._models if self._still_valid(m, new_clauses, total - rest)]
+
+        candidates = [c for c in live if c not in self.danger]
+        hazard_cell = {}
+        for c in candidates:
+            hazard_cell[self.pit_var[c]] = hazard_cell[self.wumpus_var[c]] = c
+        maybe_hazard, always_hazard = set(), None
+
+        def record(model):
+            nonlocal always_hazard
+            cells = {hazard_cell[v] for v in model if v in hazard_cell}
+            maybe_hazard.update(cells)
+            always_hazard = cells if always_hazard is None else always_hazard & cells
+
+        def solve(assumptions):
+            if not solver.solve(assumptions):
+                return False
+            model = frozenset(v for v in hazard_lits if solver.model_value(v))
+            self._models.append(model)
+            record(model)
+            return True
+
+        for model in self._models:
+            record(model)
+        # Um modelo que prefere perigo nas células ainda sem testemunha de perigo, e depois um
+        # que prefere ausência de perigo em todas, cobrem a maioria das células de uma vez
+        lacking = [c for c in candidates if c not in maybe_hazard]
+        for c in lacking:
+            solver.set_phase(self.pit_var[c])
+            solver.set_phase(self.wumpus_var[c])
+        if (lacking or not self._models) and not solve([guard]):
+            return [], [] # Percepções inconsistentes com o modelo do jogo
+        for c in candidates:
+            solver.set_phase(-self.pit_var[c])
+            solver.set_phase(-self.wumpus_var[c])
+        if always_hazard and not solve([guard]):
+            return [], []
+
+        new_safe, new_danger = [], []
+        for c in candidates:
+            p, w = self.pit_var[c], self.wumpus_var[c]
+            if c not in maybe_hazard:
+                if not (solve([guard, p]) or solve([guard, w])):
+                    solver.add_clause([-p])
+                    solver.add_clause([-w])
+                    new_safe.append(c)
+                    continue
+            if c in always_hazard:
+                if not solve([guard, -p, -w]):
+                    solver.add_clause([p, w])
+                    new_danger.append(c)
+        classified = set(new_safe) | set(new_danger)
+        self._keep_witnesses([c for c in candidates if c not in classified], hazard_cell)
+
+        # Células longe da fronteira: todas seguras se a fronteira já precisa conter todos os perigos,
+        # todas perigosas se a fronteira não comporta nenhum perigo a mais.
+        # (Os modelos guardados já descartam os dois casos na maior parte dos passos.)
+        if rest:
+            all_found = all_hazards = False
+            if all(len(m) >= total for m in self._models):
+                all_found = not self._solve_with(guard, solver.add_at_most, hazard_lits, total - 1)
+            if all(len(m) < total - rest + 1 for m in self._models):
+                all_hazards = not self._solve_with(guard, solver.add_at_least, hazard_lits, total - rest + 1)
+            if all_found or all_hazards:
+                far_cells = [(x, y) for x in range(self.grid_size) for y in range(self.grid_size)
+                             if (x, y) not in self.pit_var]
+                if all_hazards:
+                    self._models = [] # Os modelos guardados deixam essas células sem perigo
+                for c in far_cells:
+                    p, w = self._cell_vars(c)
+                    if all_found:
+                        solver.add_clause([-p])
+                        solver.add_clause([-w])
+                        new_safe.append(c)
+                    else:
+                        solver.add_clause([p, w])
+                        new_danger.append(c)
+
+        self.safe.update(new_safe)
+        self.danger.update(new_danger)
+        return new_safe, new_danger
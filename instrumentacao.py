@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação do agente: contadores por regra, cronômetros e ganchos de eventos.
+
+Um agente criado com instrumentation=Instrumentation() mede, sem nenhum
+print (o mundo mede a geração do mapa):
+- por regra de inferência (RULES): quantas vezes foi avaliada, quantas
+  vezes produziu alguma inferência, quantas células marcou (seguras ou
+  perigosas) e o tempo gasto nela;
+- cronômetros (TIMERS) da jogada inteira, da inferência (logical_update),
+  do planejamento (a escolha do próximo movimento) e da geração do mapa,
+  cada um com um histograma de latências.
+Os contadores e os histogramas são exportáveis em JSON ou CSV.
+
+Sem instrumentação (o padrão) o custo é só um teste de None por jogada e
+por chamada de _apply_rules. Ganchos (EventHook) recebem os mesmos eventos
+e as mensagens de depuração, por exemplo para enviá-las a outro lugar em
+vez do terminal.
+
+Uso:
+    probe = Instrumentation()
+    agent = agente.new_agent(seed=0, instrumentation=probe)
+    ...
+    print(probe.report())
+    probe.export_json("perfil.json")   # ou export_csv("perfil.csv")
+"""
+
+import csv
+import json
+import math
+import time
+
+from grade import DANGER, SAFE
+
+# Regras de inferência, na ordem em que _apply_rules as aplica ("sat" e "belief": os motores
+# SatInference e HazardBelief)
+RULES = ("1", "2", "2.5", "esgotados", "4", "sat", "belief")
+# Cronômetros: a jogada inteira e as suas partes, e a geração do mapa em reset()
+TIMERS = ("jogada", "inferencia", "planejamento", "geracao_mapa")
+
+# Faixas do histograma por oitava de tempo (cada faixa cobre um fator 2 ** (1 / BUCKETS_PER_OCTAVE))
+BUCKETS_PER_OCTAVE = 4
+
+_log2 = math.log2
+
+
+class LatencyHistogram:
+    """Histograma de latências em faixas logarítmicas (erro relativo < 19% por faixa)."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        """Registra uma medida (em segundos)."""
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        # Faixa k: [2 ** (k / B), 2 ** ((k + 1) / B)) nanossegundos
+        k = int(_log2(seconds * 1e9) * BUCKETS_PER_OCTAVE) if seconds > 1e-9 else 0
+        buckets = self.buckets
+        buckets[k] = buckets.get(k, 0) + 1
+
+    @staticmethod
+    def bucket_bounds(k):
+        """Limites (em segundos) da faixa k."""
+        return 2 ** (k / BUCKETS_PER_OCTAVE) * 1e-9, 2 ** ((k + 1) / BUCKETS_PER_OCTAVE) * 1e-9
+
+    def percentile(self, q):
+        """Limite superior da faixa que contém o percentil q (0 a 100), limitado ao máximo medido."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen >= rank:
+                return min(self.bucket_bounds(k)[1], self.max)
+        return self.max
+
+    def merge(self, other):
+        """Soma as medidas de outro histograma a este (por exemplo, de outro processo)."""
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for k, count in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + count
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def rows(self):
+        """Faixas não vazias, em ordem: (início, fim, quantidade), em segundos."""
+        return [(*self.bucket_bounds(k), self.buckets[k]) for k in sorted(self.buckets)]
+
+    def summary(self):
+        return {"count": self.count, "total": self.total, "mean": self.mean(),
+                "min": self.min if self.count else 0.0, "max": self.max,
+                "p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99)}
+
+
+class EventHook:
+    """Interface dos ganchos de Instrumentation: sobrescreva só os eventos de interesse."""
+
+    def on_rule(self, agent, rule, inferences, elapsed):
+        """Uma regra foi avaliada e marcou inferences células (seguras ou perigosas)."""
+
+    def on_timer(self, agent, timer, elapsed):
+        """Um trecho cronometrado (ver TIMERS) terminou (em "geracao_mapa", agent é o mundo que gerou o mapa)."""
+
+    def on_message(self, agent, message):
+        """Uma mensagem de depuração (as mesmas mostradas com verbose=True)."""
+
+
+class PrintHook(EventHook):
+    """Mostra as mensagens de depuração no terminal, como verbose=True."""
+
+    def on_message(self, agent, message):
+        print(message)
+
+
+class Instrumentation:
+    """Contadores por regra, cronômetros com histogramas e ganchos de eventos de um ou mais agentes.
+
+    Os contadores ficam em rules[regra] = {"runs", "fired", "inferences", "time"};
+    os cronômetros em timers[nome] (LatencyHistogram).
+    """
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self.clock = time.perf_counter
+        self.rules = {}
+        self.timers = {}
+        self.clear()
+
+    def clear(self):
+        """Zera contadores e histogramas (os ganchos continuam)."""
+        self.rules = {name: {"runs": 0, "fired": 0, "inferences": 0, "time": 0.0} for name in RULES}
+        self.timers = {name: LatencyHistogram() for name in TIMERS}
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    # --- Chamadas feitas pelo agente (e pelo mundo, em geracao_mapa) ---
+    def run_rule(self, agent, rule, function, *args):
+        """Executa uma regra de inferência (function(*args)), contando as células que ela marcou."""
+        counts = agent._cells.counts
+        before = counts[SAFE] + counts[DANGER]
+        clock = self.clock
+        start = clock()
+        result = function(*args)
+        elapsed = clock() - start
+        inferences = counts[SAFE] + counts[DANGER] - before
+        stats = self.rules[rule]
+        stats["runs"] += 1
+        stats["time"] += elapsed
+        if inferences:
+            stats["fired"] += 1
+            stats["inferences"] += inferences
+        if self.hooks:
+            for hook in self.hooks:
+                hook.on_rule(agent, rule, inferences, elapsed)
+        return result
+
+    def record(self, source, timer, elapsed):
+        """Registra um trecho cronometrado (source: o agente, ou o mundo em geracao_mapa)."""
+        self.timers[timer].add(elapsed)
+        if self.hooks:
+            for hook in self.hooks:
+                hook.on_timer(source, timer, elapsed)
+
+    def run_step(self, agent):
+        """Executa o corpo de InferenceAgent.step(), cronometrando inferência e planejamento."""
+        clock = self.clock
+        start = clock()
+        agent.logical_update()
+        middle = clock()
+        agent._move()
+        end = clock()
+        timers = self.timers
+        timers["inferencia"].add(middle - start)
+        timers["planejamento"].add(end - middle)
+        timers["jogada"].add(end - start)
+        if self.hooks:
+            for hook in self.hooks:
+                hook.on_timer(agent, "inferencia", middle - start)
+                hook.on_timer(agent, "planejamento", end - middle)
+                hook.on_timer(agent, "jogada", end - start)
+
+    def message(self, agent, message):
+        for hook in self.hooks:
+            hook.on_message(agent, message)
+
+    # --- Relatórios ---
+    def to_dict(self):
+        """Contadores e histogramas em tipos simples (o formato de export_json)."""
+        return {
+            "rules": {name: dict(stats) for name, stats in self.rules.items()},
+            "timers": {name: dict(histogram.summary(), buckets=histogram.rows())
+                       for name, histogram in self.timers.items()},
+        }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def export_csv(self, path):
+        """Uma tabela com os contadores por regra e as faixas dos histogramas, separados pela coluna kind.
+
+        kind "rule": uma linha por regra, com runs, fired, inferences e time_us;
+        kind "timer": uma linha por faixa de histograma, com o início e o fim da
+        faixa (µs) e a quantidade de medidas. As colunas do outro tipo ficam vazias.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["kind", "name", "runs", "fired", "inferences", "time_us", "start_us", "end_us", "count"])
+            for name, stats in self.rules.items():
+                writer.writerow(["rule", name, stats["runs"], stats["fired"], stats["inferences"],
+                                 f"{stats['time'] * 1e6:.4f}", "", "", ""])
+            for name, histogram in self.timers.items():
+                for start, end, count in histogram.rows():
+                    writer.writerow(["timer", name, "", "", "", "", f"{start * 1e6:.4f}", f"{end * 1e6:.4f}", count])
+
+    def export(self, path):
+        """export_csv se path terminar em .csv, senão export_json."""
+        if path.lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def report(self):
+        """Tabelas de texto com os contadores por regra e os cronômetros."""
+        lines = [f"{'regra':>10} {'avaliações':>11} {'produtivas':>11} {'inferências':>12} {'tempo (ms)':>11} "
+                 f"{'µs/avaliação':>13}"]
+        for name, stats in self.rules.items():
+            if not stats["runs"]:
+                continue
+            lines.append(f"{name:>10} {stats['runs']:>11} {stats['fired']:>11} {stats['inferences']:>12} "
+                         f"{stats['time'] * 1e3:>11.2f} {stats['time'] / stats['runs'] * 1e6:>13.2f}")
+        lines.append("")
+        lines.append(f"{'cronômetro':>12} {'medidas':>9} {'média (µs)':>11} {'p50 (µs)':>9} {'p99 (µs)':>9} "
+                     f"{'máx (µs)':>10}")
+        for name, histogram in self.timers.items():
+            if not histogram.count:
+                continue
+            lines.append(f"{name:>12} {histogram.count:>9} {histogram.mean() * 1e6:>11.2f} "
+                         f"{histogram.percentile(50) * 1e6:>9.2f} {histogram.percentile(99) * 1e6:>9.2f} "
+                         f"{histogram.max * 1e6:>10.2f}")
+        return "\n".join(lines)
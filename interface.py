@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+"""
+Interface gráfica (Pygame) do Mundo do Wumpus.
+
+Desenha o mundo com câmera (rolagem e zoom) e joga com os botões, o
+teclado ou sozinho (--auto). O Pygame só é importado, e a janela e as
+fontes só são criadas, quando main() (ou init_display()) roda: importar
+este módulo não abre nada.
+
+Uso:
+    python interface.py
+    python interface.py --grade 64 --buracos 400 --probabilistico --auto 50
+"""
+
+import sys
+import math
+import argparse
+
+from agente import INFERENCE_MODES, new_agent
+from grade import DANGER, SAFE, VISITED, changed_ids
+from mundo import GRID_SIZE
+
+# --- Configurações do Jogo ---
+TILE_SIZE = 120
+WIDTH, HEIGHT = TILE_SIZE * GRID_SIZE, TILE_SIZE * GRID_SIZE + 100
+FPS = 30
+
+# --- Cores ---
+GRAY = (180, 180, 180)    # Célula Desconhecida
+GREEN = (0, 200, 0)      # Célula Segura
+RED = (200, 0, 0)        # Célula Perigosa
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)  # Célula Já Visitada
+BROWN = (139, 69, 19)
+GOLD = (255, 215, 0)     # Cor do Ouro
+BLUE = (0, 0, 200)
+
+# --- Inicialização do Pygame ---
+# O Pygame só é carregado por main() (ou init_display()), nunca na importação.
+pygame = None
+screen = None
+font = status_font = icon_font = danger_font = None
+
+def init_display():
+    """Importa o Pygame, cria a janela e carrega as fontes usadas no desenho."""
+    global pygame, screen, font, status_font, icon_font, danger_font
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Mundo do Wumpus - Lógica Proposicional")
+    font = pygame.font.SysFont("Arial", 24)
+    status_font = pygame.font.SysFont("Arial", 28, bold=True)
+    icon_font = pygame.font.SysFont("Arial", 48)
+    danger_font = pygame.font.SysFont("Arial", 80, bold=True)
+
+# --- Funções de Desenho ---
+class Renderer:
+    """Desenha o mundo em uma janela com câmera (rolagem e zoom), redesenhando só o que mudou.
+
+    A câmera mostra a região da grade que cabe na área de visualização
+    (por padrão, a tela menos a faixa de botões): origin é a célula (em
+    coordenadas fracionárias) no canto superior esquerdo e scale quantos
+    pixels cada célula ocupa. Só as células visíveis são desenhadas.
+
+    Com células de pelo menos MIN_TILE pixels, cada aparência de célula
+    (cor, ouro, perigo, percepções) é desenhada uma única vez em um atlas
+    para o tamanho atual, e as células são copiadas dele em lote com
+    Surface.blits(). Entre quadros com a mesma câmera, só as células cujas
+    flags mudaram (e as do agente) são redesenhadas. Com zoom menor, a
+    grade vira uma superfície de um pixel por célula, montada direto do
+    bytearray de flags e ampliada para a área visível.
+
+    draw() devolve os retângulos alterados para pygame.display.update();
+    sem mudanças, não desenha nada e devolve uma lista vazia.
+    """
+
+    MIN_TILE = 6         # Abaixo disso (pixels por célula), desenha um pixel por célula
+    MIN_GLYPH_TILE = 24  # Abaixo disso, sem letras: só marcas coloridas
+    MAX_TILE = 240
+    ATLAS_COLUMNS = 16
+
+    # Bits extras do modo de um pixel por célula (os 4 bits baixos são as flags de grade.py)
+    _WUMPUS_BIT, _HOLE_BIT, _GOLD_BIT = 16, 32, 64
+
+    def __init__(self, surface, tile_size=TILE_SIZE, view=None):
+        self.surface = surface
+        if view is None:
+            width, height = surface.get_size()
+            view = pygame.Rect(0, 0, width, height - 100)
+        self.view = pygame.Rect(view)
+        self.origin = [0.0, 0.0]
+        self.scale = float(tile_size)
+        self._status = {}    # (texto, cor) -> superfície do texto de status
+        self._atlas = None   # Atlas do tamanho de célula atual: (tamanho, superfície, {aparência: área})
+        self._ui_background = self._render_ui_background()
+        self._palette = self._pixel_palette()
+        self.invalidate()
+
+    # --- Câmera ---
+
+    def invalidate(self):
+        """Força o próximo draw() a redesenhar a tela inteira (ex.: janela exposta de novo)."""
+        self._world = None
+        self._flags = None
+        self._agent = None
+        self._camera = None
+        self._status_key = None
+
+    def fit(self, grid_size):
+        """Ajusta o zoom para a grade inteira caber na área de visualização."""
+        self.scale = max(min(self.view.width, self.view.height) / grid_size, 1e-3)
+        if self.scale >= self.MIN_TILE:
+            self.scale = float(math.floor(self.scale))
+        self.origin = [0.0, 0.0]
+
+    def pan(self, dx, dy):
+        """Move a câmera dx, dy pixels da tela."""
+        self.origin[0] += dx / self.scale
+        self.origin[1] += dy / self.scale
+
+    def zoom(self, factor, anchor=None):
+        """Multiplica o zoom por factor mantendo fixo o ponto anchor da tela (padrão: centro da vista)."""
+        ax, ay = anchor if anchor is not None else self.view.center
+        cx = self.origin[0] + (ax - self.view.left) / self.scale
+        cy = self.origin[1] + (ay - self.view.top) / self.scale
+        self.scale = min(max(self.scale * factor, 0.05), self.MAX_TILE)
+        if self.scale >= self.MIN_TILE:
+            self.scale = float(round(self.scale))  # Células inteiras: sem frestas entre elas
+        self.origin = [cx - (ax - self.view.left) / self.scale, cy - (ay - self.view.top) / self.scale]
+
+    def center_on(self, cell):
+        """Centraliza a câmera na célula."""
+        self.origin = [cell[0] + 0.5 - self.view.width / (2 * self.scale),
+                       cell[1] + 0.5 - self.view.height / (2 * self.scale)]
+
+    def is_visible(self, cell, margin=0):
+        """Indica se a célula está dentro da vista (com margin células de folga nas bordas)."""
+        x0, y0, x1, y1 = self._visible_range(10 ** 9)
+        return x0 + margin <= cell[0] < x1 - margin and y0 + margin <= cell[1] < y1 - margin
+
+    def _visible_range(self, n):
+        """Intervalo [x0, x1) x [y0, y1) de células visíveis."""
+        ox, oy = self.origin
+        x0, y0 = max(0, math.floor(ox)), max(0, math.floor(oy))
+        x1 = min(n, math.ceil(ox + self.view.width / self.scale))
+        y1 = min(n, math.ceil(oy + self.view.height / self.scale))
+        return x0, y0, x1, y1
+
+    def _screen_pos(self, x, y):
+        return (self.view.left + round((x - self.origin[0]) * self.scale),
+                self.view.top + round((y - self.origin[1]) * self.scale))
+
+    # --- Superfícies em cache ---
+
+    def _render_ui_background(self):
+        """Faixa inferior com os três botões e seus rótulos (estática)."""
+        ui = pygame.Surface((WIDTH, 100))
+        ui.fill(BLACK)
+        back_btn = pygame.Rect(10, 15, 160, 50)
+        next_btn = pygame.Rect(WIDTH - 170, 15, 160, 50)
+        reset_btn = pygame.Rect(WIDTH // 2 - 80, 10, 160, 60)
+        pygame.draw.rect(ui, GRAY, back_btn, border_radius=10)
+        pygame.draw.rect(ui, GRAY, next_btn, border_radius=10)
+        pygame.draw.rect(ui, (200, 50, 50), reset_btn, border_radius=10)
+        ui.blit(font.render("← Voltar", True, BLACK), (back_btn.centerx - 40, back_btn.centery - 12))
+        ui.blit(font.render("Próximo →", True, BLACK), (next_btn.centerx - 45, next_btn.centery - 12))
+        ui.blit(font.render("Reiniciar", True, WHITE), (reset_btn.centerx - 45, reset_btn.centery - 12))
+        return ui
+
+    def _glyphs(self, size):
+        """Letras e ícones para células de size pixels (fontes proporcionais às de TILE_SIZE)."""
+        if size == TILE_SIZE:
+            big, icon = danger_font, icon_font
+        else:
+            big = pygame.font.SysFont("Arial", max(1, size * 80 // TILE_SIZE), bold=True)
+            icon = pygame.font.SysFont("Arial", max(1, size * 48 // TILE_SIZE))
+        return {
+            "G": big.render("G", True, GOLD),
+            "W": big.render("W", True, (150, 0, 0)),
+            "B": big.render("B", True, BLACK),
+            "F": icon.render("F", True, BLACK),
+            "V": icon.render("V", True, BLUE),
+        }
+
+    def _draw_tile(self, target, rect, key, glyphs):
+        """Desenha uma célula com a aparência key no retângulo rect de target."""
+        color, gold, hazard, percepts = key
+        size = rect.width
+        target.fill(color, rect)
+
+        # MOSTRA A LOCALIZAÇÃO REAL DOS ITENS (APENAS PARA O USUÁRIO)
+        if glyphs is None:
+            mark = rect.inflate(-size // 2, -size // 2)
+            if gold: target.fill(GOLD, mark)
+            if hazard: target.fill((150, 0, 0) if hazard == "W" else BLACK, mark.inflate(-size // 8, -size // 8))
+        else:
+            if gold:
+                target.blit(glyphs["G"], glyphs["G"].get_rect(center=rect.center))
+            if hazard:
+                target.blit(glyphs[hazard], glyphs[hazard].get_rect(center=rect.center))
+
+        pygame.draw.rect(target, BLACK, rect, max(1, size // 60))
+
+        # Percepções das células visitadas
+        if percepts and glyphs is not None:
+            fedor, vento, brilho = percepts
+            if fedor: target.blit(glyphs["F"], (rect.left + size * 5 // TILE_SIZE, rect.top))
+            if vento: target.blit(glyphs["V"], (rect.right - size * 35 // TILE_SIZE, rect.top))
+            if brilho:
+                inset = size * 5 // TILE_SIZE
+                pygame.draw.polygon(target, GOLD, [(rect.centerx, rect.top + inset), (rect.right - inset, rect.centery),
+                                                   (rect.centerx, rect.bottom - inset), (rect.left + inset, rect.centery)])
+
+    def _atlas_area(self, size, key):
+        """Área do atlas com a célula de aparência key no tamanho size (desenhada na primeira vez)."""
+        if self._atlas is None or self._atlas[0] != size:
+            glyphs = self._glyphs(size) if size >= self.MIN_GLYPH_TILE else None
+            self._atlas = (size, pygame.Surface((size * self.ATLAS_COLUMNS, size * 4)), {}, glyphs)
+        _, atlas, areas, glyphs = self._atlas
+        area = areas.get(key)
+        if area is None:
+            slot = len(areas)
+            row, column = divmod(slot, self.ATLAS_COLUMNS)
+            if (row + 1) * size > atlas.get_height():
+                # Atlas cheio: dobra a altura e copia o que já estava desenhado
+                bigger = pygame.Surface((atlas.get_width(), atlas.get_height() * 2))
+                bigger.blit(atlas, (0, 0))
+                atlas = bigger
+                self._atlas = (size, atlas, areas, glyphs)
+            area = areas[key] = pygame.Rect(column * size, row * size, size, size)
+            self._draw_tile(atlas, area, key, glyphs)
+        return atlas, area
+
+    def _tile_key(self, agent, cell, flags):
+        if flags & VISITED: color = WHITE
+        elif flags & SAFE: color = GREEN
+        elif flags & DANGER: color = RED
+        else: color = GRAY # Padrão: Desconhecido
+        return color, cell == agent.world.gold, self._hazards.get(cell), agent.knowledge_base.get(cell)
+
+    def _pixel_palette(self):
+        """Paleta do modo de um pixel por célula, indexada por flags | bits do mapa."""
+        palette = []
+        for index in range(256):
+            if index & self._GOLD_BIT: color = GOLD
+            elif index & self._WUMPUS_BIT: color = (150, 0, 0)
+            elif index & self._HOLE_BIT: color = BLACK
+            elif index & VISITED: color = WHITE
+            elif index & SAFE: color = GREEN
+            elif index & DANGER: color = RED
+            else: color = GRAY
+            palette.append(color)
+        return palette
+
+    def _map_bits(self, agent):
+        """Wumpus, buracos e ouro como bits por célula, já transpostos (linha y, coluna x)."""
+        n = agent.GRID_SIZE
+        bits = bytearray(n * n)
+        for mark, cells in ((self._WUMPUS_BIT, agent.world.wumpuses), (self._HOLE_BIT, agent.world.holes),
+                            (self._GOLD_BIT, (agent.world.gold,))):
+            for x, y in cells:
+                bits[y * n + x] |= mark
+        return int.from_bytes(bits, "big")
+
+    def _pixel_surface(self, agent):
+        """Superfície N x N (um pixel por célula) montada a partir das flags das células."""
+        n = agent.GRID_SIZE
+        flags = agent._cells.flags
+        # As flags são indexadas por x * n + y; a imagem é linha a linha (y * n + x)
+        transposed = b"".join(flags[y::n] for y in range(n))
+        pixels = (int.from_bytes(transposed, "big") | self._map_value).to_bytes(n * n, "big")
+        surf = pygame.image.frombuffer(pixels, (n, n), "P")
+        surf.set_palette(self._palette)
+        return surf
+
+    # --- Desenho ---
+
+    def draw(self, agent):
+        """Redesenha o que mudou e devolve a lista de retângulos alterados."""
+        n = agent.GRID_SIZE
+        flags = agent._cells.flags
+        camera = (tuple(self.origin), self.scale)
+        full = agent.world is not self._world or camera != self._camera
+        rects = []
+
+        if agent.world is not self._world:
+            # Mundo novo (ou reset()): redesenha tudo. back() e os retratos só mudam células
+            self.surface.fill(BROWN)
+            self._status_key = None
+            rects.append(self.surface.get_rect())
+            self._map_value = self._map_bits(agent)
+            # Perigos por célula (as listas do mundo podem ser longas em grades grandes)
+            self._hazards = dict.fromkeys(agent.world.holes, "B")
+            self._hazards.update(dict.fromkeys(agent.world.wumpuses, "W"))
+        changed = full or flags != self._flags or agent.agent_pos != self._agent
+
+        self.surface.set_clip(self.view)
+        try:
+            if self.scale < self.MIN_TILE:
+                if changed:
+                    self._draw_pixels(agent, n)
+                    rects.append(self.view)
+            elif full:
+                self.surface.fill(BROWN, self.view)
+                x0, y0, x1, y1 = self._visible_range(n)
+                self._draw_tiles(agent, [x * n + y for x in range(x0, x1) for y in range(y0, y1)], n)
+                rects.append(self.view)
+            elif changed:
+                dirty = set(changed_ids(self._flags, flags, n)) if flags != self._flags else set()
+                for pos in (self._agent, agent.agent_pos):
+                    if 0 <= pos[0] < n and 0 <= pos[1] < n:
+                        dirty.add(pos[0] * n + pos[1])
+                rects.extend(self._draw_tiles(agent, dirty, n, visible_only=True))
+        finally:
+            self.surface.set_clip(None)
+
+        self._world = agent.world
+        self._camera = camera
+        self._flags = bytes(flags)
+        self._agent = agent.agent_pos
+
+        ui_rect = self.draw_ui(agent)
+        if ui_rect is not None:
+            rects.append(ui_rect)
+        return rects
+
+    def _draw_tiles(self, agent, ids, n, visible_only=False):
+        """Copia do atlas, em lote, as células ids. Devolve os retângulos de tela alterados."""
+        size = max(1, round(self.scale))
+        if visible_only:
+            x0, y0, x1, y1 = self._visible_range(n)
+        flags = agent._cells.flags
+        batch, rects = [], []
+        for i in ids:
+            cell = divmod(i, n)
+            if visible_only and not (x0 <= cell[0] < x1 and y0 <= cell[1] < y1):
+                continue
+            atlas, area = self._atlas_area(size, self._tile_key(agent, cell, flags[i]))
+            topleft = self._screen_pos(*cell)
+            batch.append((atlas, topleft, area))
+            rects.append(pygame.Rect(topleft, (size, size)).clip(self.view))
+        self.surface.blits(batch, doreturn=False)
+
+        # O agente fica por cima da sua célula, que sempre está entre as redesenhadas
+        left, top = self._screen_pos(*agent.agent_pos)
+        pygame.draw.circle(self.surface, BLUE, (left + size // 2, top + size // 2), size // 3)
+        return rects
+
+    def _draw_pixels(self, agent, n):
+        """Modo de um pixel por célula: amplia a parte visível da superfície N x N para a vista."""
+        self.surface.fill(BROWN, self.view)
+        x0, y0, x1, y1 = self._visible_range(n)
+        if x1 > x0 and y1 > y0:
+            visible = self._pixel_surface(agent).subsurface(pygame.Rect(x0, y0, x1 - x0, y1 - y0))
+            left, top = self._screen_pos(x0, y0)
+            right, bottom = self._screen_pos(x1, y1)
+            self.surface.blit(pygame.transform.scale(visible, (max(1, right - left), max(1, bottom - top))), (left, top))
+        center = self._screen_pos(agent.agent_pos[0] + 0.5, agent.agent_pos[1] + 0.5)
+        pygame.draw.circle(self.surface, BLUE, center, max(2, round(self.scale / 3)))
+
+    def draw_ui(self, agent, force=False):
+        """Redesenha a faixa de botões e status se o status mudou. Devolve o retângulo alterado ou None."""
+        status_text = "Caçando o ouro..."
+        status_color = WHITE
+        if agent.has_gold:
+            status_text = f"Ouro encontrado! Volte para {agent.start_pos}"
+        if agent.victory:
+            status_text = "VOCÊ VENCEU!"
+            status_color = GREEN
+        elif agent.game_over:
+            status_text = "GAME OVER!"
+            status_color = RED
+
+        key = (status_text, status_color)
+        if key == self._status_key and not force:
+            return None
+        self._status_key = key
+        status_surf = self._status.get(key)
+        if status_surf is None:
+            status_surf = self._status[key] = status_font.render(status_text, True, status_color)
+
+        ui_area = pygame.Rect(0, self.view.bottom, WIDTH, 100)
+        self.surface.blit(self._ui_background, ui_area)
+        self.surface.blit(status_surf, (ui_area.centerx - status_surf.get_width() // 2, ui_area.top + 5))
+        return ui_area
+
+
+_renderer = None
+
+def _get_renderer():
+    """Renderizador compartilhado por draw_world/draw_ui, criado depois de init_display()."""
+    global _renderer
+    if _renderer is None or _renderer.surface is not screen:
+        _renderer = Renderer(screen)
+    return _renderer
+
+def draw_world(agent):
+    """Desenha o estado atual do mundo (tela inteira, com as superfícies em cache)."""
+    renderer = _get_renderer()
+    renderer.invalidate()
+    renderer.draw(agent)
+
+def draw_ui(agent):
+    """Desenha a interface de botões e status."""
+    _get_renderer().draw_ui(agent, force=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mundo do Wumpus com interface gráfica.")
+    parser.add_argument("--grade", type=int, default=GRID_SIZE, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--inferencia", choices=INFERENCE_MODES, default="rules", help="motor de inferência")
+    parser.add_argument("--probabilistico", action="store_true", help="arrisca a célula menos perigosa se travar")
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--auto", type=int, default=0, metavar="MS",
+                        help="joga sozinho, um passo a cada MS milissegundos (0 = só com o botão)")
+    parser.add_argument("-v", "--verboso", "--verbose", dest="verboso", action="store_true",
+                        help="mostra as mensagens de depuração do agente no terminal")
+    args = parser.parse_args(argv)
+
+    init_display()
+    agent = new_agent(verbose=args.verboso, seed=args.semente, grid_size=args.grade,
+                      num_holes=args.buracos, num_wumpus=args.wumpus, inference=args.inferencia,
+                      probabilistic=args.probabilistico)
+    renderer = _get_renderer()
+    if agent.GRID_SIZE * renderer.scale > min(renderer.view.size):
+        renderer.fit(agent.GRID_SIZE)
+    follow = True  # A câmera acompanha o agente (se a grade não couber na vista) até o usuário movê-la
+    step_event = pygame.USEREVENT
+    if args.auto:
+        pygame.time.set_timer(step_event, args.auto)
+    pan_keys = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+    running = True
+    clock = pygame.time.Clock()
+
+    while running:
+        # Sem eventos não há o que mudar: espera o próximo em vez de redesenhar a cada quadro
+        for event in [pygame.event.wait()] + pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                renderer.invalidate()
+            elif event.type == step_event:
+                if not agent.game_over and not agent.victory:
+                    agent.step()
+            elif event.type == pygame.MOUSEWHEEL:
+                renderer.zoom(1.25 ** event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.KEYDOWN:
+                if event.key in pan_keys:
+                    dx, dy = pan_keys[event.key]
+                    renderer.pan(dx * renderer.view.width // 4, dy * renderer.view.height // 4)
+                    follow = False
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    renderer.zoom(1.25)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    renderer.zoom(0.8)
+                elif event.key == pygame.K_c:
+                    renderer.center_on(agent.agent_pos)
+                    follow = True
+                elif event.key == pygame.K_f:
+                    renderer.fit(agent.GRID_SIZE)
+                elif event.key == pygame.K_SPACE:
+                    agent.step()
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                # Botão de Voltar
+                if 10 <= event.pos[0] <= 170 and HEIGHT - 85 <= event.pos[1] <= HEIGHT - 35:
+                    agent.back()
+                # Botão de Próximo
+                elif WIDTH - 170 <= event.pos[0] <= WIDTH - 10 and HEIGHT - 85 <= event.pos[1] <= HEIGHT - 35:
+                    agent.step()
+                # Botão de Reiniciar
+                elif WIDTH // 2 - 80 <= event.pos[0] <= WIDTH // 2 + 80 and HEIGHT - 90 <= event.pos[1] <= HEIGHT - 30:
+                    agent.reset()
+
+        if (follow and agent.GRID_SIZE * renderer.scale > min(renderer.view.size)
+                and not renderer.is_visible(agent.agent_pos, margin=1 if renderer.scale >= 40 else 2)):
+            renderer.center_on(agent.agent_pos)
+        rects = renderer.draw(agent)
+        if rects:
+            pygame.display.update(rects)
+        clock.tick(FPS)
+
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
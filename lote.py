@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Mundos do Wumpus em lote, vetorizados com NumPy.
+
+BatchedWumpusWorld guarda B mundos do mesmo tamanho como arrays
+empilhados (B, N, N), indexados por [mundo, x, y], e avança todos eles
+em uma única chamada a step(). Não há objeto Python por mundo: mapas,
+percepções, conhecimento do agente e posições são arrays, e cada regra
+é aplicada de uma vez a todos os mundos com máscaras deslocadas.
+
+Os mapas são os mesmos de WumpusWorld com a mesma semente. O agente é
+uma versão vetorizável do agente de regras, com inferência monótona e
+correta (nunca marca como segura uma célula com perigo):
+- vizinhos de uma célula sem vento não têm buraco; sem fedor, não têm Wumpus;
+- uma célula com vento (fedor) com um único vizinho que ainda pode ter
+  buraco (Wumpus) localiza esse buraco (Wumpus);
+- localizados todos os buracos (Wumpus), as demais células não os têm.
+Para andar, cada mundo segue o campo de distâncias até a célula segura
+não visitada mais próxima (ou até o início, depois de pegar o ouro),
+com desempate fixo na ordem de get_adjacent em vez de sorteio. Por
+isso as taxas de vitória não são idênticas às de agente.InferenceAgent
+(nos mesmos mapas, o resultado difere em até um episódio a cada cinco; ver
+tests/test_lote.py): os números do lote medem este agente simplificado.
+
+Requer NumPy (só este módulo; o resto do projeto não depende dele).
+
+Uso:
+    python lote.py --episodios 100000 --lote 4096
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from mundo import WumpusWorld
+from simulacao import EpisodeResult, count_results, print_summary, summarize
+
+# Distância para células inalcançáveis no campo de distâncias
+_FAR = np.iinfo(np.int32).max // 2
+
+# Deslocamentos na ordem de WumpusWorld.get_adjacent: x - 1, x + 1, y - 1, y + 1
+_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _shift(grid, dx, dy, fill=False):
+    """Desloca o conteúdo de grid (B, N, N) por (dx, dy): result[b, x, y] = grid[b, x - dx, y - dy]."""
+    result = np.full_like(grid, fill)
+    n = grid.shape[1]
+    xs_to, xs_from = (slice(dx, n), slice(0, n - dx)) if dx >= 0 else (slice(0, n + dx), slice(-dx, n))
+    ys_to, ys_from = (slice(dy, n), slice(0, n - dy)) if dy >= 0 else (slice(0, n + dy), slice(-dy, n))
+    result[:, xs_to, ys_to] = grid[:, xs_from, ys_from]
+    return result
+
+
+def dilate(mask):
+    """Células vizinhas de alguma célula marcada em mask (B, N, N)."""
+    result = _shift(mask, 1, 0)
+    for dx, dy in ((-1, 0), (0, 1), (0, -1)):
+        result |= _shift(mask, dx, dy)
+    return result
+
+
+def neighbor_count(mask):
+    """Quantidade de vizinhos marcados em mask, por célula."""
+    counts = np.zeros(mask.shape, dtype=np.int8)
+    for dx, dy in _DIRECTIONS:
+        counts += _shift(mask, dx, dy)
+    return counts
+
+
+def percept_grids(wumpus, pits, gold):
+    """Mapas de percepção (fedor, vento, brilho) a partir das grades de perigos e do ouro."""
+    return dilate(wumpus), dilate(pits), gold.copy()
+
+
+def distance_field(targets, walkable, sources=None):
+    """Distância (em passos por células de walkable) de cada célula até o alvo mais próximo.
+
+    Relaxação em paralelo para todos os mundos: cada iteração avança um passo
+    a partir dos alvos, e um mundo sai do laço quando nenhuma distância dele
+    muda. Com sources = (x, y) (uma posição por mundo), o mundo sai assim que
+    sua posição é alcançada: as células mais próximas dos alvos do que ela já
+    estão com a distância exata.
+    """
+    dist = np.where(targets, 0, _FAR).astype(np.int32)
+    blocked = ~walkable & ~targets
+    live = np.arange(targets.shape[0])
+    if sources is not None:
+        live = live[dist[live, sources[0], sources[1]] >= _FAR]
+    for _ in range(targets.shape[1] * targets.shape[2]):
+        if not len(live):
+            break
+        current = dist[live]
+        best = _shift(current, 1, 0, _FAR)
+        for dx, dy in ((-1, 0), (0, 1), (0, -1)):
+            np.minimum(best, _shift(current, dx, dy, _FAR), out=best)
+        best += 1
+        best[blocked[live]] = _FAR
+        np.minimum(current, best, out=best)
+        changed = (best != current).any(axis=(1, 2))
+        dist[live] = best
+        if sources is not None:
+            changed &= best[np.arange(len(live)), sources[0][live], sources[1][live]] >= _FAR
+        live = live[changed]
+    return dist
+
+
+class BatchedWumpusWorld:
+    """B mundos do Wumpus do mesmo tamanho, avançados juntos por step()."""
+
+    def __init__(self, seeds, grid_size=4, num_holes=2, num_wumpus=1):
+        self.seeds = list(seeds)
+        self.GRID_SIZE = n = grid_size
+        self.num_holes = num_holes
+        self.num_wumpus = num_wumpus
+        self.start_pos = (0, n - 1)
+        batch = len(self.seeds)
+
+        # Mapas: gerados pelo mesmo código (e na mesma ordem de sorteios) de WumpusWorld
+        self.wumpus = np.zeros((batch, n, n), dtype=bool)
+        self.pits = np.zeros((batch, n, n), dtype=bool)
+        self.gold = np.zeros((batch, n, n), dtype=bool)
+        generator = WumpusWorld(seed=0, grid_size=n, num_holes=num_holes, num_wumpus=num_wumpus)
+        for b, seed in enumerate(self.seeds):
+            generator.rng = random.Random(seed)
+            wumpuses, holes, gold = generator._generate_solvable_map(n, self.start_pos, num_holes, num_wumpus)
+            for x, y in wumpuses:
+                self.wumpus[b, x, y] = True
+            for x, y in holes:
+                self.pits[b, x, y] = True
+            self.gold[b, gold[0], gold[1]] = True
+        self.stench, self.breeze, self.glitter = percept_grids(self.wumpus, self.pits, self.gold)
+        self.start_mask = np.zeros((batch, n, n), dtype=bool)
+        self.start_mask[:, self.start_pos[0], self.start_pos[1]] = True
+        self.reset()
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def reset(self):
+        """Reinicia agentes e conhecimento de todos os mundos (os mapas continuam os mesmos)."""
+        batch, n = len(self.seeds), self.GRID_SIZE
+        shape = (batch, n, n)
+        self.x = np.full(batch, self.start_pos[0], dtype=np.int32)
+        self.y = np.full(batch, self.start_pos[1], dtype=np.int32)
+        self.has_gold = np.zeros(batch, dtype=bool)
+        self.victory = np.zeros(batch, dtype=bool)
+        self.game_over = np.zeros(batch, dtype=bool)
+        self.steps = np.zeros(batch, dtype=np.int32)
+
+        # --- Conhecimento dos agentes ---
+        self.visited = np.zeros(shape, dtype=bool)
+        self.stench_seen = np.zeros(shape, dtype=bool)  # Fedor sentido (só em células visitadas)
+        self.breeze_seen = np.zeros(shape, dtype=bool)
+        self.no_pit = np.zeros(shape, dtype=bool)       # Sabidamente sem buraco
+        self.no_wumpus = np.zeros(shape, dtype=bool)    # Sabidamente sem Wumpus
+        self.pit_known = np.zeros(shape, dtype=bool)    # Buracos localizados
+        self.wumpus_known = np.zeros(shape, dtype=bool)
+
+    @property
+    def safe(self):
+        return self.no_pit & self.no_wumpus
+
+    @property
+    def danger(self):
+        return self.pit_known | self.wumpus_known
+
+    @property
+    def active(self):
+        """Mundos cujo episódio ainda não terminou."""
+        return ~(self.victory | self.game_over)
+
+    def _observe(self, idx):
+        """Percepção na posição atual dos mundos idx (equivale ao início de logical_update)."""
+        x, y = self.x[idx], self.y[idx]
+        self.visited[idx, x, y] = True
+        self.stench_seen[idx, x, y] = self.stench[idx, x, y]
+        self.breeze_seen[idx, x, y] = self.breeze[idx, x, y]
+        self.has_gold[idx] |= self.glitter[idx, x, y]
+
+    def _infer(self, idx):
+        """Aplica as regras de inferência a todos os mundos idx de uma vez."""
+        visited = self.visited[idx]
+        stench, breeze = self.stench_seen[idx], self.breeze_seen[idx]
+        no_pit = self.no_pit[idx] | visited | dilate(visited & ~breeze)
+        no_wumpus = self.no_wumpus[idx] | visited | dilate(visited & ~stench)
+        pit_known, wumpus_known = self.pit_known[idx], self.wumpus_known[idx]
+
+        # Eliminação: percepção com um único vizinho possível localiza o perigo
+        single_pit = visited & breeze & (neighbor_count(~no_pit) == 1)
+        pit_known |= dilate(single_pit) & ~no_pit
+        single_wumpus = visited & stench & (neighbor_count(~no_wumpus) == 1)
+        wumpus_known |= dilate(single_wumpus) & ~no_wumpus
+
+        # Uma célula não tem buraco e Wumpus ao mesmo tempo
+        no_pit |= wumpus_known
+        no_wumpus |= pit_known
+
+        # Todos os buracos (Wumpus) localizados: nenhuma outra célula os tem
+        all_pits = pit_known.sum(axis=(1, 2)) >= self.num_holes
+        no_pit[all_pits] |= ~pit_known[all_pits]
+        all_wumpus = wumpus_known.sum(axis=(1, 2)) >= self.num_wumpus
+        no_wumpus[all_wumpus] |= ~wumpus_known[all_wumpus]
+
+        self.no_pit[idx], self.no_wumpus[idx] = no_pit, no_wumpus
+        self.pit_known[idx], self.wumpus_known[idx] = pit_known, wumpus_known
+
+    def _move(self, idx):
+        """Move cada mundo idx um passo pelo campo de distâncias até seu alvo."""
+        n = self.GRID_SIZE
+        safe = self.no_pit[idx] & self.no_wumpus[idx]
+        frontier = safe & ~self.visited[idx]
+        targets = np.where(self.has_gold[idx, None, None], self.start_mask[idx], frontier)
+        x, y = self.x[idx], self.y[idx]
+        dist = distance_field(targets, safe, (x, y))
+
+        rows = np.arange(len(idx))
+        options = np.full((len(idx), len(_DIRECTIONS)), _FAR, dtype=np.int32)
+        for d, (dx, dy) in enumerate(_DIRECTIONS):
+            nx, ny = x + dx, y + dy
+            inside = (nx >= 0) & (nx < n) & (ny >= 0) & (ny < n)
+            options[inside, d] = dist[rows[inside], nx[inside], ny[inside]]
+        choice = options.argmin(axis=1)  # Primeiro mínimo: ordem de get_adjacent
+        can_move = options[rows, choice] < _FAR
+
+        # Sem alvo alcançável (sem o ouro): agente preso, como o game over de logical_update
+        self.game_over[idx[~can_move & ~self.has_gold[idx]]] = True
+
+        moving = idx[can_move]
+        direction = np.array(_DIRECTIONS, dtype=np.int32)[choice[can_move]]
+        self.x[moving] += direction[:, 0]
+        self.y[moving] += direction[:, 1]
+        self.steps[moving] += 1
+
+        mx, my = self.x[moving], self.y[moving]
+        died = self.pits[moving, mx, my] | self.wumpus[moving, mx, my]
+        self.game_over[moving[died]] = True
+        home = (mx == self.start_pos[0]) & (my == self.start_pos[1])
+        self.victory[moving[~died & home & self.has_gold[moving]]] = True
+
+    def step(self):
+        """Executa uma jogada em todos os mundos ainda ativos. Devolve quantos continuam ativos."""
+        idx = np.flatnonzero(self.active)
+        if len(idx):
+            self._observe(idx)
+            self._infer(idx)
+            self._move(idx)
+        return int(self.active.sum())
+
+    def run(self, max_steps=1000):
+        """Joga até todos os episódios terminarem ou atingirem max_steps passos."""
+        for _ in range(max_steps):
+            if not self.step():
+                break
+
+    def results(self):
+        """Resultado de cada episódio, no formato de simulacao.run_episode."""
+        return [EpisodeResult(seed, bool(v), bool(g), not v and not g, int(s))
+                for seed, v, g, s in zip(self.seeds, self.victory, self.game_over, self.steps)]
+
+
+def run_batched(num_episodes, first_seed=0, max_steps=1000, batch_size=4096, world_options=None):
+    """Joga num_episodes episódios em lotes de batch_size mundos e devolve o resumo (como simulacao.run_batch)."""
+    start = time.perf_counter()
+    results = []
+    for first in range(first_seed, first_seed + num_episodes, batch_size):
+        last = min(first + batch_size, first_seed + num_episodes)
+        batch = BatchedWumpusWorld(range(first, last), **(world_options or {}))
+        batch.run(max_steps)
+        results.extend(batch.results())
+    return summarize(count_results(results), time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avalia o agente vetorizado em lotes de mundos.")
+    parser.add_argument("-n", "--episodios", type=int, default=10000, help="número de mapas a jogar")
+    parser.add_argument("-s", "--semente", type=int, default=0, help="semente do primeiro mapa")
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("--lote", type=int, default=4096, help="mundos avançados juntos por step()")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    args = parser.parse_args(argv)
+
+    world_options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus}
+    print("Agente simplificado (vetorizado): as taxas não são as de agente.InferenceAgent (simulacao.py)")
+    print_summary(run_batched(args.episodios, args.semente, args.max_passos, args.lote, world_options))
+
+
+if __name__ == "__main__":
+    main()
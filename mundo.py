@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Simulador do Mundo do Wumpus: o mundo, os mapas e as percepções.
+
+WumpusWorld é o ambiente: guarda o mapa escondido (Wumpus, buracos e
+ouro), gera mapas sempre solucionáveis e calcula as percepções de cada
+célula (com ou sem ruído nos sensores). Depois de reset() o mundo não
+muda: quem joga é o agente (agente.InferenceAgent, criado com o mundo),
+que guarda a posição, o conhecimento e as jogadas. Vários agentes, e os
+retratos de um agente, podem compartilhar o mesmo mundo. A interface
+gráfica fica em interface.py.
+
+Este módulo não importa o agente, os motores de inferência, o Pygame nem
+o argparse: é o que o cache de mapas (solucoes.py) e o lote vetorizado
+(lote.py) carregam (ver benchmarks/bench_importacao.py).
+"""
+
+import collections
+import copy
+import random
+
+from grade import neighbor_cells, neighbor_ids
+
+# Tamanho padrão da grade
+GRID_SIZE = 4
+
+# Mapa já gerado para uma semente (ver solucoes.py): perigos, ouro, percepções (um byte por
+# célula) e a semente das jogadas (play_seed), para as jogadas serem as mesmas.
+# percepts e play_seed podem ser None: as percepções são calculadas e a semente sai do gerador.
+MapPreset = collections.namedtuple("MapPreset", ["wumpuses", "holes", "gold", "percepts", "play_seed"])
+# Sensores com ruído: probabilidade de falso positivo (percepção sem o perigo ao lado) e de falso
+# negativo (perigo ao lado sem a percepção) do fedor e do vento. O brilho é sempre exato.
+PerceptNoise = collections.namedtuple("PerceptNoise", ["stench_fp", "stench_fn", "breeze_fp", "breeze_fn"])
+
+# --- Classe Principal do Mundo ---
+class WumpusWorld:
+    def __init__(self, seed=None, rng=None, grid_size=GRID_SIZE, num_holes=2, num_wumpus=1, preset=None,
+                 noise=None, instrumentation=None):
+        self.GRID_SIZE = grid_size # Tamanho da grade desta instância (padrão: GRID_SIZE)
+        self.num_holes = num_holes
+        self.num_wumpus = num_wumpus
+        self.noise = noise # Ruído dos sensores (PerceptNoise), ou None para percepções exatas
+        self.instrumentation = instrumentation # Cronometra a geração do mapa (ver instrumentacao.py)
+        # Gerador próprio: a mesma semente sempre gera o mesmo mapa (e o agente continua dele
+        # as suas jogadas), independentemente do módulo random global e de outros mundos.
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.reset(preset)
+
+    @property
+    def wumpus(self):
+        """Posição do (primeiro) Wumpus, ou None se o mapa não tiver Wumpus."""
+        return self.wumpuses[0] if self.wumpuses else None
+
+    def get_adjacent(self, x, y):
+        """Retorna as células adjacentes válidas (tupla pré-calculada, compartilhada entre mundos)."""
+        return self._adjacent[x * self.GRID_SIZE + y]
+
+    def reset(self, preset=None):
+        """Gera outro mapa (ou usa preset, um MapPreset) no lugar do atual.
+
+        Só para um mundo que nenhum agente usa: InferenceAgent.reset chama
+        este método em uma cópia do mundo.
+        """
+        n = self.GRID_SIZE
+        self._adjacent = neighbor_cells(n)     # Vizinhos por identificador de célula (x * n + y)
+        self._neighbor_ids = neighbor_ids(n)
+        self.start_pos = (0, self.GRID_SIZE - 1)
+
+        if preset is not None:
+            self.wumpuses, self.holes, self.gold = list(preset.wumpuses), list(preset.holes), preset.gold
+            self._percept_flags = preset.percepts if preset.percepts is not None else self._generate_all_percepts()
+            play_seed = preset.play_seed
+        else:
+            # Usar a nova função para gerar um mapa solucionável
+            probe = self.instrumentation
+            start = probe.clock() if probe is not None else 0.0
+            self.wumpuses, self.holes, self.gold = self._generate_solvable_map(
+                self.GRID_SIZE, self.start_pos, self.num_holes, self.num_wumpus)
+            if probe is not None:
+                probe.record(self, "geracao_mapa", probe.clock() - start)
+
+            self._percept_flags = self._generate_all_percepts()
+            play_seed = None
+        # Semente das jogadas (64 bits, sorteada depois do mapa): o gerador recomeça dela, então
+        # basta guardá-la (ver solucoes.py) para refazer o ruído dos sensores e as jogadas
+        self.play_seed = play_seed if play_seed is not None else self.rng.getrandbits(64)
+        self.rng.seed(self.play_seed)
+        if self.noise is not None:
+            # O que os sensores leem em cada célula é sorteado uma única vez, com o gerador do mundo
+            self._percept_flags = self._noisy_percepts(self._percept_flags)
+        # Estado do gerador no início das jogadas: o agente joga a partir dele (e volta a ele em back())
+        self._play_rng_state = self.rng.getstate()
+
+    def with_map(self, wumpuses, holes, gold, percepts=None):
+        """Outro mundo com a mesma configuração, mas com o mapa escondido dado.
+
+        Usado pelo planejador (busca.py) para jogar simulações em mapas sorteados.
+        percepts é o mapa de percepções já calculado para esse mapa (se
+        omitido, é recalculado). Este mundo não muda.
+        """
+        world = copy.copy(self)
+        world.wumpuses, world.holes, world.gold = wumpuses, holes, gold
+        world._percept_flags = percepts if percepts is not None else world._generate_all_percepts()
+        return world
+
+    def _is_path_valid(self, start, end, obstacles, grid_size):
+        """Verifica se existe um caminho válido entre start e end, evitando obstáculos."""
+        parent = {start: None}  # De onde cada célula foi alcançada (reconstrói o caminho no fim)
+        queue = collections.deque([start])
+
+        while queue:
+            (r, c) = queue.popleft()
+
+            if (r, c) == end:
+                path = []
+                cell = end
+                while cell is not None:
+                    path.append(cell)
+                    cell = parent[cell]
+                return True, path[::-1]
+
+            for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                nr, nc = r + dr, c + dc
+
+                if 0 <= nr < grid_size and 0 <= nc < grid_size and \
+                   (nr, nc) not in obstacles and (nr, nc) not in parent:
+                    parent[(nr, nc)] = (r, c)
+                    queue.append((nr, nc))
+        return False, []
+
+    @staticmethod
+    def _reachable_cells(start, obstacles, grid_size):
+        """Preenchimento (flood fill) a partir de start: índices x * grid_size + y das células alcançáveis."""
+        adjacency = neighbor_ids(grid_size)
+        seen = bytearray(grid_size * grid_size)
+        for x, y in obstacles:
+            seen[x * grid_size + y] = 1
+        first = start[0] * grid_size + start[1]
+        seen[first] = 1
+        reached = [first]
+        for i in reached:  # a lista cresce durante o laço e faz o papel da fila
+            for j in adjacency[i]:
+                if not seen[j]:
+                    seen[j] = 1
+                    reached.append(j)
+        return reached
+
+    # Limite da geração por rejeição, em tentativas x células da grade (cada tentativa sorteia os
+    # perigos e faz um flood fill). Com perigos demais, quase nenhum sorteio deixa o ouro alcançável.
+    MAP_GENERATION_BUDGET = 1 << 24
+
+    def _generate_solvable_map(self, grid_size, start_pos, num_holes=2, num_wumpus=1):
+        """Gera um mapa do Wumpus que é garantidamente solucionável.
+
+        Sorteia os perigos, faz um único flood fill a partir do início e
+        sorteia o ouro entre as células alcançáveis. O grafo da grade não é
+        direcionado, então alcançar o ouro já garante o caminho de volta.
+        Para manter a mesma distribuição da geração por rejeição (todos os
+        mapas solucionáveis igualmente prováveis), os perigos são aceitos com
+        probabilidade proporcional à quantidade de lugares possíveis para o ouro.
+        Levanta ValueError se nenhum sorteio for aceito dentro de
+        MAP_GENERATION_BUDGET.
+        """
+        forbidden_initial_cells = {start_pos} | set(self.get_adjacent(start_pos[0], start_pos[1]))
+        possible_cells = [(x, y) for x in range(grid_size) for y in range(grid_size)
+                          if (x, y) not in forbidden_initial_cells]
+
+        if len(possible_cells) < num_wumpus + num_holes + 1:
+            raise ValueError(f"Grade {grid_size}x{grid_size} não comporta {num_wumpus} Wumpus, "
+                             f"{num_holes} buracos e o ouro fora da área inicial.")
+
+        forbidden_index = {x * grid_size + y for x, y in forbidden_initial_cells}
+        gold_choices = len(possible_cells) - num_wumpus - num_holes
+        rng = self.rng
+        attempts = max(1, self.MAP_GENERATION_BUDGET // (grid_size * grid_size))
+        for _ in range(attempts):
+            # 1. Posicionar Wumpus e buracos (todos são obstáculos para o caminho até o ouro)
+            hazards = rng.sample(possible_cells, num_wumpus + num_holes)
+
+            # 2. Células alcançáveis a partir do início onde o ouro pode ficar
+            reachable = [i for i in self._reachable_cells(start_pos, hazards, grid_size) if i not in forbidden_index]
+
+            # 3. Aceitar com probabilidade len(reachable) / gold_choices e posicionar o ouro
+            if reachable and rng.random() * gold_choices < len(reachable):
+                gold_pos = divmod(rng.choice(reachable), grid_size)
+                return hazards[:num_wumpus], hazards[num_wumpus:], gold_pos
+        raise ValueError(f"Nenhum mapa solucionável em {attempts} tentativas: {num_wumpus} Wumpus e "
+                         f"{num_holes} buracos são perigos demais para a grade {grid_size}x{grid_size}.")
+
+    # Bits do mapa de percepções (um byte por célula)
+    _STENCH, _BREEZE, _GLITTER = 1, 2, 4
+
+    def _generate_all_percepts(self):
+        """Cria o mapa de percepções (informação do ambiente): um byte de bits por célula."""
+        n = self.GRID_SIZE
+        percepts = bytearray(n * n)
+        for bit, cells in ((self._STENCH, self.wumpuses), (self._BREEZE, self.holes)):
+            for x, y in cells:
+                for j in self._neighbor_ids[x * n + y]:
+                    percepts[j] |= bit
+        percepts[self.gold[0] * n + self.gold[1]] |= self._GLITTER
+        return percepts
+
+    def _noisy_percepts(self, percepts):
+        """Percepções lidas por sensores com ruído (self.noise): fedor e vento trocados com as taxas dadas."""
+        rng = self.rng
+        noisy = bytearray(percepts)
+        noise = self.noise
+        for bit, false_positive, false_negative in ((self._STENCH, noise.stench_fp, noise.stench_fn),
+                                                    (self._BREEZE, noise.breeze_fp, noise.breeze_fn)):
+            if false_positive or false_negative:
+                for i, bits in enumerate(percepts):
+                    if rng.random() < (false_negative if bits & bit else false_positive):
+                        noisy[i] ^= bit
+        return noisy
+
+    def percepts_at(self, cell):
+        """O que os sensores leem na célula: (fedor, vento, brilho)."""
+        bits = self._percept_flags[cell[0] * self.GRID_SIZE + cell[1]]
+        return bool(bits & self._STENCH), bool(bits & self._BREEZE), bool(bits & self._GLITTER)
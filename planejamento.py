@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Planejamento de caminhos com campos de distância incrementais.
+
+DistanceField guarda, para cada célula transitável da grade, a distância
+(em passos) até a fonte mais próxima, e é atualizado a cada mudança em
+vez de refazer uma BFS por jogada:
+- células e fontes novas só diminuem distâncias (propagação em largura
+  a partir da mudança);
+- células ou fontes removidas aumentam distâncias só na região que
+  dependia delas, recalculada com uma fila de prioridade a partir da
+  borda dessa região.
+
+O agente (agente.InferenceAgent) mantém dois campos sobre as células seguras e não
+perigosas: um com fonte no início (caminho de volta com o ouro) e outro
+com fonte nas células seguras não visitadas (exploração). O próximo passo
+é o primeiro vizinho, na ordem de get_adjacent, com distância uma unidade
+menor, exatamente o primeiro passo do caminho que a BFS a partir do
+agente encontraria.
+"""
+
+import array
+import heapq
+
+from grade import neighbor_ids
+
+# Distância de células inalcançáveis (ou não transitáveis)
+UNREACHABLE = 2 ** 31 - 1
+
+
+class DistanceField:
+    """Distâncias das células transitáveis até o conjunto de fontes, atualizadas incrementalmente.
+
+    Células são identificadas por x * grid_size + y. Uma fonte só conta
+    enquanto também for transitável.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self._adjacency = neighbor_ids(grid_size)
+        self._dist = array.array("i", [UNREACHABLE]) * (grid_size * grid_size)
+        self._walkable = bytearray(grid_size * grid_size)
+        self._source = bytearray(grid_size * grid_size)
+
+    def copy(self):
+        """Cópia independente do campo (a tabela de vizinhos é compartilhada)."""
+        clone = DistanceField.__new__(DistanceField)
+        clone.grid_size = self.grid_size
+        clone._adjacency = self._adjacency
+        clone._dist = self._dist[:]
+        clone._walkable = self._walkable[:]
+        clone._source = self._source[:]
+        return clone
+
+    def distance(self, i):
+        """Distância da célula i até a fonte mais próxima (UNREACHABLE se não houver caminho)."""
+        return self._dist[i]
+
+    def next_hop(self, i):
+        """Primeiro vizinho de i (na ordem da tabela de vizinhos) em um caminho mínimo até uma fonte.
+
+        Devolve None se i já é uma fonte ou se nenhuma fonte é alcançável.
+        """
+        d = self._dist[i]
+        if d == 0 or d == UNREACHABLE:
+            return None
+        dist, walkable = self._dist, self._walkable
+        for j in self._adjacency[i]:
+            if walkable[j] and dist[j] == d - 1:
+                return j
+        return None
+
+    # --- Mudanças que só diminuem distâncias ---
+
+    def add_walkable(self, i):
+        if self._walkable[i]:
+            return
+        self._walkable[i] = 1
+        if self._source[i]:
+            self._dist[i] = 0
+        else:
+            self._dist[i] = self._best_from_neighbors(i)
+        if self._dist[i] != UNREACHABLE:
+            self._decrease(i)
+
+    def add_source(self, i):
+        if self._source[i]:
+            return
+        self._source[i] = 1
+        if self._walkable[i] and self._dist[i] != 0:
+            self._dist[i] = 0
+            self._decrease(i)
+
+    def _best_from_neighbors(self, i):
+        dist, walkable = self._dist, self._walkable
+        best = UNREACHABLE
+        for j in self._adjacency[i]:
+            if walkable[j] and dist[j] < best:
+                best = dist[j]
+        return best + 1 if best != UNREACHABLE else UNREACHABLE
+
+    def _decrease(self, first):
+        """Propaga em largura a distância (menor) de first para os vizinhos."""
+        dist, walkable, adjacency = self._dist, self._walkable, self._adjacency
+        queue = [first]
+        for i in queue:  # a lista cresce durante o laço e faz o papel da fila
+            d = dist[i] + 1
+            for j in adjacency[i]:
+                if walkable[j] and dist[j] > d:
+                    dist[j] = d
+                    queue.append(j)
+
+    # --- Mudanças que podem aumentar distâncias ---
+
+    def remove_walkable(self, i):
+        if not self._walkable[i]:
+            return
+        self._walkable[i] = 0
+        self._dist[i] = UNREACHABLE
+        self._increase([j for j in self._adjacency[i] if self._walkable[j]])
+
+    def remove_source(self, i):
+        if not self._source[i]:
+            return
+        self._source[i] = 0
+        if self._walkable[i]:
+            self._increase([i])
+
+    def _supported(self, i, affected):
+        """Indica se i ainda tem um vizinho (fora de affected) com distância uma unidade menor."""
+        d = self._dist[i]
+        if d == 0 and self._source[i]:
+            return True
+        dist, walkable = self._dist, self._walkable
+        for j in self._adjacency[i]:
+            if walkable[j] and j not in affected and dist[j] == d - 1:
+                return True
+        return False
+
+    def _increase(self, candidates):
+        """Recalcula as células cuja distância dependia de uma célula ou fonte removida."""
+        dist, walkable, adjacency = self._dist, self._walkable, self._adjacency
+
+        # 1. Células que perderam todo vizinho com distância menor (e as que dependiam delas)
+        affected = set()
+        stack = list(candidates)
+        while stack:
+            i = stack.pop()
+            if i in affected or dist[i] == UNREACHABLE or self._supported(i, affected):
+                continue
+            affected.add(i)
+            for j in adjacency[i]:
+                if walkable[j] and dist[j] == dist[i] + 1:
+                    stack.append(j)
+        if not affected:
+            return
+
+        # 2. Distâncias novas a partir da borda da região afetada, em ordem crescente
+        for i in affected:
+            dist[i] = UNREACHABLE
+        heap = []
+        for i in affected:
+            d = self._best_from_neighbors(i)
+            if d != UNREACHABLE:
+                heap.append((d, i))
+        heapq.heapify(heap)
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d >= dist[i]:
+                continue
+            dist[i] = d
+            for j in adjacency[i]:
+                if walkable[j] and dist[j] > d + 1:
+                    heapq.heappush(heap, (d + 1, j))
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Risco de cada célula da fronteira (modo probabilístico do agente).
+
+Quando não resta nenhuma célula segura para explorar, o agente pode
+arriscar a célula com a menor probabilidade de ter um buraco ou o Wumpus.
+As probabilidades são exatas para o modelo "todas as posições dos perigos
+compatíveis com as percepções e com as quantidades conhecidas são
+igualmente prováveis", e usam apenas a base de conhecimento do agente.
+
+A fronteira (células não visitadas vizinhas de células visitadas) é
+dividida em componentes independentes: duas células ficam no mesmo
+componente quando aparecem na mesma percepção de vento ou fedor. Cada
+componente é enumerado separadamente, contando soluções por quantidade
+de buracos e de Wumpus, e os componentes são combinados com as células
+restantes do tabuleiro por análise combinatória. A enumeração de cada
+componente é memorizada pela sua assinatura (células, domínios e
+percepções, indexados pela ordem das células), então componentes que não mudaram
+(ou que se repetem em outro lugar do mapa) nunca são recalculados.
+"""
+
+import collections
+import functools
+import math
+import time
+
+# Componentes maiores que isso não são enumerados (custo exponencial); suas
+# células recebem a densidade média de perigos como estimativa.
+MAX_COMPONENT_CELLS = 30
+
+
+@functools.lru_cache(maxsize=65536)
+def _enumerate_component(signature, num_holes, num_wumpus):
+    """Enumera as atribuições de um componente.
+
+    signature = (domínios, restrições): domínios é uma tupla (pode_buraco,
+    pode_wumpus) por célula e cada restrição é (tipo, índices das células),
+    com tipo 0 para vento e 1 para fedor. Devolve {(buracos, wumpus):
+    (soluções, buracos por célula, wumpus por célula)}.
+    """
+    domains, constraints = signature
+    n = len(domains)
+    by_cell = [[] for _ in range(n)]
+    for ci, (_, cells) in enumerate(constraints):
+        for i in cells:
+            by_cell[i].append(ci)
+    remaining = [len(cells) for _, cells in constraints]
+    satisfied = [0] * len(constraints)
+    kinds = [kind for kind, _ in constraints]
+    values = [0] * n # 0 vazio, 1 buraco, 2 Wumpus
+    table = {}
+
+    def assign(i, pits, wumpuses):
+        if i == n:
+            entry = table.get((pits, wumpuses))
+            if entry is None:
+                entry = table[(pits, wumpuses)] = [0, [0] * n, [0] * n]
+            entry[0] += 1
+            for j, value in enumerate(values):
+                if value == 1:
+                    entry[1][j] += 1
+                elif value == 2:
+                    entry[2][j] += 1
+            return
+        can_pit, can_wumpus = domains[i]
+        options = [0]
+        if can_pit and pits < num_holes:
+            options.append(1)
+        if can_wumpus and wumpuses < num_wumpus:
+            options.append(2)
+        for value in options:
+            ok = True
+            for ci in by_cell[i]:
+                remaining[ci] -= 1
+                if value and kinds[ci] == value - 1:
+                    satisfied[ci] += 1
+                if remaining[ci] == 0 and satisfied[ci] == 0:
+                    ok = False
+            if ok:
+                values[i] = value
+                assign(i + 1, pits + (value == 1), wumpuses + (value == 2))
+                values[i] = 0
+            for ci in by_cell[i]:
+                remaining[ci] += 1
+                if value and kinds[ci] == value - 1:
+                    satisfied[ci] -= 1
+
+    assign(0, 0, 0)
+    return {key: (count, tuple(p), tuple(w)) for key, (count, p, w) in table.items()}
+
+
+def _log_comb(n, k):
+    if k < 0 or k > n:
+        return None
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _convolve(a, b):
+    """Convolução de duas distribuições {(buracos, wumpus): peso}, renormalizada."""
+    result = collections.defaultdict(float)
+    for (p1, w1), x in a.items():
+        for (p2, w2), y in b.items():
+            result[(p1 + p2, w1 + w2)] += x * y
+    top = max(result.values(), default=0.0)
+    return {key: value / top for key, value in result.items()} if top else dict(result)
+
+
+class FrontierRisk:
+    """Calcula a probabilidade de perigo das células da fronteira a partir da base de conhecimento."""
+
+    def __init__(self, grid_size, num_holes, num_wumpus, get_adjacent):
+        self.grid_size = grid_size
+        self.num_holes = num_holes
+        self.num_wumpus = num_wumpus
+        self.get_adjacent = get_adjacent
+        self.stats = {"calls": 0, "time": 0.0}
+
+    @staticmethod
+    def cache_info():
+        """Acertos e faltas do cache de componentes (compartilhado no processo)."""
+        return _enumerate_component.cache_info()
+
+    def _components(self, knowledge_base):
+        """Domínios das células da fronteira e seus componentes (listas de células)."""
+        domains = {}
+        unknown_neighbors = {}
+        for cell, (fedor, vento, _) in knowledge_base.items():
+            neighbors = [n for n in self.get_adjacent(cell[0], cell[1]) if n not in knowledge_base]
+            unknown_neighbors[cell] = neighbors
+            for n in neighbors:
+                domain = domains.setdefault(n, [True, True])
+                if not vento:
+                    domain[0] = False
+                if not fedor:
+                    domain[1] = False
+
+        constraints = set()
+        for cell, (fedor, vento, _) in knowledge_base.items():
+            if vento:
+                constraints.add((0, tuple(n for n in unknown_neighbors[cell] if domains[n][0])))
+            if fedor:
+                constraints.add((1, tuple(n for n in unknown_neighbors[cell] if domains[n][1])))
+
+        # União-busca: células na mesma percepção ficam no mesmo componente
+        parent = {c: c for c, d in domains.items() if d[0] or d[1]}
+
+        def find(c):
+            while parent[c] != c:
+                parent[c] = parent[parent[c]]
+                c = parent[c]
+            return c
+
+        for _, cells in constraints:
+            for c in cells[1:]:
+                parent[find(c)] = find(cells[0])
+        groups = collections.defaultdict(list)
+        for c in parent:
+            groups[find(c)].append(c)
+        by_root = collections.defaultdict(list)
+        for kind, cells in constraints:
+            if cells:
+                by_root[find(cells[0])].append((kind, cells))
+        return domains, [(sorted(cells), by_root[root]) for root, cells in groups.items()]
+
+    def _signature(self, cells, domains, constraints):
+        """Assinatura do componente: domínios e percepções por índice de célula, sem posições absolutas."""
+        index = {c: i for i, c in enumerate(cells)}
+        relative_domains = tuple(tuple(domains[c]) for c in cells)
+        relative_constraints = tuple(sorted((kind, tuple(sorted(index[c] for c in cs))) for kind, cs in constraints))
+        return relative_domains, relative_constraints
+
+    def probabilities(self, knowledge_base):
+        """Devolve ({célula da fronteira: probabilidade de perigo}, probabilidade das demais células).
+
+        Devolve (None, None) se as percepções forem inconsistentes com as quantidades de perigos.
+        """
+        start = time.perf_counter()
+        try:
+            return self._probabilities(knowledge_base)
+        finally:
+            self.stats["calls"] += 1
+            self.stats["time"] += time.perf_counter() - start
+
+    def _probabilities(self, knowledge_base):
+        domains, components = self._components(knowledge_base)
+        probabilities = {c: 0.0 for c, d in domains.items() if not d[0] and not d[1]}
+        rest = self.grid_size * self.grid_size - len(knowledge_base) - len(domains)
+
+        tables, approximate = [], []
+        for cells, constraints in components:
+            if len(cells) > MAX_COMPONENT_CELLS:
+                approximate.extend(cells)
+                continue
+            signature = self._signature(cells, domains, constraints)
+            table = _enumerate_component(signature, self.num_holes, self.num_wumpus)
+            if not table:
+                return None, None
+            top = max(count for count, _, _ in table.values())
+            tables.append((cells, table, {key: count / top for key, (count, _, _) in table.items()}))
+
+        # Células de componentes grandes demais contam como "restantes" na combinação
+        rest += len(approximate)
+
+        def rest_log_weight(pits, wumpuses):
+            a = _log_comb(rest, self.num_holes - pits)
+            b = _log_comb(rest - (self.num_holes - pits), self.num_wumpus - wumpuses) if a is not None else None
+            return None if b is None else a + b
+
+        prefix = [{(0, 0): 1.0}]
+        for _, _, weights in tables:
+            prefix.append(_convolve(prefix[-1], weights))
+        suffix = [{(0, 0): 1.0}]
+        for _, _, weights in reversed(tables):
+            suffix.append(_convolve(suffix[-1], weights))
+        suffix.reverse()
+
+        log_weights = {key: rest_log_weight(*key) for key in prefix[-1]}
+        valid = [w for w in log_weights.values() if w is not None]
+        if not valid:
+            return None, None
+        top = max(valid)
+        rest_weight = {key: math.exp(w - top) for key, w in log_weights.items() if w is not None}
+
+        total = sum(weight * rest_weight.get(key, 0.0) for key, weight in prefix[-1].items())
+        if total == 0:
+            return None, None
+        expected_rest_hazards = sum(
+            weight * rest_weight.get((p, w), 0.0) * ((self.num_holes - p) + (self.num_wumpus - w))
+            for (p, w), weight in prefix[-1].items()) / total
+        rest_probability = expected_rest_hazards / rest if rest else 0.0
+
+        for i, (cells, table, weights) in enumerate(tables):
+            outer = _convolve(prefix[i], suffix[i + 1])
+            hazard = [0.0] * len(cells)
+            norm = 0.0
+            for (p, w), (_, pit_counts, wumpus_counts) in table.items():
+                scale = sum(x * rest_weight.get((p + p2, w + w2), 0.0) for (p2, w2), x in outer.items())
+                scale *= weights[(p, w)] / table[(p, w)][0]
+                norm += table[(p, w)][0] * scale
+                for j in range(len(cells)):
+                    hazard[j] += (pit_counts[j] + wumpus_counts[j]) * scale
+            for j, c in enumerate(cells):
+                probabilities[c] = hazard[j] / norm if norm else 1.0
+
+        for c in approximate:
+            probabilities[c] = rest_probability
+        return probabilities, rest_probability
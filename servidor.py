@@ -0,0 +1,484 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor assíncrono de sessões do Mundo do Wumpus (JSON por linha).
+
+Outras ferramentas usam o agente sem a interface gráfica:
+o servidor (asyncio, um único processo) guarda muitas sessões (cada uma
+um agente no seu mundo) e atende pedidos por TCP ou por um socket Unix.
+Cada pedido e cada resposta é um objeto JSON em uma linha; os pedidos de
+uma conexão são respondidos em ordem, então o cliente pode mandar vários
+sem esperar.
+
+Pedidos (o campo "id", se presente, volta na resposta):
+    {"op": "create", "seed": 7, "grid_size": 8, "num_holes": 6, "num_wumpus": 1,
+     "inference": "rules", "probabilistic": true}      -> {"ok": true, "session": 1, "state": {...}}
+    {"op": "step", "session": 1, "count": 10}          -> {"ok": true, "state": {...}}
+    {"op": "back", "session": 1, "count": 1}           -> {"ok": true, "state": {...}}
+    {"op": "state", "session": 1, "cells": true}       -> {"ok": true, "state": {...}}
+    {"op": "close", "session": 1}                      -> {"ok": true}
+    {"op": "stats"}                                    -> {"ok": true, "stats": {...}}
+Erros voltam como {"ok": false, "error": "..."} e a conexão continua.
+
+Pedidos rápidos são respondidos no próprio laço de eventos. Um "step" ou
+"back" que pode demorar (jogadas x células acima de inline_work), ou um
+"create" em uma grade grande (células acima de inline_work), roda em uma
+thread, e o laço continua atendendo as outras conexões; os pedidos
+seguintes da mesma conexão, e os de qualquer conexão para a mesma sessão,
+esperam ele terminar. Um "create" aceita no máximo MAX_HAZARD_DENSITY das
+células com perigos.
+
+O estado (ver agent_state) traz posição, ouro, fim de jogo, movimentos
+feitos ("steps": jogadas paradas não contam, e "back" desfaz movimentos) e
+a percepção atual; com "cells": true, também as células visitadas, seguras
+e perigosas. As sessões ficam em um LRU limitado (SessionStore): ao passar do
+limite sai a usada há mais tempo, e as ociosas por mais de idle_timeout
+segundos são removidas periodicamente.
+
+Uso:
+    python servidor.py --porta 8765
+    python servidor.py --unix /tmp/wumpus.sock --max-sessoes 50000 --ociosidade 600
+    python -m benchmarks.bench_servidor   # teste de carga
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import json
+import threading
+import time
+import weakref
+
+from agente import INFERENCE_MODES, new_agent
+
+# Parâmetros aceitos por "create" e os tipos de cada um
+CREATE_OPTIONS = {"seed": int, "grid_size": int, "num_holes": int, "num_wumpus": int, "inference": str,
+                  "probabilistic": bool}
+# Maior pedido aceito (bytes sem um fim de linha)
+MAX_LINE = 1 << 16
+# Jogadas x células (count * grid_size ** 2) até onde um "step"/"back" roda no próprio laço de eventos
+INLINE_WORK = 1 << 14
+# Fração máxima das células com perigo (buracos e Wumpus) em um "create": acima disso a geração do
+# mapa por rejeição pode precisar de muitas tentativas (ver mundo.WumpusWorld._generate_solvable_map)
+MAX_HAZARD_DENSITY = 0.25
+
+# Trabalho pedido, ainda por fazer: run() o faz e devolve a resposta; cost estima o trabalho
+# (jogadas x células), para decidir onde rodar (ver WumpusServer.start_line); agent é a sessão
+# (None em um "create", que não espera nenhuma sessão)
+_Job = collections.namedtuple("_Job", ["agent", "cost", "run"])
+
+
+class RequestError(Exception):
+    """Pedido inválido: vira uma resposta {"ok": false} sem fechar a conexão."""
+
+
+class SessionStore:
+    """Sessões (agente.InferenceAgent) por identificador, em ordem de uso (LRU) com limite e remoção por ociosidade.
+
+    Pode ser usado de várias threads: um "create" grande guarda a sessão da
+    thread que gerou o mapa (ver WumpusServer._create).
+    """
+
+    def __init__(self, max_sessions=10000, idle_timeout=300.0, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._sessions = collections.OrderedDict()  # id -> [agente, último uso], do menos ao mais recente
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "closed": 0, "evicted_lru": 0, "evicted_idle": 0}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, agent):
+        """Guarda um agente novo e devolve o identificador da sessão."""
+        with self._lock:
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.stats["evicted_lru"] += 1
+            session_id = next(self._ids)
+            self._sessions[session_id] = [agent, self.clock()]
+            self.stats["created"] += 1
+        return session_id
+
+    def get(self, session_id):
+        """O agente da sessão, marcando-a como usada agora."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                raise RequestError(f"sessão desconhecida: {session_id!r} (encerrada ou removida)")
+            entry[1] = self.clock()
+            self._sessions.move_to_end(session_id)
+        return entry[0]
+
+    def peek(self, session_id):
+        """O agente da sessão (ou None), sem marcá-la como usada."""
+        entry = self._sessions.get(session_id) if isinstance(session_id, int) else None
+        return entry[0] if entry is not None else None
+
+    def close(self, session_id):
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                raise RequestError(f"sessão desconhecida: {session_id!r} (encerrada ou removida)")
+            self.stats["closed"] += 1
+
+    def evict_idle(self):
+        """Remove as sessões sem uso há mais de idle_timeout segundos. Devolve quantas saíram."""
+        limit = self.clock() - self.idle_timeout
+        removed = 0
+        sessions = self._sessions
+        with self._lock:
+            # Em ordem de uso: basta olhar o começo até achar uma sessão recente
+            while sessions:
+                session_id, (_, last_used) = next(iter(sessions.items()))
+                if last_used > limit:
+                    break
+                del sessions[session_id]
+                removed += 1
+            self.stats["evicted_idle"] += removed
+        return removed
+
+
+def agent_state(agent, cells=False):
+    """Estado público de uma sessão (o agente e a percepção na sua posição), em tipos JSON."""
+    fedor, vento, brilho = agent.knowledge_base.get(agent.agent_pos, agent.sense_at_current_pos())
+    state = {
+        "grid_size": agent.GRID_SIZE,
+        "position": list(agent.agent_pos),
+        "percept": {"stench": fedor, "breeze": vento, "glitter": brilho},
+        "has_gold": agent.has_gold,
+        "game_over": agent.game_over,
+        "victory": agent.victory,
+        "steps": len(agent.history),
+    }
+    if cells:
+        state["visited"] = [list(c) for c in agent.visited]
+        state["safe"] = [list(c) for c in agent.safe]
+        state["danger"] = [list(c) for c in agent.danger]
+    return state
+
+
+class WumpusServer:
+    """Atende os pedidos de JSON por linha sobre um SessionStore."""
+
+    def __init__(self, store=None, max_grid_size=256, max_count=1000, inline_work=INLINE_WORK, workers=4):
+        self.store = store if store is not None else SessionStore()
+        self.max_grid_size = max_grid_size  # Limita a memória de um único "create"
+        self.max_count = max_count          # Limite de jogadas de um "step"/"back"
+        self.inline_work = inline_work      # Acima disso, as jogadas rodam em self.executor
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._locks = weakref.WeakKeyDictionary()  # Agente -> asyncio.Lock, das sessões com jogadas em uma thread
+        self.requests = 0
+        self.connections = 0
+        self._handlers = {"create": self._create, "step": self._step, "back": self._back, "state": self._state,
+                          "close": self._close, "stats": self._stats}
+
+    # --- Operações ---
+    def _session(self, request):
+        session_id = request.get("session")
+        if not isinstance(session_id, int):
+            raise RequestError('falta o campo inteiro "session"')
+        return self.store.get(session_id)
+
+    def _count(self, request):
+        count = request.get("count", 1)
+        if not isinstance(count, int) or not 0 <= count <= self.max_count:
+            raise RequestError(f'"count" deve ser um inteiro entre 0 e {self.max_count}')
+        return count
+
+    def _create(self, request):
+        options = {}
+        for name, kind in CREATE_OPTIONS.items():
+            if name in request:
+                value = request[name]
+                if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                    raise RequestError(f'"{name}" deve ser do tipo {kind.__name__}')
+                options[name] = value
+        if options.get("inference", "rules") not in INFERENCE_MODES:
+            raise RequestError(f'"inference" deve ser um de {list(INFERENCE_MODES)}')
+        n = options.get("grid_size", 4)
+        if not 2 <= n <= self.max_grid_size:
+            raise RequestError(f'"grid_size" deve estar entre 2 e {self.max_grid_size}')
+        hazards = options.get("num_holes", 2) + options.get("num_wumpus", 1)
+        if not 0 <= hazards <= MAX_HAZARD_DENSITY * n * n:
+            raise RequestError(f'"num_holes" + "num_wumpus" deve estar entre 0 e {MAX_HAZARD_DENSITY:.0%} '
+                               f'das {n * n} células')
+        cells = request.get("cells", False)
+
+        def run():
+            try:
+                agent = new_agent(**options)
+            except ValueError as error:  # Perigos demais para a grade
+                raise RequestError(str(error)) from None
+            session_id = self.store.create(agent)
+            return {"session": session_id, "state": agent_state(agent, cells)}
+        # Gerar o mapa custa algumas passadas pela grade: em grades grandes, roda em self.executor
+        return _Job(None, n * n, run)
+
+    def _step(self, request):
+        agent, count = self._session(request), self._count(request)
+        cells = request.get("cells", False)
+
+        def run():
+            for _ in range(count):
+                if agent.game_over or agent.victory:
+                    break
+                agent.step()
+            return {"state": agent_state(agent, cells)}
+        return _Job(agent, count * agent.GRID_SIZE ** 2, run)
+
+    def _back(self, request):
+        agent, count = self._session(request), self._count(request)
+        cells = request.get("cells", False)
+
+        def run():
+            agent.back(count)
+            return {"state": agent_state(agent, cells)}
+        # back() refaz no máximo as jogadas desde o retrato anterior (ver InferenceAgent.back)
+        replayed = min(len(agent.history), agent._checkpoint_interval) if count else 0
+        return _Job(agent, replayed * agent.GRID_SIZE ** 2, run)
+
+    def _state(self, request):
+        return {"state": agent_state(self._session(request), request.get("cells", False))}
+
+    def _close(self, request):
+        self._session(request)
+        self.store.close(request["session"])
+        return {}
+
+    def _stats(self, request):
+        return {"stats": dict(self.store.stats, sessions=len(self.store), requests=self.requests,
+                              connections=self.connections, cpu_seconds=time.process_time())}
+
+    @staticmethod
+    def _encode(request, response):
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        return (json.dumps(response, separators=(",", ":")) + "\n").encode()
+
+    def _parse(self, line):
+        """Pedido de uma linha. Devolve (pedido, None) ou (pedido ou None, resposta de erro)."""
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("o pedido deve ser um objeto JSON")
+            if request.get("op") not in self._handlers:
+                raise RequestError(f"operação desconhecida: {request.get('op')!r} (use uma de {list(self._handlers)})")
+        except (RequestError, json.JSONDecodeError, UnicodeDecodeError) as error:
+            return request, self._encode(request, {"ok": False, "error": str(error)})
+        return request, None
+
+    def _call(self, request, function=None):
+        """Roda o handler do pedido (ou function, as jogadas de um _Job) e devolve a linha de resposta.
+
+        Um _Job devolvido pelo handler volta como está: as jogadas ainda não foram feitas.
+        """
+        try:
+            response = function() if function is not None else self._handlers[request["op"]](request)
+            if isinstance(response, _Job):
+                return response
+            response["ok"] = True
+        except RequestError as error:
+            response = {"ok": False, "error": str(error)}
+        except Exception as error:  # Um erro em uma sessão não derruba a conexão nem o servidor
+            response = {"ok": False, "error": f"erro interno: {error!r}"}
+        return self._encode(request, response)
+
+    def handle_line(self, line):
+        """Resposta (uma linha, com o \\n) a uma linha de pedido, com as jogadas feitas aqui mesmo."""
+        self.requests += 1
+        request, error = self._parse(line)
+        if error is not None:
+            return error
+        response = self._call(request)
+        if isinstance(response, _Job):
+            response = self._call(request, response.run)
+        return response
+
+    def start_line(self, line):
+        """Como handle_line, mas sem bloquear o laço de eventos.
+
+        Devolve a resposta (bytes) se o pedido é rápido e a sessão não tem
+        jogadas em andamento em uma thread; senão, uma corrotina que espera a
+        sessão ficar livre, roda as jogadas ou gera o mapa de um "create" (em
+        self.executor, se passarem de inline_work) e devolve a resposta.
+        """
+        self.requests += 1
+        request, error = self._parse(line)
+        if error is not None:
+            return error
+        agent = self.store.peek(request.get("session"))
+        lock = self._locks.get(agent) if agent is not None else None
+        if lock is not None and lock.locked():
+            return self._run_later(request, agent)
+        response = self._call(request)
+        if not isinstance(response, _Job):
+            return response
+        if response.cost <= self.inline_work:
+            return self._call(request, response.run)
+        return self._run_later(request, response.agent, response)
+
+    async def _run_later(self, request, agent, job=None):
+        """Atende o pedido quando a sessão (o agente agent) estiver livre, com as jogadas longas em uma thread.
+
+        Sem sessão (agent None, um "create"), não há o que esperar: só roda job em uma thread.
+        """
+        if agent is None:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._call, request, job.run)
+        lock = self._locks.get(agent)
+        if lock is None:
+            lock = self._locks[agent] = asyncio.Lock()
+        async with lock:
+            if job is None:
+                job = self._call(request)  # A sessão pode ter mudado (ou sumido) enquanto esperava
+                if not isinstance(job, _Job):
+                    return job
+            if job.cost <= self.inline_work:
+                return self._call(request, job.run)
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._call, request, job.run)
+
+    # --- Rede ---
+    def _protocol(self):
+        return _LineProtocol(self)
+
+    async def evict_idle_forever(self, interval=None):
+        """Remove as sessões ociosas a cada interval segundos (padrão: um quarto de idle_timeout)."""
+        interval = interval or max(0.05, self.store.idle_timeout / 4)
+        while True:
+            await asyncio.sleep(interval)
+            self.store.evict_idle()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None, ready=None):
+        """Atende até ser cancelado. ready(endereços) é chamado quando o servidor começa a escutar."""
+        loop = asyncio.get_running_loop()
+        if unix_path is not None:
+            server = await loop.create_unix_server(self._protocol, unix_path)
+        else:
+            server = await loop.create_server(self._protocol, host, port)
+        sweeper = asyncio.create_task(self.evict_idle_forever())
+        try:
+            async with server:
+                if ready is not None:
+                    ready([sock.getsockname() for sock in server.sockets])
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+
+class _LineProtocol(asyncio.Protocol):
+    """Uma conexão: separa as linhas recebidas e responde a todas as que chegaram juntas com uma só escrita.
+
+    Sem corrotina por pedido (como com StreamReader.readline) o custo por
+    pedido cai bastante. Quando um pedido precisa esperar (ver
+    WumpusServer.start_line), ele e os seguintes passam para uma tarefa que
+    os responde em ordem, e a conexão para de ler até ela terminar. Se o
+    cliente não lê as respostas, também para de ler os pedidos até o buffer
+    de saída esvaziar.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = b""
+        self.pending = collections.deque()  # Pedidos que esperam a tarefa self.worker
+        self.worker = None
+        self.writing_paused = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections += 1
+
+    def connection_lost(self, exc):
+        self.server.connections -= 1
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def data_received(self, data):
+        buffer = self.buffer + data if self.buffer else data
+        *lines, self.buffer = buffer.split(b"\n")
+        lines = [line for line in lines if line.strip()]
+        if self.worker is not None:
+            self.pending.extend(lines)
+        else:
+            self._answer(lines)
+        if len(self.buffer) > MAX_LINE:
+            self.transport.write(b'{"ok":false,"error":"pedido grande demais"}\n')
+            self.transport.close()
+
+    def _answer(self, lines):
+        """Responde às linhas em ordem; a partir da primeira que precisa esperar, passa para self.worker."""
+        responses = []
+        for k, line in enumerate(lines):
+            response = self.server.start_line(line)
+            if not isinstance(response, bytes):
+                self.pending.extend(lines[k + 1:])
+                self.worker = asyncio.ensure_future(self._drain(response))
+                self.transport.pause_reading()
+                break
+            responses.append(response)
+        if responses:
+            self.transport.write(b"".join(responses))
+
+    async def _drain(self, waiting):
+        """Espera a resposta em andamento e atende os pedidos guardados, um por vez."""
+        try:
+            while waiting is not None:
+                response = await waiting
+                if self.transport.is_closing():
+                    return
+                self.transport.write(response)
+                waiting = None
+                while self.pending and waiting is None:
+                    response = self.server.start_line(self.pending.popleft())
+                    if isinstance(response, bytes):
+                        self.transport.write(response)
+                    else:
+                        waiting = response
+        finally:
+            self.worker = None
+            if not self.transport.is_closing() and not self.writing_paused:
+                self.transport.resume_reading()
+
+    def pause_writing(self):
+        self.writing_paused = True
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.writing_paused = False
+        if self.worker is None:
+            self.transport.resume_reading()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de sessões do Mundo do Wumpus (JSON por linha).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765, help="porta TCP (0 = qualquer porta livre)")
+    parser.add_argument("--unix", metavar="CAMINHO", help="escuta em um socket Unix em vez de TCP")
+    parser.add_argument("--max-sessoes", type=int, default=10000, help="sessões guardadas (LRU)")
+    parser.add_argument("--ociosidade", type=float, default=300.0,
+                        help="segundos sem uso até a sessão ser removida")
+    parser.add_argument("--max-grade", type=int, default=256, help="maior grade aceita em create")
+    parser.add_argument("--max-jogadas", type=int, default=1000, help='maior "count" de step/back')
+    parser.add_argument("--threads", type=int, default=4, help='threads para os "step"/"back" longos')
+    args = parser.parse_args(argv)
+
+    server = WumpusServer(SessionStore(args.max_sessoes, args.ociosidade), max_grid_size=args.max_grade,
+                          max_count=args.max_jogadas, workers=args.threads)
+
+    def ready(addresses):
+        for address in addresses:
+            print(f"Escutando em {address if isinstance(address, str) else '%s:%d' % address[:2]}", flush=True)
+
+    try:
+        asyncio.run(server.serve(args.host, args.porta, args.unix, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
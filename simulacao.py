@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Simulação em lote (sem interface gráfica) do Mundo do Wumpus.
+
+Joga episódios completos do agente usando apenas reset()/step(),
+sem carregar o Pygame, para avaliar o agente em muitos mapas de uma vez.
+Cada episódio usa uma semente própria (passada ao gerador do próprio
+mundo), então o mesmo intervalo de sementes sempre gera os mesmos mapas
+e os mesmos resultados, com qualquer número de processos.
+
+Uso:
+    python simulacao.py --episodios 100000 --semente 0
+    python simulacao.py --episodios 1000 --grade 16 --buracos 20 --wumpus 2
+    python simulacao.py --episodios 1000000 --processos 0   # todos os núcleos
+    python simulacao.py --episodios 1000 --gravar episodios.wump   # ver gravacao.py
+    python simulacao.py --episodios 200 --planejador --orcamento-ms 20   # ver busca.py
+    python simulacao.py --episodios 1000 --perfil perfil.json   # ver instrumentacao.py
+    python simulacao.py --episodios 100000 --solucoes .solucoes   # ver solucoes.py
+    python simulacao.py --episodios 1000 --inferencia belief --probabilistico --ruido-vento 0.05 0.1   # ver crencas.py
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import os
+import time
+
+from busca import MonteCarloPlanner
+from gravacao import EpisodeRecorder
+from instrumentacao import Instrumentation
+from agente import INFERENCE_MODES, new_agent
+from mundo import GRID_SIZE, PerceptNoise
+from solucoes import SolutionTable, open_table, table_path
+
+# Resultado de um único episódio (optimal_steps: o oráculo de solucoes.py, se disponível)
+EpisodeResult = collections.namedtuple("EpisodeResult", ["seed", "victory", "game_over", "stuck", "steps",
+                                                         "optimal_steps"], defaults=[None])
+
+
+def progress_key(agent):
+    """Resumo do estado que muda sempre que step() faz alguma coisa.
+
+    Se dois passos seguidos deixam esse resumo igual, o agente ficou parado
+    para sempre (step() sem movimento nem inferência nova é determinístico).
+    """
+    return agent.agent_pos, len(agent.visited), len(agent.safe), len(agent.danger)
+
+
+def run_episode(seed, max_steps=1000, world_options=None, recorder=None, solutions=None):
+    """Joga um episódio até vitória, derrota, travamento ou limite de passos.
+
+    world_options são repassadas a agente.new_agent (grid_size, num_holes, num_wumpus, noise, inference,
+    probabilistic, planner, instrumentation).
+    Com um gravacao.EpisodeRecorder em recorder, cada jogada também é gravada.
+    solutions é um diretório de tabelas de solucoes.py: se a semente estiver na
+    tabela da configuração, o mapa vem de lá (sem gerar) e o resultado traz o oráculo.
+    """
+    options = dict(world_options or {})
+    table = None
+    if solutions is not None:
+        table = open_table(solutions, options.get("grid_size", GRID_SIZE), options.get("num_holes", 2),
+                           options.get("num_wumpus", 1))
+    if table is not None and seed in table:
+        agent = new_agent(verbose=False, seed=seed, preset=table.preset(seed), **options)
+    else:
+        table = None
+        agent = new_agent(verbose=False, seed=seed, **options)
+    steps = 0
+    if recorder is not None:
+        recorder.begin(agent, seed)
+
+    while not agent.game_over and not agent.victory and steps < max_steps:
+        previous = progress_key(agent)
+        agent.step()
+        if recorder is not None:
+            recorder.record(agent)
+        if progress_key(agent) == previous:
+            break
+        steps += agent.agent_pos != previous[0]
+
+    stuck = not agent.game_over and not agent.victory
+    optimal = table.optimal_steps(seed) if table is not None else None
+    return EpisodeResult(seed, agent.victory, agent.game_over, stuck, steps, optimal)
+
+
+def count_results(results):
+    """Conta vitórias, derrotas, travamentos e passos de uma lista de episódios."""
+    counts = collections.Counter(episodes=0, victories=0, game_overs=0, stuck=0, steps=0)
+    for r in results:
+        counts["episodes"] += 1
+        counts["victories"] += r.victory
+        counts["game_overs"] += r.game_over
+        counts["stuck"] += r.stuck
+        counts["steps"] += r.steps
+        if r.victory and r.optimal_steps is not None:
+            counts["scored_victories"] += 1
+            counts["scored_steps"] += r.steps
+            counts["optimal_steps"] += r.optimal_steps
+    return counts
+
+
+def summarize(counts, elapsed):
+    """Transforma as contagens agregadas em um dicionário de estatísticas."""
+    total = counts["episodes"]
+    victories = counts["victories"]
+    steps = counts["steps"]
+    summary = {
+        "episodes": total,
+        "victories": victories,
+        "game_overs": counts["game_overs"],
+        "stuck": counts["stuck"],
+        "win_rate": victories / total if total else 0.0,
+        "mean_steps": steps / total if total else 0.0,
+        "elapsed": elapsed,
+        "episodes_per_second": total / elapsed if elapsed > 0 else float("inf"),
+    }
+    if counts["scored_victories"]:
+        # Vitórias comparadas com o oráculo: passos do agente / passos do caminho ótimo
+        summary["scored_victories"] = counts["scored_victories"]
+        summary["steps_over_optimal"] = counts["scored_steps"] / counts["optimal_steps"]
+    return summary
+
+
+def run_seed_range(first_seed, last_seed, max_steps=1000, world_options=None, recorder=None, solutions=None):
+    """Joga as sementes do intervalo [first_seed, last_seed) e devolve as contagens."""
+    return count_results(run_episode(seed, max_steps, world_options, recorder, solutions)
+                         for seed in range(first_seed, last_seed))
+
+
+def run_batch(num_episodes, first_seed=0, max_steps=1000, world_options=None):
+    """Joga num_episodes episódios com sementes consecutivas e devolve o resumo."""
+    start = time.perf_counter()
+    counts = run_seed_range(first_seed, first_seed + num_episodes, max_steps, world_options)
+    return summarize(counts, time.perf_counter() - start)
+
+
+def shard_seeds(first_seed, num_episodes, num_shards):
+    """Divide o intervalo de sementes em até num_shards fatias contíguas."""
+    num_shards = max(1, min(num_shards, num_episodes))
+    size, extra = divmod(num_episodes, num_shards)
+    shards = []
+    start = first_seed
+    for i in range(num_shards):
+        end = start + size + (1 if i < extra else 0)
+        shards.append((start, end))
+        start = end
+    return shards
+
+
+def run_parallel(num_episodes, first_seed=0, max_steps=1000, workers=None, shards_per_worker=4, world_options=None,
+                 recorder=None, solutions=None):
+    """Distribui as sementes entre processos e junta as contagens de todos eles.
+
+    Como cada episódio depende apenas da sua semente, o resultado agregado é
+    o mesmo de run_batch() para qualquer número de processos. A gravação
+    (recorder) só é possível com um único processo; as tabelas de soluções
+    (solutions, um diretório) são abertas uma vez em cada processo.
+    """
+    workers = workers or os.cpu_count() or 1
+    if recorder is not None and workers != 1:
+        raise ValueError("a gravação de episódios usa um único processo")
+    start = time.perf_counter()
+    if workers == 1:
+        counts = run_seed_range(first_seed, first_seed + num_episodes, max_steps, world_options, recorder, solutions)
+    else:
+        counts = collections.Counter(episodes=0, victories=0, game_overs=0, stuck=0, steps=0)
+        shards = shard_seeds(first_seed, num_episodes, workers * shards_per_worker)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_seed_range, a, b, max_steps, world_options, None, solutions) for a, b in shards]
+            for future in concurrent.futures.as_completed(futures):
+                counts.update(future.result())
+    return summarize(counts, time.perf_counter() - start)
+
+
+def print_summary(summary):
+    """Mostra o resumo de uma avaliação em lote."""
+    print(f"Episódios:           {summary['episodes']}")
+    print(f"Vitórias:            {summary['victories']} ({summary['win_rate']:.2%})")
+    print(f"Game over:           {summary['game_overs']}")
+    print(f"Travados:            {summary['stuck']}")
+    print(f"Passos por episódio: {summary['mean_steps']:.2f}")
+    if "steps_over_optimal" in summary:
+        print(f"Passos / ótimo:      {summary['steps_over_optimal']:.3f} "
+              f"(nas {summary['scored_victories']} vitórias com oráculo)")
+    print(f"Tempo total:         {summary['elapsed']:.2f} s")
+    print(f"Episódios por seg.:  {summary['episodes_per_second']:.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avalia o agente do Mundo do Wumpus sem interface gráfica.")
+    parser.add_argument("-n", "--episodios", type=int, default=1000, help="número de mapas a jogar")
+    parser.add_argument("-s", "--semente", type=int, default=0, help="semente do primeiro mapa")
+    parser.add_argument("--max-passos", type=int, default=1000, help="limite de passos por episódio")
+    parser.add_argument("-p", "--processos", type=int, default=1, help="processos em paralelo (0 = todos os núcleos)")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    parser.add_argument("--inferencia", choices=INFERENCE_MODES, default="rules", help="motor de inferência do agente")
+    parser.add_argument("--probabilistico", action="store_true",
+                        help="sem células seguras, arrisca a de menor probabilidade de perigo")
+    parser.add_argument("--ruido-fedor", nargs=2, type=float, metavar=("FP", "FN"),
+                        help="sensor de fedor com ruído: probabilidades de falso positivo e de falso negativo")
+    parser.add_argument("--ruido-vento", nargs=2, type=float, metavar=("FP", "FN"),
+                        help="sensor de vento com ruído: probabilidades de falso positivo e de falso negativo")
+    parser.add_argument("--planejador", action="store_true",
+                        help="escolhe as apostas simulando mapas sorteados (busca.MonteCarloPlanner)")
+    parser.add_argument("--orcamento-ms", type=float, default=50.0,
+                        help="tempo por decisão do planejador, em ms (0 = sem limite, use --iteracoes)")
+    parser.add_argument("--iteracoes", type=int, help="simulações por decisão do planejador")
+    parser.add_argument("--trabalhadores", type=int, default=1, help="processos de cada planejador")
+    parser.add_argument("--gravar", metavar="ARQUIVO", help="grava os episódios (com um único processo)")
+    parser.add_argument("--solucoes", metavar="DIRETORIO",
+                        help="lê os mapas e o oráculo das tabelas de solucoes.py (gerando as que faltarem)")
+    parser.add_argument("--perfil", metavar="ARQUIVO",
+                        help="conta as regras e cronometra as jogadas; salva em JSON (ou CSV, se ARQUIVO.csv)")
+    args = parser.parse_args(argv)
+    if args.gravar and args.processos != 1:
+        parser.error("--gravar usa um único processo (--processos 1)")
+    if args.perfil and args.processos != 1:
+        parser.error("--perfil usa um único processo (--processos 1)")
+    if args.planejador and not args.orcamento_ms and args.iteracoes is None:
+        parser.error("--orcamento-ms 0 exige --iteracoes")
+
+    world_options = {"grid_size": args.grade, "num_holes": args.buracos, "num_wumpus": args.wumpus,
+                     "inference": args.inferencia, "probabilistic": args.probabilistico}
+    if args.ruido_fedor or args.ruido_vento:
+        world_options["noise"] = PerceptNoise(*(args.ruido_fedor or (0.0, 0.0)), *(args.ruido_vento or (0.0, 0.0)))
+    if args.planejador:
+        world_options["planner"] = MonteCarloPlanner(time_budget=args.orcamento_ms / 1000 or None,
+                                                     iterations=args.iteracoes, workers=args.trabalhadores,
+                                                     seed=args.semente)
+    if args.perfil:
+        world_options["instrumentation"] = Instrumentation()
+    if args.solucoes:
+        path = table_path(args.solucoes, args.grade, args.buracos, args.wumpus)
+        with SolutionTable(path, args.grade, args.buracos, args.wumpus, args.semente) as table:
+            if args.semente >= table.first_seed:
+                table.fill(args.semente + args.episodios)
+    recorder = EpisodeRecorder(args.gravar) if args.gravar else None
+    try:
+        print_summary(run_parallel(args.episodios, args.semente, args.max_passos,
+                                   workers=args.processos or None, world_options=world_options, recorder=recorder,
+                                   solutions=args.solucoes))
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if args.planejador:
+            world_options["planner"].close()
+    if args.perfil:
+        probe = world_options["instrumentation"]
+        probe.export(args.perfil)
+        print()
+        print(probe.report())
+
+
+if __name__ == "__main__":
+    main()
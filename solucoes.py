@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Cache persistente de mapas por semente, com o oráculo do caminho ótimo.
+
+Toda avaliação repete os mesmos mapas (uma semente por episódio) e, a cada
+vez, gera o mapa, calcula as percepções e procura o caminho até o ouro. Este
+módulo guarda isso em disco, uma tabela por configuração (tamanho da grade,
+buracos, Wumpus), com um registro de tamanho fixo por semente:
+- o ouro e o comprimento do caminho ótimo com informação completa (ida até
+  o ouro e volta ao início, em movimentos: o oráculo);
+- os perigos (Wumpus primeiro, depois buracos);
+- a semente das jogadas (WumpusWorld.play_seed, 64 bits), para que o mundo
+  criado a partir do cache jogue exatamente as mesmas jogadas que
+  WumpusWorld(seed=semente);
+- as percepções (um byte por célula, como WumpusWorld._percept_flags).
+
+Os arquivos são lidos com mmap: abrir uma tabela não lê nada, e cada mundo
+lê só o seu registro. SolutionTable.world(semente) cria o mundo sem gerar
+o mapa (ou preset(semente), para agente.new_agent), e optimal_steps(semente)
+dá o oráculo para pontuar o agente.
+
+Formato (little-endian): cabeçalho "<8sIIIqQ" (MAGIC, grade, buracos,
+Wumpus, primeira semente, quantidade de registros) seguido dos registros,
+em ordem de semente. Registros novos são acrescentados no fim e a
+quantidade no cabeçalho é atualizada por último, então um arquivo
+interrompido no meio de fill() continua válido.
+
+Uso:
+    python solucoes.py --grade 4 --buracos 2 --episodios 100000
+    python simulacao.py --episodios 100000 --solucoes .solucoes
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+
+from mundo import MapPreset, WumpusWorld
+
+MAGIC = b"WUMPSOL2"
+_HEADER = struct.Struct("<8sIIIqQ")
+# Começo de cada registro: ouro e oráculo
+_PREFIX = struct.Struct("<II")
+# Diretório padrão das tabelas
+DEFAULT_DIRECTORY = ".solucoes"
+
+
+def table_path(directory, grid_size, num_holes, num_wumpus):
+    """Arquivo da tabela de uma configuração."""
+    return os.path.join(directory, f"mapas-{grid_size}x{grid_size}-b{num_holes}-w{num_wumpus}.wsol")
+
+
+def optimal_steps(world):
+    """Movimentos do caminho ótimo com informação completa: do início ao ouro e de volta.
+
+    Usa a mesma busca em largura da geração de mapas (_is_path_valid). O grafo
+    não é direcionado, então a volta tem o mesmo comprimento da ida.
+    """
+    obstacles = set(world.wumpuses) | set(world.holes)
+    found, path = world._is_path_valid(world.start_pos, world.gold, obstacles, world.GRID_SIZE)
+    if not found:
+        raise ValueError(f"ouro inalcançável em {world.gold}")  # O gerador nunca produz esse mapa
+    return 2 * (len(path) - 1)
+
+
+class SolutionTable:
+    """Registros de uma configuração, para as sementes [first_seed, first_seed + len(self))."""
+
+    def __init__(self, path, grid_size=None, num_holes=None, num_wumpus=None, first_seed=0):
+        """Abre a tabela em path, criando-a (com a configuração dada) se ainda não existir."""
+        self.path = path
+        if not os.path.exists(path):
+            if grid_size is None or num_holes is None or num_wumpus is None:
+                raise FileNotFoundError(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, grid_size, num_holes, num_wumpus, first_seed, 0))
+        self._file = open(path, "r+b")
+        magic, n, holes, wumpus, first, count = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} não é uma tabela de soluções")
+        if grid_size is not None and (grid_size, num_holes, num_wumpus) != (n, holes, wumpus):
+            self._file.close()
+            raise ValueError(f"{path} guarda a configuração {n}x{n}, {holes} buracos, {wumpus} Wumpus")
+        self.grid_size, self.num_holes, self.num_wumpus = n, holes, wumpus
+        self.first_seed = first
+        self._count = count
+        # Ouro, oráculo e perigos, depois a semente das jogadas
+        self._words = struct.Struct(f"<{2 + wumpus + holes}IQ")
+        self.record_size = self._words.size + n * n
+        self._map = None
+        self._remap()
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._count:
+            self._map = mmap.mmap(self._file.fileno(), _HEADER.size + self._count * self.record_size,
+                                  access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, seed):
+        return self.first_seed <= seed < self.first_seed + self._count
+
+    def _offset(self, seed):
+        if seed not in self:
+            raise KeyError(f"semente {seed} fora da tabela ({self.first_seed} a {self.first_seed + self._count - 1})")
+        return _HEADER.size + (seed - self.first_seed) * self.record_size
+
+    def fill(self, last_seed):
+        """Gera e grava os registros que faltam até last_seed (exclusive). Devolve quantos foram gravados."""
+        start = self.first_seed + self._count
+        if last_seed <= start:
+            return 0
+        n = self.grid_size
+        self._file.seek(_HEADER.size + self._count * self.record_size)
+        self._file.truncate()  # Descarta um registro incompleto de um fill() interrompido
+        for seed in range(start, last_seed):
+            world = WumpusWorld(seed=seed, grid_size=n, num_holes=self.num_holes, num_wumpus=self.num_wumpus)
+            hazards = [x * n + y for x, y in world.wumpuses + world.holes]
+            self._file.write(self._words.pack(world.gold[0] * n + world.gold[1], optimal_steps(world),
+                                              *hazards, world.play_seed))
+            self._file.write(world._percept_flags)
+        self._file.flush()
+        self._count += last_seed - start
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, n, self.num_holes, self.num_wumpus, self.first_seed, self._count))
+        self._file.flush()
+        self._remap()
+        return last_seed - start
+
+    def optimal_steps(self, seed):
+        """Movimentos do caminho ótimo (ida ao ouro e volta) no mapa da semente."""
+        return _PREFIX.unpack_from(self._map, self._offset(seed))[1]
+
+    def preset(self, seed):
+        """O mapa da semente como mundo.MapPreset."""
+        offset = self._offset(seed)
+        words = self._words.unpack_from(self._map, offset)
+        n = self.grid_size
+        hazards = [divmod(i, n) for i in words[2:-1]]
+        percepts = self._map[offset + self._words.size:offset + self.record_size]
+        return MapPreset(hazards[:self.num_wumpus], hazards[self.num_wumpus:], divmod(words[0], n), percepts,
+                         words[-1])
+
+    def world(self, seed, **options):
+        """O mesmo mundo de WumpusWorld(seed=seed, ...), sem gerar o mapa.
+
+        options são repassadas ao WumpusWorld (noise, instrumentation; grid_size,
+        num_holes e num_wumpus são os da tabela). O agente que jogar nele faz as
+        mesmas jogadas que no mundo gerado.
+        """
+        return WumpusWorld(seed=seed, grid_size=self.grid_size, num_holes=self.num_holes,
+                           num_wumpus=self.num_wumpus, preset=self.preset(seed), **options)
+
+
+# Tabelas já abertas neste processo, por arquivo (ver open_table)
+_open_tables = {}
+
+
+def open_table(directory, grid_size, num_holes, num_wumpus):
+    """A tabela da configuração no diretório, aberta uma única vez por processo (ou None se não existir)."""
+    path = table_path(directory, grid_size, num_holes, num_wumpus)
+    table = _open_tables.get(path)
+    if table is None and os.path.exists(path):
+        table = _open_tables[path] = SolutionTable(path, grid_size, num_holes, num_wumpus)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera a tabela de mapas e oráculos de uma configuração.")
+    parser.add_argument("--diretorio", default=DEFAULT_DIRECTORY, help="onde ficam as tabelas")
+    parser.add_argument("-n", "--episodios", type=int, default=10000, help="sementes a guardar")
+    parser.add_argument("-s", "--semente", type=int, default=0, help="primeira semente (só ao criar a tabela)")
+    parser.add_argument("--grade", type=int, default=4, help="tamanho da grade (N x N)")
+    parser.add_argument("--buracos", type=int, default=2, help="quantidade de buracos")
+    parser.add_argument("--wumpus", type=int, default=1, help="quantidade de Wumpus")
+    args = parser.parse_args(argv)
+
+    path = table_path(args.diretorio, args.grade, args.buracos, args.wumpus)
+    with SolutionTable(path, args.grade, args.buracos, args.wumpus, args.semente) as table:
+        start = time.perf_counter()
+        added = table.fill(table.first_seed + args.episodios)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {added} registros novos em {elapsed:.2f} s; sementes {table.first_seed} a "
+              f"{table.first_seed + len(table) - 1} ({table.record_size} bytes por registro)")
+
+
+if __name__ == "__main__":
+    main()
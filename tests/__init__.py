@@ -0,0 +1,6 @@
+"""
+Testes do Mundo do Wumpus.
+
+Execute a partir da raiz do repositório:
+    python -m pytest -q
+"""
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Testes do agente: contadores da inferência incremental, back (volta de jogadas) e retratos (snapshot, restore, fork)."""
+
+import random
+
+import pytest
+
+from agente import new_agent
+from mundo import PerceptNoise
+from tests.test_planejamento import bfs
+
+CONFIGS = [
+    dict(grid_size=8, num_holes=6),
+    dict(grid_size=6, num_holes=4, num_wumpus=2),
+    dict(grid_size=10, num_holes=10, probabilistic=True),
+]
+TIMELINE_CONFIGS = [
+    dict(),
+    dict(grid_size=8, num_holes=6, probabilistic=True),
+    dict(grid_size=6, num_holes=4, num_wumpus=2),
+    dict(inference="sat"),
+]
+# Grades em que o episódio passa de vários pontos de retorno (CHECKPOINT_INTERVAL)
+LONG_CONFIGS = [
+    dict(grid_size=16, num_holes=12, probabilistic=True),
+    dict(grid_size=12, num_holes=8, inference="sat", probabilistic=True),
+    dict(grid_size=16, num_holes=12, inference="belief", probabilistic=True, noise=PerceptNoise(.05, .05, .05, .05)),
+]
+
+
+def check_bookkeeping(agent):
+    n = agent.GRID_SIZE
+    cells = [(x, y) for x in range(n) for y in range(n)]
+    knowledge = agent.knowledge_base
+    for x, y in cells:
+        i = x * n + y
+        adjacent = agent.get_adjacent(x, y)
+        assert agent._safe_neighbors[i] == sum(a in agent.safe for a in adjacent)
+        assert agent._stench_count[i] == sum(knowledge[a][0] for a in adjacent if a in knowledge)
+        assert agent._breeze_count[i] == sum(knowledge[a][1] for a in adjacent if a in knowledge)
+    assert set(agent.unknown) == {c for c in cells if c not in agent.safe and c not in agent.danger}
+    assert agent._frontier == {c for c in agent.safe if c not in agent.danger and c not in agent.visited}
+    assert agent._percept_cells == {c for c, (fedor, vento, _) in knowledge.items() if fedor or vento}
+    assert agent._holes_found == len(agent.danger & set(agent.world.holes))
+    assert agent._wumpus_found == len(agent.danger & set(agent.world.wumpuses))
+
+    # Toda célula em que a regra 2 (eliminação) ainda tem o que inferir está na fila de reexame
+    for cell in agent._percept_cells:
+        open_neighbors = [a for a in agent.get_adjacent(*cell) if a not in agent.safe]
+        if len(open_neighbors) == 1 and open_neighbors[0] in agent.unknown:
+            assert cell in agent._dirty
+
+    # Campos de distância sobre as células seguras e não perigosas
+    walkable = {x * n + y for x, y in agent.safe if (x, y) not in agent.danger}
+    home = {agent.start_pos[0] * n + agent.start_pos[1]}
+    frontier = {x * n + y for x, y in agent._frontier}
+    assert list(agent._home_field._dist) == bfs(n, walkable, home)
+    assert list(agent._explore_field._dist) == bfs(n, walkable, frontier)
+
+
+@pytest.mark.parametrize("options", CONFIGS)
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_state_matches_recount(seed, options):
+    agent = new_agent(verbose=False, seed=seed, **options)
+    check_bookkeeping(agent)
+    for _ in range(200):
+        previous = agent.agent_pos
+        agent.step()
+        check_bookkeeping(agent)
+        if agent.game_over or agent.victory or agent.agent_pos == previous:
+            break
+    # Voltar restaura os contadores junto com o resto do estado
+    agent.back(5)
+    check_bookkeeping(agent)
+
+
+def test_sizes_are_per_instance():
+    """Mundos de tamanhos diferentes jogados intercalados jogam como se estivessem sozinhos."""
+    sizes = [dict(grid_size=4), dict(grid_size=9, num_holes=8, num_wumpus=2), dict(grid_size=20, num_holes=30)]
+    alone = []
+    for options in sizes:
+        agent = new_agent(verbose=False, seed=2, **options)
+        alone.append(play(agent, 80))
+    agents = [new_agent(verbose=False, seed=2, **options) for options in sizes]
+    states = [{0: observe(agent)} for agent in agents]
+    for _ in range(80):
+        for agent, recorded in zip(agents, states):
+            agent.step()
+            recorded.setdefault(len(agent.history), observe(agent))
+    assert states == alone
+    assert [agent.GRID_SIZE for agent in agents] == [4, 9, 20]
+
+
+def observe(agent):
+    """O estado visível do agente (inclusive o gerador e as crenças), para comparar duas linhas do tempo."""
+    engine = agent.inference_engine
+    beliefs = (list(engine.pit), list(engine.wumpus)) if hasattr(engine, "pit") else None
+    return (agent.agent_pos, bytes(agent._cells.flags), dict(agent.knowledge_base), agent.has_gold,
+            agent.game_over, agent.victory, sorted(agent._frontier), list(agent.history), agent.rng.getstate(),
+            beliefs, agent._holes_found, agent._wumpus_found)
+
+
+def play(agent, steps):
+    """Joga steps jogadas e devolve o estado logo depois de cada movimento, por tamanho do histórico."""
+    states = {0: observe(agent)}
+    for _ in range(steps):
+        agent.step()
+        states.setdefault(len(agent.history), observe(agent))
+    return states
+
+
+@pytest.mark.parametrize("options", TIMELINE_CONFIGS)
+@pytest.mark.parametrize("seed", range(6))
+def test_back_undoes_each_step(seed, options):
+    agent = new_agent(verbose=False, seed=seed, **options)
+    states = play(agent, 60)
+    while agent.history:
+        agent.back()
+        assert observe(agent) == states[len(agent.history)]
+    # Refazer as jogadas chega aos mesmos estados
+    for k in range(1, max(states) + 1):
+        while len(agent.history) < k:
+            agent.step()
+        assert observe(agent) == states[k]
+
+
+@pytest.mark.parametrize("options", LONG_CONFIGS)
+@pytest.mark.parametrize("seed", range(3))
+def test_back_count_matches_fresh_agent(seed, options):
+    agent = new_agent(verbose=False, seed=seed, **options)
+    states = play(agent, 250)
+    rng = random.Random(seed)
+    while agent.history:
+        agent.back(rng.randint(1, 80))
+        played = len(agent.history)
+        assert observe(agent) == states[played]
+        fresh = new_agent(verbose=False, seed=seed, **options)
+        while len(fresh.history) < played:
+            fresh.step()
+        assert observe(fresh) == observe(agent)
+        if rng.random() < 0.3:
+            # Jogar depois de voltar segue a mesma linha do tempo
+            for _ in range(rng.randint(1, 40)):
+                moves = len(agent.history)
+                agent.step()
+                if len(agent.history) > moves:
+                    assert observe(agent) == states.get(len(agent.history))
+
+
+@pytest.mark.parametrize("seed", [0, 6, 20])
+def test_history_holds_only_moves(seed):
+    """Jogadas paradas (o agente de regras travado) não entram no histórico, e back() as desfaz junto."""
+    agent = new_agent(verbose=False, seed=seed, grid_size=6, num_holes=4)
+    states, idle = {0: observe(agent)}, 0
+    for _ in range(60):
+        ended, moves = agent.game_over or agent.victory, len(agent.history)
+        agent.step()
+        idle += len(agent.history) == moves and not ended
+        states.setdefault(len(agent.history), observe(agent))
+    moves = len(agent.history)
+    assert idle and max(states) == moves
+    for before, after in zip(agent.history, agent.history[1:] + [agent.agent_pos]):
+        assert after in agent.get_adjacent(*before)
+    agent.back()
+    assert len(agent.history) == moves - 1 and observe(agent) == states[moves - 1]
+
+
+def test_back_past_start_resets():
+    agent = new_agent(verbose=False, seed=3)
+    initial = observe(agent)
+    for _ in range(5):
+        agent.step()
+    agent.back(100)
+    assert observe(agent) == initial
+
+
+def observe_fields(agent):
+    """observe() mais os campos de distância, que os retratos também compartilham."""
+    return observe(agent), agent._home_field._dist.tobytes(), agent._explore_field._dist.tobytes()
+
+
+@pytest.mark.parametrize("options", TIMELINE_CONFIGS)
+@pytest.mark.parametrize("seed", range(6))
+def test_restore_replays_same_steps(seed, options):
+    agent = new_agent(verbose=False, seed=seed, **options)
+    for _ in range(seed):
+        agent.step()
+    snapshot = agent.snapshot()
+    initial = observe_fields(agent)
+    states = []
+    for _ in range(30):
+        agent.step()
+        states.append(observe_fields(agent))
+    for _ in range(2):
+        agent.restore(snapshot)
+        assert observe_fields(agent) == initial
+        for state in states:
+            agent.step()
+            assert observe_fields(agent) == state
+
+
+@pytest.mark.parametrize("options", TIMELINE_CONFIGS)
+def test_fork_is_independent(options):
+    agent = new_agent(verbose=False, seed=11, **options)
+    for _ in range(4):
+        agent.step()
+    initial = observe_fields(agent)
+    first = agent.fork()
+    for _ in range(10):
+        first.step()
+    assert observe_fields(agent) == initial
+    second = agent.fork()
+    for _ in range(10):
+        second.step()
+    assert observe_fields(second) == observe_fields(first)
+    # O original continua jogando como se não houvesse cópias
+    agent.step()
+    reference = new_agent(verbose=False, seed=11, **options)
+    for _ in range(5):
+        reference.step()
+    assert observe_fields(agent) == observe_fields(reference)
+
+
+def test_restore_onto_other_world():
+    agent = new_agent(verbose=False, seed=5, grid_size=8, num_holes=6)
+    for _ in range(6):
+        agent.step()
+    snapshot = agent.snapshot()
+    other = new_agent(verbose=False, seed=500, grid_size=8, num_holes=6)
+    other.restore(snapshot)
+    assert observe_fields(other) == observe_fields(agent)
+    assert other.world is agent.world
+    other.step()
+    agent.step()
+    assert observe_fields(other) == observe_fields(agent)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Testes do planejador Monte Carlo: com semente, cada episódio decide igual em qualquer ordem."""
+
+import pytest
+
+from agente import new_agent
+from busca import MonteCarloPlanner
+from simulacao import run_episode
+
+OPTIONS = dict(grid_size=5, num_holes=3, probabilistic=True)
+
+
+def planner():
+    return MonteCarloPlanner(time_budget=None, iterations=20, seed=7)
+
+
+def test_episodes_do_not_depend_on_order():
+    shared = planner()
+    forward = [run_episode(seed, world_options=dict(OPTIONS, planner=shared)) for seed in range(30)]
+    assert shared.stats["decisions"] > 0
+    backward = [run_episode(seed, world_options=dict(OPTIONS, planner=planner())) for seed in reversed(range(30))]
+    assert backward[::-1] == forward
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_back_replays_planner_decisions(seed):
+    agent = new_agent(verbose=False, seed=seed, planner=planner(), **OPTIONS)
+    for _ in range(25):
+        agent.step()
+    moves = len(agent.history)
+    agent.back(7)
+    while len(agent.history) < moves:
+        agent.step()
+    fresh = new_agent(verbose=False, seed=seed, planner=planner(), **OPTIONS)
+    for _ in range(25):
+        fresh.step()
+    # Jogadas paradas depois do último movimento não mudam a posição nem o histórico
+    assert (agent.agent_pos, agent.history, agent.victory) == (fresh.agent_pos, fresh.history, fresh.victory)
+
+
+def test_needs_a_limit():
+    with pytest.raises(ValueError):
+        MonteCarloPlanner(time_budget=None, iterations=None)
+
+
+@pytest.mark.parametrize("seed", [0, 4])
+def test_parallel_decisions_keep_time_budget(seed):
+    """Com workers > 1, criar os processos e serializar o retrato não passam do tempo de cada decisão."""
+    budget = 0.02
+    planner = MonteCarloPlanner(time_budget=budget, workers=2, seed=1)
+    agent = new_agent(verbose=False, seed=seed, grid_size=8, num_holes=8, planner=planner)
+    try:
+        for _ in range(200):
+            if agent.game_over or agent.victory:
+                break
+            agent.step()
+    finally:
+        planner.close()
+    assert planner.stats["decisions"] > 0 and planner.stats["rollouts"] > 0
+    # O prazo, mais o tempo de uma jogada de simulação
+    assert planner.stats["max_time"] < budget + 0.01
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Testes de codigo.py: os nomes que se importavam dele continuam lá e são os objetos dos módulos novos."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import agente
+import codigo
+import interface
+import mundo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAMES = {
+    mundo: ["WumpusWorld", "GRID_SIZE", "MapPreset"],
+    agente: ["InferenceAgent", "INFERENCE_MODES", "WorldSnapshot", "new_agent"],
+    interface: ["main", "init_display", "draw_world", "draw_ui", "Renderer", "TILE_SIZE", "WIDTH", "HEIGHT", "FPS",
+                "BLACK", "BLUE", "BROWN", "GOLD", "GRAY", "GREEN", "RED", "WHITE"],
+}
+
+
+@pytest.mark.parametrize("module, name", [(module, name) for module, names in NAMES.items() for name in names])
+def test_reexport(module, name):
+    assert getattr(codigo, name) is getattr(module, name)
+
+
+def test_agent_is_composed_with_world():
+    agent = codigo.new_agent(verbose=False, seed=1, grid_size=6, num_holes=3, inference="sat")
+    assert isinstance(agent.world, codigo.WumpusWorld) and not isinstance(agent.world, codigo.InferenceAgent)
+    assert (agent.GRID_SIZE, agent.world.GRID_SIZE) == (6, 6)
+
+
+def test_world_does_not_import_agent():
+    # Em outro processo: aqui o agente já foi importado
+    code = "import sys, mundo; sys.exit(any(m in sys.modules for m in ('agente', 'inferencia', 'crencas')))"
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
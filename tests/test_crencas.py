@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Testes das crenças com ruído: a atualização local concorda com o recálculo do tabuleiro inteiro."""
+
+import copy
+import random
+
+import pytest
+
+from agente import new_agent
+from crencas import HazardBelief
+from mundo import PerceptNoise
+
+NOISE = PerceptNoise(.05, .05, .05, .05)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_matches_recompute(seed):
+    rng = random.Random(seed)
+    n = 12
+    belief = HazardBelief(n, 10, 2, None, NOISE, tolerance=1e-9, max_updates=1000)
+    cells = [(x, y) for x in range(n) for y in range(n)]
+    rng.shuffle(cells)
+    for cell in cells[:60]:
+        belief.observe(cell, (rng.random() < .2, rng.random() < .3, False))
+    full = copy.deepcopy(belief)
+    full.recompute(1000)
+    for a, b in zip(belief.pit + belief.wumpus, full.pit + full.wumpus):
+        assert a == pytest.approx(b, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_noise_free_belief_is_sound(seed):
+    """Sem ruído, nenhuma célula marcada como segura tem perigo e toda célula perigosa tem."""
+    agent = new_agent(verbose=False, seed=seed, inference="belief", grid_size=8, num_holes=6, num_wumpus=2)
+    hazards = set(agent.world.holes) | set(agent.world.wumpuses)
+    for _ in range(200):
+        previous = agent.agent_pos
+        agent.step()
+        assert not (agent.safe - agent.danger) & hazards
+        assert agent.danger <= hazards
+        if agent.game_over or agent.victory or agent.agent_pos == previous:
+            break
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Testes da enumeração de mapas e da avaliação exata (com e sem deduplicação por simetria)."""
+
+from fractions import Fraction
+
+import pytest
+
+from agente import new_agent
+from enumeracao import count_maps, enumerate_maps, evaluate_exact, evaluate_map, print_exact, symmetries
+from mundo import MapPreset, WumpusWorld
+from simulacao import run_batch
+
+# Grade pequena o bastante para avaliar todos os mapas em menos de um segundo
+N, HOLES, WUMPUS = 3, 1, 1
+
+
+def key(m):
+    return tuple(m.wumpuses), tuple(m.holes), m.gold
+
+
+def image(m, table, n):
+    """O mapa m levado pela simetria table."""
+    move = lambda cell: divmod(table[cell[0] * n + cell[1]], n)
+    return tuple(sorted(map(move, m.wumpuses))), tuple(sorted(map(move, m.holes))), move(m.gold)
+
+
+@pytest.fixture(scope="module")
+def exact():
+    return evaluate_exact(N, HOLES, WUMPUS)
+
+
+@pytest.mark.parametrize("n, holes, wumpus", [(3, 1, 1), (4, 2, 1), (4, 1, 2)])
+def test_dedup_orbits_cover_all_maps(n, holes, wumpus):
+    maps = {key(m) for m in enumerate_maps(n, holes, wumpus, dedup=False)}
+    assert len(maps) == count_maps(n, holes, wumpus)
+    covered = set()
+    for m in enumerate_maps(n, holes, wumpus, dedup=True):
+        orbit = {image(m, table, n) for table in symmetries(n, (0, n - 1))}
+        assert len(orbit) == m.multiplicity
+        assert not orbit & covered
+        covered |= orbit
+    assert covered == maps
+
+
+def test_generated_maps_are_enumerated():
+    maps = {key(m) for m in enumerate_maps(4, 2, 1, dedup=False)}
+    for seed in range(300):
+        world = WumpusWorld(seed=seed, grid_size=4, num_holes=2, num_wumpus=1)
+        assert (tuple(world.wumpuses), tuple(sorted(world.holes)), world.gold) in maps
+
+
+def test_exact_is_default_and_averages_every_map(exact):
+    assert not exact["dedup"]
+    maps = list(enumerate_maps(N, HOLES, WUMPUS, dedup=False))
+    assert exact["maps"] == exact["evaluated"] == len(maps)
+    victories = sum(evaluate_map(m.wumpuses, m.holes, m.gold, N, HOLES, WUMPUS).victory for m in maps)
+    assert exact["win_rate"] == victories / len(maps)
+    assert exact["win_rate"] + exact["game_over_rate"] + exact["stuck_rate"] == 1
+
+
+def test_map_outcome_covers_seeded_play():
+    # Cada partida com semente termina em um fim que a avaliação exata do mapa considera possível
+    for m in enumerate_maps(N, HOLES, WUMPUS, dedup=False):
+        outcome = evaluate_map(m.wumpuses, m.holes, m.gold, N, HOLES, WUMPUS)
+        assert isinstance(outcome.victory, Fraction)
+        for seed in range(3):
+            agent = new_agent(verbose=False, seed=seed, grid_size=N, num_holes=HOLES, num_wumpus=WUMPUS,
+                              preset=MapPreset(m.wumpuses, m.holes, m.gold, None, None))
+            for _ in range(100):
+                if agent.game_over or agent.victory:
+                    break
+                agent.step()
+            if agent.victory:
+                assert outcome.victory > 0
+            elif agent.game_over:
+                assert outcome.game_over > 0
+
+
+def test_exact_matches_sampling(exact):
+    sampled = run_batch(3000, world_options=dict(grid_size=N, num_holes=HOLES, num_wumpus=WUMPUS))
+    # Quatro desvios-padrão da média de 3000 episódios
+    sigma = (float(exact["win_rate"]) * (1 - float(exact["win_rate"])) / 3000) ** 0.5
+    assert abs(sampled["win_rate"] - float(exact["win_rate"])) < 4 * sigma
+
+
+def test_dedup_is_flagged_approximate(exact, capsys):
+    dedup = evaluate_exact(N, HOLES, WUMPUS, dedup=True)
+    assert dedup["dedup"]
+    assert dedup["maps"] == exact["maps"]
+    assert dedup["evaluated"] < dedup["maps"]
+    assert abs(dedup["win_rate"] - exact["win_rate"]) < Fraction(1, 100)
+    print_exact(dedup)
+    assert "aproximado" in capsys.readouterr().out
+    print_exact(exact)
+    assert "exato" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Testes da grade compacta: tabelas de vizinhos e CellSet se comportando como um set comum."""
+
+import random
+
+import pytest
+
+from grade import DANGER, SAFE, UNKNOWN, VISITED, CellSet, CellStates, changed_ids, neighbor_cells, neighbor_ids
+from mundo import WumpusWorld
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7])
+def test_neighbor_tables(n):
+    world = WumpusWorld(seed=0, grid_size=max(n, 3), num_holes=1)
+    for x in range(n):
+        for y in range(n):
+            # Ordem de get_adjacent: x - 1, x + 1, y - 1, y + 1
+            adjacent = tuple((a, b) for a, b in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+                             if 0 <= a < n and 0 <= b < n)
+            assert neighbor_cells(n)[x * n + y] == adjacent
+            assert neighbor_ids(n)[x * n + y] == tuple(a * n + b for a, b in adjacent)
+            if n == world.GRID_SIZE:
+                assert tuple(world.get_adjacent(x, y)) == adjacent
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cell_set_matches_set(seed):
+    rng = random.Random(seed)
+    n = rng.choice((3, 5, 8))
+    states = CellStates(n, UNKNOWN)
+    views = {bit: states.view(bit) for bit in (VISITED, SAFE, DANGER, UNKNOWN)}
+    models = {bit: ({(x, y) for x in range(n) for y in range(n)} if bit == UNKNOWN else set()) for bit in views}
+    before = bytes(states.flags)
+    for _ in range(200):
+        bit = rng.choice(list(views))
+        cell = (rng.randrange(-1, n + 1), rng.randrange(-1, n + 1))
+        inside = 0 <= cell[0] < n and 0 <= cell[1] < n
+        if rng.random() < 0.6 and inside:
+            views[bit].add(cell)
+            models[bit].add(cell)
+        else:
+            views[bit].discard(cell)
+            models[bit].discard(cell)
+        for b, view in views.items():
+            assert set(view) == models[b] and len(view) == len(models[b])
+            assert (cell in view) == (cell in models[b])
+        after = bytes(states.flags)
+        assert changed_ids(before, after, n) == [i for i in range(n * n) if before[i] != after[i]]
+        before = after
+    safe_only = CellSet(states, SAFE | DANGER, SAFE)
+    assert set(safe_only) == models[SAFE] - models[DANGER]
+    with pytest.raises(TypeError):
+        safe_only.add((0, 0))
+    with pytest.raises(ValueError):
+        views[SAFE].add((n, 0))
+    assert views[SAFE] - views[DANGER] == models[SAFE] - models[DANGER]
+    assert "nada" not in views[SAFE]
+
+
+def test_copy_is_independent():
+    states = CellStates(4)
+    states.set(5, SAFE)
+    clone = states.copy()
+    clone.set(6, SAFE)
+    clone.clear(5, SAFE)
+    assert states.view(SAFE) == {(1, 1)} and clone.view(SAFE) == {(1, 2)}
+    assert states.counts[SAFE] == clone.counts[SAFE] == 1
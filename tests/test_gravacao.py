@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Testes da gravação de episódios: os quadros lidos são os estados do mundo gravado."""
+
+import random
+
+import pytest
+
+from agente import new_agent
+from gravacao import EpisodeLog, EpisodeRecorder
+
+CONFIGS = [
+    dict(),
+    dict(grid_size=8, num_holes=6, probabilistic=True),
+    dict(inference="sat"),
+    dict(grid_size=12, num_holes=10, num_wumpus=2),
+]
+
+
+def observe(agent):
+    return (agent.agent_pos, bytes(agent._cells.flags), dict(agent.knowledge_base), agent.has_gold,
+            agent.game_over, agent.victory)
+
+
+def observe_frame(frame):
+    return (frame.agent_pos, bytes(state & 0x0F for state in frame.states), frame.knowledge_base, frame.has_gold,
+            frame.game_over, frame.victory)
+
+
+def record(path, seeds, steps=80):
+    """Grava um episódio por semente (alguns com voltas) e devolve os estados de cada um."""
+    episodes = []
+    with EpisodeRecorder(path, keyframe_interval=16) as recorder:
+        for seed in seeds:
+            agent = new_agent(verbose=False, seed=seed, **CONFIGS[seed % len(CONFIGS)])
+            recorder.begin(agent, seed)
+            states = [observe(agent)]
+            for t in range(steps):
+                if seed % 3 == 0 and t % 7 == 6:
+                    agent.back()
+                else:
+                    agent.step()
+                recorder.record(agent)
+                states.append(observe(agent))
+            episodes.append(states)
+    return episodes
+
+
+def check(log, episodes):
+    assert len(log) == len(episodes)
+    rng = random.Random(0)
+    for e, states in enumerate(episodes):
+        replay = log.episode(e)
+        assert len(replay) == len(states)
+        # Em ordem, de trás para frente e em saltos (seek a partir do quadro-chave ou do quadro atual)
+        order = list(range(len(states)))
+        jumps = order[:]
+        rng.shuffle(jumps)
+        for k in order + order[::-1] + jumps:
+            assert observe_frame(replay.seek(k)) == states[k]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "episodios.wump")
+
+
+def test_round_trip(path):
+    episodes = record(path, range(12))
+    with EpisodeLog(path) as log:
+        check(log, episodes)
+        assert log.episode(3).seed == 3
+
+
+def test_missing_index_is_rebuilt(path):
+    episodes = record(path, range(6))
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-20])  # Sem o rodapé: o índice é refeito lendo os registros
+    with EpisodeLog(path) as log:
+        check(log, episodes)
+
+
+def test_append(path):
+    episodes = record(path, range(4))
+    episodes += record(path, range(4, 7))
+    with EpisodeLog(path) as log:
+        check(log, episodes)
+
+
+def test_checkpoints_do_not_add_keyframes(path):
+    """Os retratos de back() copiam o conhecimento, mas as jogadas seguem como registros de mudanças."""
+    agent = new_agent(verbose=False, seed=1, grid_size=16, num_holes=12, probabilistic=True)
+    with EpisodeRecorder(path, keyframe_interval=1 << 20) as recorder:
+        recorder.begin(agent, 1)
+        states = [observe(agent)]
+        for _ in range(150):
+            agent.step()
+            recorder.record(agent)
+            states.append(observe(agent))
+    assert agent._checkpoints
+    with EpisodeLog(path) as log:
+        first, end = log.episode(0)._keyframes
+        assert end - first == 1
+        check(log, [states])
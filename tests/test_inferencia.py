@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Testes da inferência por SAT contra a enumeração de todos os mapas consistentes."""
+
+import itertools
+import random
+
+import pytest
+
+from agente import new_agent
+from inferencia import SatSolver
+
+
+def consistent_hazards(agent):
+    """Os conjuntos de perigos (Wumpus e buracos) consistentes com as percepções do mundo."""
+    n = agent.GRID_SIZE
+    free = [(x, y) for x in range(n) for y in range(n) if (x, y) not in agent.knowledge_base]
+    result = []
+    for wumpuses in itertools.combinations(free, agent.num_wumpus):
+        rest = [c for c in free if c not in wumpuses]
+        for holes in itertools.combinations(rest, agent.num_holes):
+            holes, wumpuses_set = set(holes), set(wumpuses)
+            if all(fedor == any(a in wumpuses_set for a in agent.get_adjacent(*c))
+                   and vento == any(a in holes for a in agent.get_adjacent(*c))
+                   for c, (fedor, vento, _) in agent.knowledge_base.items()):
+                result.append(holes | wumpuses_set)
+    return result
+
+
+@pytest.mark.parametrize("n, holes, wumpus", [(4, 2, 1), (4, 1, 2), (5, 2, 1)])
+@pytest.mark.parametrize("seed", range(6))
+def test_sat_matches_brute_force(seed, n, holes, wumpus):
+    agent = new_agent(verbose=False, seed=seed, inference="sat", grid_size=n, num_holes=holes, num_wumpus=wumpus)
+    engine = agent.inference_engine
+    for _ in range(40):
+        previous = agent.agent_pos
+        agent.step()
+        maps = consistent_hazards(agent)
+        unknown = [(x, y) for x in range(n) for y in range(n) if (x, y) not in agent.knowledge_base]
+        assert engine.safe - engine.visited == {c for c in unknown if all(c not in m for m in maps)}
+        assert engine.danger == {c for c in unknown if all(c in m for m in maps)}
+        if agent.game_over or agent.victory or agent.agent_pos == previous:
+            break
+
+
+def brute_force_sat(num_vars, clauses, at_most):
+    for values in itertools.product((False, True), repeat=num_vars):
+        holds = lambda lit: values[abs(lit) - 1] == (lit > 0)
+        if all(any(map(holds, c)) for c in clauses) and all(sum(map(holds, lits)) <= k for lits, k in at_most):
+            return True
+    return False
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_solver_matches_brute_force(seed):
+    rng = random.Random(seed)
+    num_vars = rng.randint(3, 8)
+    lit = lambda: rng.choice((1, -1)) * rng.randint(1, num_vars)
+    clauses = [[lit() for _ in range(rng.randint(1, 3))] for _ in range(rng.randint(2, 4 * num_vars))]
+    at_most = [(sorted(rng.sample(range(1, num_vars + 1), 3)), rng.randint(0, 2)) for _ in range(rng.randint(0, 2))]
+    solver = SatSolver()
+    for _ in range(num_vars):
+        solver.new_var()
+    for clause in clauses:
+        solver.add_clause(clause)
+    for lits, k in at_most:
+        solver.add_at_most(lits, k)
+    expected = brute_force_sat(num_vars, clauses, at_most)
+    assert solver.solve() == expected
+    if expected:
+        assert all(any(solver.model_value(x) for x in c) for c in clauses)
+        assert all(sum(solver.model_value(x) for x in lits) <= k for lits, k in at_most)
+    # Suposições: cada literal sozinho
+    for v in range(1, num_vars + 1):
+        assert solver.solve([v]) == brute_force_sat(num_vars, clauses + [[v]], at_most)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Testes da instrumentação: os contadores não mudam o jogo e chegam inteiros às exportações."""
+
+import csv
+import json
+
+import pytest
+
+from agente import new_agent
+from instrumentacao import EventHook, Instrumentation
+
+CONFIGS = [dict(grid_size=8, num_holes=6), dict(inference="sat"), dict(grid_size=8, num_holes=6, probabilistic=True)]
+
+
+class CountingHook(EventHook):
+    def __init__(self):
+        self.rules = 0
+        self.timers = 0
+
+    def on_rule(self, agent, rule, inferences, elapsed):
+        self.rules += 1
+
+    def on_timer(self, agent, timer, elapsed):
+        self.timers += 1
+
+
+def play(options, probe, seeds=range(10)):
+    """Joga os episódios (com algumas voltas) e devolve as posições de cada jogada e as jogadas feitas."""
+    positions, steps = [], 0
+    for seed in seeds:
+        agent = new_agent(verbose=False, seed=seed, instrumentation=probe, **options)
+        for t in range(60):
+            if t % 9 == 8:
+                agent.back(3)  # Refazer as jogadas não conta nos contadores
+            else:
+                steps += not agent.game_over and not agent.victory  # Depois do fim, step() não faz nada
+                agent.step()
+            positions.append(agent.agent_pos)
+    return positions, steps
+
+
+@pytest.mark.parametrize("options", CONFIGS)
+def test_counters_do_not_change_play(options):
+    probe = Instrumentation()
+    hook = CountingHook()
+    probe.add_hook(hook)
+    positions, steps = play(options, probe)
+    assert positions == play(options, None)[0]
+    assert probe.timers["jogada"].count == steps
+    assert hook.timers == sum(histogram.count for histogram in probe.timers.values())
+    assert hook.rules == sum(stats["runs"] for stats in probe.rules.values()) > 0
+
+
+def test_csv_has_rules_and_timers(tmp_path):
+    probe = Instrumentation()
+    play(CONFIGS[0], probe)
+    path = str(tmp_path / "contadores.csv")
+    probe.export(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    rules = {row["name"]: row for row in rows if row["kind"] == "rule"}
+    assert set(rules) == set(probe.rules)
+    for name, stats in probe.rules.items():
+        assert [int(rules[name][k]) for k in ("runs", "fired", "inferences")] == \
+            [stats["runs"], stats["fired"], stats["inferences"]]
+        assert float(rules[name]["time_us"]) == pytest.approx(stats["time"] * 1e6, abs=1e-3)
+    for name, histogram in probe.timers.items():
+        assert sum(int(row["count"]) for row in rows if row["kind"] == "timer" and row["name"] == name) == \
+            histogram.count
+
+
+def test_json_round_trip(tmp_path):
+    probe = Instrumentation()
+    play(CONFIGS[1], probe, range(3))
+    path = str(tmp_path / "contadores.json")
+    probe.export(path)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == json.loads(json.dumps(probe.to_dict()))
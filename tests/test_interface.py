@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Testes do renderizador: redesenhar só o que mudou dá a mesma imagem de um desenho completo."""
+
+import os
+
+import pytest
+
+pytest.importorskip("pygame")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import interface
+from agente import new_agent
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    interface.init_display()
+    yield
+    interface.pygame.quit()
+
+
+def image(surface):
+    return interface.pygame.image.tobytes(surface, "RGB")
+
+
+def full_draw(agent, camera):
+    """A tela desenhada do zero por um renderizador novo com a mesma câmera."""
+    surface = interface.pygame.Surface((interface.WIDTH, interface.HEIGHT))
+    renderer = interface.Renderer(surface)
+    renderer.origin, renderer.scale = list(camera.origin), camera.scale
+    renderer.draw(agent)
+    return image(surface)
+
+
+@pytest.mark.parametrize("n, holes, zoom", [(4, 2, None), (12, 14, 2), (12, 14, 0.5), (64, 300, None)])
+def test_incremental_matches_full_draw(n, holes, zoom):
+    agent = new_agent(verbose=False, seed=3, grid_size=n, num_holes=holes, probabilistic=True)
+    surface = interface.pygame.Surface((interface.WIDTH, interface.HEIGHT))
+    renderer = interface.Renderer(surface)
+    renderer.fit(n)
+    if zoom is not None:
+        renderer.zoom(zoom, anchor=(0, 0))  # Grade maior que a vista, ou células sem letras
+    renderer.draw(agent)
+    for t in range(40):
+        if t % 10 == 9:
+            agent.back(3)
+        else:
+            agent.step()
+        if t == 20:
+            renderer.pan(37, -11)
+        renderer.draw(agent)
+        assert image(surface) == full_draw(agent, renderer)
+    # Sem mudanças, nada é redesenhado
+    assert renderer.draw(agent) == []
+
+
+def test_camera_zoom_keeps_anchor():
+    surface = interface.pygame.Surface((interface.WIDTH, interface.HEIGHT))
+    renderer = interface.Renderer(surface)
+    renderer.fit(32)
+    anchor = (100, 200)
+    before = (renderer.origin[0] + (anchor[0] - renderer.view.left) / renderer.scale,
+              renderer.origin[1] + (anchor[1] - renderer.view.top) / renderer.scale)
+    renderer.zoom(3, anchor)
+    after = (renderer.origin[0] + (anchor[0] - renderer.view.left) / renderer.scale,
+             renderer.origin[1] + (anchor[1] - renderer.view.top) / renderer.scale)
+    assert after == pytest.approx(before)
+    renderer.center_on((20, 5))
+    assert renderer.is_visible((20, 5), margin=1)
+    assert not renderer.is_visible((0, 31))
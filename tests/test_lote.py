@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Testes dos mundos em lote: os mapas de WumpusWorld, inferência correta, mundos independentes e um agente
+próximo (mas não igual) ao de simulacao.run_episode."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lote import BatchedWumpusWorld
+from mundo import WumpusWorld
+from simulacao import run_episode
+
+CONFIGS = [(4, 2, 1), (8, 6, 2)]
+
+
+@pytest.mark.parametrize("n, holes, wumpus", CONFIGS)
+def test_maps_and_percepts_match_world(n, holes, wumpus):
+    batch = BatchedWumpusWorld(range(40), n, holes, wumpus)
+    for b, seed in enumerate(batch.seeds):
+        world = WumpusWorld(seed=seed, grid_size=n, num_holes=holes, num_wumpus=wumpus)
+        assert set(zip(*np.nonzero(batch.wumpus[b]))) == set(world.wumpuses)
+        assert set(zip(*np.nonzero(batch.pits[b]))) == set(world.holes)
+        assert tuple(np.argwhere(batch.gold[b])[0]) == world.gold
+        for x in range(n):
+            for y in range(n):
+                adjacent = world.get_adjacent(x, y)
+                assert batch.stench[b, x, y] == any(c in world.wumpuses for c in adjacent)
+                assert batch.breeze[b, x, y] == any(c in world.holes for c in adjacent)
+
+
+@pytest.mark.parametrize("n, holes, wumpus", CONFIGS)
+def test_inference_is_sound(n, holes, wumpus):
+    batch = BatchedWumpusWorld(range(200), n, holes, wumpus)
+    for _ in range(300):
+        active = batch.step()
+        assert not (batch.safe & (batch.pits | batch.wumpus)).any()
+        assert not (batch.danger & ~(batch.pits | batch.wumpus)).any()
+        if not active:
+            break
+    # Só anda por células seguras: nenhum agente morre
+    worlds = np.arange(len(batch))
+    assert not (batch.pits | batch.wumpus)[worlds, batch.x, batch.y].any()
+    assert batch.victory.any()
+
+
+def test_worlds_are_independent():
+    together = BatchedWumpusWorld(range(30), 6, 4, 1)
+    together.run()
+    results = together.results()
+    for seed in (0, 7, 29):
+        alone = BatchedWumpusWorld([seed], 6, 4, 1)
+        alone.run()
+        assert alone.results()[0] == results[seed]
+    # reset() recomeça os mesmos episódios
+    together.reset()
+    together.run()
+    assert together.results() == results
+
+
+@pytest.mark.parametrize("n, holes, wumpus", CONFIGS)
+def test_outcomes_close_to_inference_agent(n, holes, wumpus):
+    """O agente do lote é simplificado: nos mesmos mapas, os resultados são parecidos, não idênticos."""
+    seeds = range(300)
+    batch = BatchedWumpusWorld(seeds, n, holes, wumpus)
+    batch.run()
+    batched = [r.victory for r in batch.results()]
+    options = dict(grid_size=n, num_holes=holes, num_wumpus=wumpus)
+    scalar = [run_episode(seed, world_options=options).victory for seed in seeds]
+    agreement = sum(b == s for b, s in zip(batched, scalar)) / len(seeds)
+    assert agreement >= 0.8
+    assert abs(sum(batched) - sum(scalar)) / len(seeds) <= 0.1
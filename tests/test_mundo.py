@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Testes de WumpusWorld: geração de mapas e percepções, sem agente."""
+
+import collections
+
+import pytest
+
+from agente import new_agent
+from enumeracao import enumerate_maps
+from mundo import WumpusWorld
+
+
+@pytest.mark.parametrize("n, holes, wumpus", [(4, 2, 1), (8, 10, 2), (16, 40, 3), (5, 16, 1)])
+def test_generated_maps_are_solvable(n, holes, wumpus):
+    for seed in range(30):
+        world = WumpusWorld(seed=seed, grid_size=n, num_holes=holes, num_wumpus=wumpus)
+        hazards = set(world.wumpuses) | set(world.holes)
+        assert len(world.wumpuses) == wumpus and len(world.holes) == holes and len(hazards) == holes + wumpus
+        start_area = {world.start_pos, *world.get_adjacent(*world.start_pos)}
+        assert not hazards & start_area and world.gold not in start_area | hazards
+        found, _ = world._is_path_valid(world.start_pos, world.gold, hazards, n)
+        assert found
+
+
+def test_dense_maps_give_up():
+    """Perigos demais: a geração por rejeição desiste com ValueError em vez de sortear para sempre."""
+
+    class SmallBudget(WumpusWorld):
+        MAP_GENERATION_BUDGET = 64 * 64 * 20  # 20 tentativas
+
+    with pytest.raises(ValueError, match="20 tentativas"):
+        SmallBudget(seed=1, grid_size=64, num_holes=3686)
+    # Com o limite padrão (4096 tentativas nesta grade), a mesma semente gera o mapa
+    world = WumpusWorld(seed=1, grid_size=64, num_holes=3686)
+    assert len(world.holes) == 3686
+
+
+def test_generated_maps_are_uniform():
+    """Todos os mapas solucionáveis saem com a mesma probabilidade (como na geração por rejeição)."""
+    maps = {(tuple(m.wumpuses), tuple(m.holes), m.gold) for m in enumerate_maps(3, 1, 1, dedup=False)}
+    samples = 100 * len(maps)
+    counts = collections.Counter()
+    for seed in range(samples):
+        world = WumpusWorld(seed=seed, grid_size=3, num_holes=1, num_wumpus=1)
+        counts[tuple(world.wumpuses), tuple(world.holes), world.gold] += 1
+    assert set(counts) == maps
+    # Qui-quadrado com len(maps) - 1 = 117 graus de liberdade: média 117, desvio-padrão 15,3
+    chi_square = sum((counts[m] - 100) ** 2 / 100 for m in maps)
+    assert chi_square < 200
+
+
+def test_world_is_shared_and_unchanged_by_play():
+    """O agente e suas cópias jogam sobre o mesmo mundo, que não muda depois de reset()."""
+    agent = new_agent(verbose=False, seed=7, grid_size=8, num_holes=6)
+    world = agent.world
+    before = (list(world.wumpuses), list(world.holes), world.gold, bytes(world._percept_flags), world._play_rng_state)
+    fork = agent.fork()
+    for _ in range(40):
+        agent.step()
+        fork.step()
+    agent.back(10)
+    assert agent.world is world and fork.world is world
+    assert (list(world.wumpuses), list(world.holes), world.gold, bytes(world._percept_flags),
+            world._play_rng_state) == before
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Testes dos campos de distância incrementais contra uma BFS refeita a cada mudança."""
+
+import collections
+import random
+
+import pytest
+
+from grade import neighbor_ids
+from planejamento import UNREACHABLE, DistanceField
+
+
+def bfs(n, walkable, sources):
+    adjacency = neighbor_ids(n)
+    dist = [UNREACHABLE] * (n * n)
+    queue = collections.deque()
+    for i in sources & walkable:
+        dist[i] = 0
+        queue.append(i)
+    while queue:
+        i = queue.popleft()
+        for j in adjacency[i]:
+            if j in walkable and dist[j] == UNREACHABLE:
+                dist[j] = dist[i] + 1
+                queue.append(j)
+    return dist
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_bfs(seed):
+    rng = random.Random(seed)
+    n = rng.choice((4, 7, 12))
+    field = DistanceField(n)
+    walkable, sources = set(), set()
+    adjacency = neighbor_ids(n)
+    for _ in range(400):
+        i = rng.randrange(n * n)
+        operation = rng.random()
+        # Mais inclusões que remoções, para a grade ir ficando transitável
+        if operation < 0.5:
+            field.add_walkable(i)
+            walkable.add(i)
+        elif operation < 0.65:
+            field.add_source(i)
+            sources.add(i)
+        elif operation < 0.85:
+            field.remove_walkable(i)
+            walkable.discard(i)
+        else:
+            field.remove_source(i)
+            sources.discard(i)
+        expected = bfs(n, walkable, sources)
+        assert [field.distance(i) for i in range(n * n)] == expected
+        for i in range(n * n):
+            hop = field.next_hop(i)
+            if expected[i] in (0, UNREACHABLE):
+                assert hop is None
+            else:
+                assert hop == next(j for j in adjacency[i] if j in walkable and expected[j] == expected[i] - 1)
+
+
+def test_copy_is_independent():
+    field = DistanceField(5)
+    for i in range(25):
+        field.add_walkable(i)
+    field.add_source(0)
+    clone = field.copy()
+    clone.remove_walkable(1)
+    clone.remove_walkable(5)
+    assert field.distance(24) == 8
+    assert clone.distance(24) == UNREACHABLE
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Testes das probabilidades da fronteira contra a enumeração de todos os mapas consistentes."""
+
+import pytest
+
+from agente import new_agent
+from mundo import WumpusWorld
+from probabilidade import FrontierRisk
+from tests.test_inferencia import consistent_hazards
+
+
+@pytest.mark.parametrize("n, holes, wumpus", [(4, 2, 1), (4, 1, 2), (5, 2, 1)])
+@pytest.mark.parametrize("seed", range(6))
+def test_probabilities_are_exact(seed, n, holes, wumpus):
+    agent = new_agent(verbose=False, seed=seed, probabilistic=True, grid_size=n, num_holes=holes,
+                        num_wumpus=wumpus)
+    risk = FrontierRisk(n, holes, wumpus, agent.get_adjacent)
+    for _ in range(40):
+        previous = agent.agent_pos
+        agent.step()
+        if agent.game_over:
+            break
+        maps = consistent_hazards(agent)
+        probabilities, rest = risk.probabilities(agent.knowledge_base)
+        unknown = [(x, y) for x in range(n) for y in range(n) if (x, y) not in agent.knowledge_base]
+        for cell in unknown:
+            expected = sum(cell in m for m in maps) / len(maps)
+            assert probabilities.get(cell, rest) == pytest.approx(expected, abs=1e-9)
+        if agent.victory or agent.agent_pos == previous:
+            break
+
+
+def test_inconsistent_percepts():
+    risk = FrontierRisk(4, 1, 1, WumpusWorld(seed=0).get_adjacent)
+    # Dois ventos sem vizinhos em comum pedem dois buracos
+    knowledge_base = {(0, 0): (False, True, False), (3, 3): (False, True, False)}
+    assert risk.probabilities(knowledge_base) == (None, None)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Testes do servidor de sessões: respostas em ordem e o mesmo estado de um mundo local."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from agente import new_agent
+from servidor import WumpusServer
+
+WORLD = dict(seed=4, grid_size=16, num_holes=12, probabilistic=True)
+# Jogadas dos pedidos: (operação, count)
+PLAYS = [("step", 300), ("back", 120), ("step", 50), ("back", 1), ("back", 200), ("step", 1000), ("back", 0)]
+
+
+def request(server, **fields):
+    response = json.loads(server.handle_line(json.dumps(fields).encode()))
+    assert response["ok"], response
+    return response
+
+
+def local_states():
+    """Jogadas e posição de um mundo local depois de cada pedido de PLAYS."""
+    agent = new_agent(verbose=False, **WORLD)
+    states = []
+    for op, count in PLAYS:
+        if op == "step":
+            for _ in range(count):
+                if agent.game_over or agent.victory:
+                    break
+                agent.step()
+        else:
+            agent.back(count)
+        states.append((len(agent.history), list(agent.agent_pos)))
+    return states
+
+
+def test_requests_match_local_world():
+    server = WumpusServer()
+    session = request(server, op="create", **WORLD)["session"]
+    for (op, count), expected in zip(PLAYS, local_states()):
+        state = request(server, op=op, session=session, count=count)["state"]
+        assert (state["steps"], state["position"]) == expected
+
+
+def test_errors_keep_session():
+    server = WumpusServer(max_count=10)
+    session = request(server, op="create", seed=1)["session"]
+    for line in [b"{", b"[]", b'{"op": "voar"}', b'{"op": "step"}', b'{"op": "step", "session": 99}',
+                 json.dumps({"op": "step", "session": session, "count": 11}).encode(),
+                 json.dumps({"op": "create", "grid_size": 3, "num_holes": 9}).encode(),
+                 json.dumps({"op": "create", "grid_size": 8, "num_holes": 16}).encode()]:
+        assert not json.loads(server.handle_line(line))["ok"]
+    assert request(server, op="step", session=session, count=10)["state"]["steps"] > 0
+
+
+@pytest.mark.parametrize("inline_work", [0, 1 << 30])
+def test_pipelined_requests(inline_work):
+    """Pedidos mandados juntos (em threads com inline_work=0) voltam em ordem e serializados por sessão."""
+    expected = local_states()
+
+    async def run():
+        server = WumpusServer(inline_work=inline_work)
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(server.serve(port=0, ready=ready.set_result))
+        host, port = (await ready)[0][:2]
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            other_reader, other_writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps(dict(op="create", **WORLD)).encode() + b"\n")
+            session = json.loads(await reader.readline())["session"]
+            lines = [dict(op=op, session=session, count=count, id=k) for k, (op, count) in enumerate(PLAYS)]
+            writer.write(b"".join(json.dumps(line).encode() + b"\n" for line in lines))
+            # As outras conexões continuam sendo atendidas enquanto as jogadas rodam
+            await asyncio.sleep(0)
+            other_writer.write(json.dumps(dict(op="stats")).encode() + b"\n")
+            assert json.loads(await other_reader.readline())["ok"]
+            responses = [json.loads(await reader.readline()) for _ in lines]
+            # O estado visto de outra conexão é o das jogadas já respondidas
+            other_writer.write(json.dumps(dict(op="state", session=session)).encode() + b"\n")
+            final = json.loads(await other_reader.readline())["state"]
+            writer.close()
+            other_writer.close()
+            return responses, final
+        finally:
+            task.cancel()
+
+    responses, final = asyncio.run(run())
+    assert [r["id"] for r in responses] == list(range(len(PLAYS)))
+    assert [(r["state"]["steps"], r["state"]["position"]) for r in responses] == expected
+    assert (final["steps"], final["position"]) == expected[-1]
+
+
+def test_large_create_does_not_stall_other_sessions():
+    """Um "create" em uma grade grande gera o mapa em uma thread: um "step" de outra sessão não espera."""
+
+    async def run():
+        server = WumpusServer(workers=1)
+        session = json.loads(server.start_line(json.dumps({"op": "create", "seed": 1}).encode()))["session"]
+        gate = threading.Event()
+        server.executor.submit(gate.wait)  # Segura a única thread: o "create" fica na fila até gate.set()
+        create = server.start_line(json.dumps({"op": "create", "seed": 2, "grid_size": 256,
+                                               "num_holes": 16000}).encode())
+        assert asyncio.iscoroutine(create)
+        create = asyncio.ensure_future(create)
+        await asyncio.sleep(0)
+        step = server.start_line(json.dumps({"op": "step", "session": session, "count": 5}).encode())
+        assert isinstance(step, bytes) and json.loads(step)["ok"] and not create.done()
+        gate.set()
+        created = json.loads(await create)
+        server.executor.shutdown()
+        return created, server.store.peek(created["session"])
+
+    created, agent = asyncio.run(run())
+    assert created["ok"] and agent.GRID_SIZE == 256 and len(agent.world.holes) == 16000
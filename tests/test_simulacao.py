@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Testes da avaliação em lote: cada episódio depende só da sua semente, e simular não carrega o Pygame."""
+
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from simulacao import run_batch, run_episode, run_parallel, shard_seeds
+
+OPTIONS = dict(grid_size=6, num_holes=4, probabilistic=True)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COUNTED = ("episodes", "victories", "game_overs", "stuck", "win_rate", "mean_steps")
+
+
+def test_episode_ignores_order_and_global_random():
+    forward = [run_episode(seed, world_options=OPTIONS) for seed in range(40)]
+    random.seed(123)
+    backward = [run_episode(seed, world_options=OPTIONS) for seed in reversed(range(40))]
+    assert backward[::-1] == forward
+
+
+@pytest.mark.parametrize("num_episodes, num_shards", [(10, 3), (7, 7), (3, 8), (100, 1)])
+def test_shards_cover_seeds(num_episodes, num_shards):
+    shards = shard_seeds(5, num_episodes, num_shards)
+    assert [seed for a, b in shards for seed in range(a, b)] == list(range(5, 5 + num_episodes))
+
+
+def test_parallel_matches_batch():
+    batch = run_batch(60, first_seed=20, world_options=OPTIONS)
+    for workers in (1, 2):
+        parallel = run_parallel(60, first_seed=20, workers=workers, world_options=OPTIONS)
+        assert {k: parallel[k] for k in COUNTED} == {k: batch[k] for k in COUNTED}
+
+
+def test_simulation_does_not_load_pygame():
+    # Em outro processo: os testes da interface já podem ter carregado o Pygame neste
+    code = "import sys, simulacao, interface, codigo; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Testes do cache de mapas por semente: os mundos da tabela jogam como os gerados por WumpusWorld(seed=...)."""
+
+import pytest
+
+from agente import InferenceAgent, new_agent
+from mundo import PerceptNoise
+from simulacao import run_episode
+from solucoes import SolutionTable, optimal_steps, table_path
+
+CONFIGS = [(4, 2, 1), (8, 6, 2)]
+
+
+def observe(agent):
+    return (agent.agent_pos, agent.has_gold, agent.game_over, agent.victory, sorted(agent.safe),
+            list(agent.history))
+
+
+@pytest.fixture(params=CONFIGS, ids=lambda c: "{}x{}-b{}-w{}".format(c[0], *c))
+def table(request, tmp_path):
+    n, holes, wumpus = request.param
+    path = table_path(str(tmp_path), n, holes, wumpus)
+    with SolutionTable(path, n, holes, wumpus, first_seed=10) as table:
+        table.fill(60)
+    # Reaberta do disco, só com o caminho
+    with SolutionTable(path) as table:
+        yield table
+
+
+def test_table_range(table):
+    assert len(table) == 50
+    assert 10 in table and 59 in table
+    assert 9 not in table and 60 not in table
+    with pytest.raises(KeyError):
+        table.world(60)
+
+
+def test_world_matches_generated(table):
+    options = dict(grid_size=table.grid_size, num_holes=table.num_holes, num_wumpus=table.num_wumpus)
+    for seed in range(table.first_seed, table.first_seed + len(table)):
+        generated = new_agent(verbose=False, seed=seed, probabilistic=True, **options)
+        cached = InferenceAgent(table.world(seed), verbose=False, probabilistic=True)
+        world = generated.world
+        assert (cached.world.wumpuses, cached.world.holes, cached.world.gold) == (world.wumpuses, world.holes, world.gold)
+        assert cached.world._percept_flags == world._percept_flags
+        assert table.optimal_steps(seed) == optimal_steps(world)
+        for k in range(60):
+            assert observe(cached) == observe(generated)
+            if k == 30:
+                cached.back()
+                generated.back()
+            cached.step()
+            generated.step()
+
+
+def test_record_keeps_play_seed(table):
+    """Cada registro guarda só a semente das jogadas (64 bits), não o estado inteiro do gerador."""
+    n = table.grid_size
+    assert table.record_size == 4 * (2 + table.num_wumpus + table.num_holes) + 8 + n * n
+    noise = PerceptNoise(0.1, 0.05, 0.1, 0.05)
+    options = dict(grid_size=n, num_holes=table.num_holes, num_wumpus=table.num_wumpus, noise=noise)
+    for seed in range(table.first_seed, table.first_seed + 10):
+        generated = new_agent(verbose=False, seed=seed, **options)
+        assert table.preset(seed).play_seed == generated.world.play_seed
+        # O ruído dos sensores também é sorteado a partir da semente das jogadas
+        cached = InferenceAgent(table.world(seed, noise=noise), verbose=False)
+        assert cached.world._percept_flags == generated.world._percept_flags
+        for _ in range(30):
+            cached.step()
+            generated.step()
+        assert observe(cached) == observe(generated)
+
+
+def test_fill_is_incremental(tmp_path):
+    path = table_path(str(tmp_path), 4, 2, 1)
+    with SolutionTable(path, 4, 2, 1) as table:
+        assert table.fill(20) == 20
+        assert table.fill(20) == 0
+        assert table.fill(30) == 10
+    with pytest.raises(ValueError):
+        SolutionTable(path, 5, 2, 1)
+
+
+def test_run_episode_uses_table(tmp_path):
+    directory = str(tmp_path)
+    with SolutionTable(table_path(directory, 4, 2, 1), 4, 2, 1) as table:
+        table.fill(30)
+        for seed in range(30):
+            result = run_episode(seed, solutions=directory)
+            assert result[:5] == run_episode(seed)[:5]
+            assert result.optimal_steps == table.optimal_steps(seed)